@@ -5,31 +5,55 @@ Flask Web Interface for LangChain/LangGraph Agents
 Provides a web-based UI for interacting with Prometheus, Neo4j, and Infrastructure agents.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash
+import hashlib
 import json
-import asyncio
+import threading
 import traceback
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import structlog
 
-from main import AgentManager
 from config.settings import get_config
+from shared import event_loop
+
+if TYPE_CHECKING:
+    from main import AgentManager
 
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-in-production'
+app.secret_key = get_config().security.secret_key
+
+# Production entrypoint: gunicorn 'app:app' -k gthread --threads 8 (see README_WEBAPP.md)
 
 logger = structlog.get_logger(__name__)
 
-# Global agent manager instance
-agent_manager: Optional[AgentManager] = None
+# Global agent manager instance, shared by every request thread in the process
+agent_manager: Optional["AgentManager"] = None
+_agent_manager_lock = threading.Lock()
 
-def get_agent_manager() -> AgentManager:
+def get_agent_manager(config_path: Optional[str] = None) -> "AgentManager":
     """Get or create the global agent manager instance."""
     global agent_manager
     if agent_manager is None:
-        agent_manager = AgentManager()
+        with _agent_manager_lock:
+            if agent_manager is None:
+                # Deferred so that importing the app does not load every agent's dependencies
+                from main import AgentManager
+                agent_manager = AgentManager(config_path)
     return agent_manager
 
+# Serialized /api/agents payload, rebuilt only when the catalog object changes
+_agents_response_cache: Optional[Tuple[int, str, bytes]] = None
+
+def _agents_response_body(agents_info: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Return (etag, body) for the agent catalog, serializing it once per catalog."""
+    global _agents_response_cache
+    cached = _agents_response_cache
+    if cached is None or cached[0] != id(agents_info):
+        body = app.json.dumps(agents_info).encode()
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        cached = _agents_response_cache = (id(agents_info), etag, body)
+    return cached[1], cached[2]
+
 @app.route('/')
 def index():
     """Main page with agent selection and query interface."""
@@ -51,20 +75,16 @@ def agent_page(agent_name: str):
     """Individual agent interaction page."""
     try:
         manager = get_agent_manager()
-        agents_info = manager.list_agents()
+        bundle = manager.get_agent_bundle(agent_name)
         
-        if agent_name not in agents_info['agents']:
+        if bundle is None:
             flash(f"Agent '{agent_name}' not found", 'error')
             return redirect(url_for('index'))
         
-        agent_info = agents_info['agents'][agent_name]
-        health_status = manager.health_check()
-        agent_health = health_status.get('agents', {}).get(agent_name, {})
-        
         return render_template('agent.html',
                              agent_name=agent_name,
-                             agent_info=agent_info,
-                             agent_health=agent_health)
+                             agent_info=bundle.info,
+                             agent_health=bundle.health())
     except Exception as e:
         logger.error("Failed to load agent page", agent=agent_name, error=str(e))
         flash(f"Error loading agent page: {str(e)}", 'error')
@@ -86,25 +106,29 @@ def api_query():
             return jsonify({"status": "error", "error": "Agent and query are required"}), 400
         
         manager = get_agent_manager()
-        result = manager.run_agent(agent_name, query, context)
+        # The agents' async clients are bound to the shared background loop, so the
+        # run happens there rather than on a per-request loop
+        result = event_loop.run_sync(manager.arun_agent(agent_name, query, context))
         
         return jsonify(result)
         
     except Exception as e:
-        logger.error("API query failed", error=str(e), traceback=traceback.format_exc())
-        return jsonify({
-            "status": "error",
-            "error": str(e),
-            "traceback": traceback.format_exc()
-        }), 500
+        # format_exc_info renders the traceback only if the event is actually emitted
+        logger.error("API query failed", error=str(e), exc_info=True)
+        response = {"status": "error", "error": str(e)}
+        if app.debug:
+            response["traceback"] = traceback.format_exc()
+        return jsonify(response), 500
 
 @app.route('/api/agents')
 def api_agents():
     """API endpoint to list all agents."""
     try:
         manager = get_agent_manager()
-        agents_info = manager.list_agents()
-        return jsonify(agents_info)
+        etag, body = _agents_response_body(manager.list_agents())
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         logger.error("Failed to list agents", error=str(e))
         return jsonify({"status": "error", "error": str(e)}), 500
@@ -141,6 +165,11 @@ def form_query():
             return redirect(url_for('agent_page', agent_name=agent_name))
         
         manager = get_agent_manager()
+        bundle = manager.get_agent_bundle(agent_name)
+        if bundle is None:
+            flash(f"Agent '{agent_name}' not found", 'error')
+            return redirect(url_for('index'))
+        
         result = manager.run_agent(agent_name, query, context)
         
         # Redirect to agent page with result
@@ -151,8 +180,8 @@ def form_query():
         
         return render_template('agent.html',
                              agent_name=agent_name,
-                             agent_info=manager.list_agents()['agents'][agent_name],
-                             agent_health=manager.health_check().get('agents', {}).get(agent_name, {}),
+                             agent_info=bundle.info,
+                             agent_health=bundle.health(),
                              query_result=result,
                              last_query=query,
                              last_context=context_str)
@@ -188,10 +217,7 @@ if __name__ == '__main__':
     args = parser.parse_args()
     
     # Initialize agent manager with config
-    if args.config:
-        agent_manager = AgentManager(args.config)
-    else:
-        agent_manager = AgentManager()
+    get_agent_manager(args.config)
     
     logger.info("Starting Flask web interface", host=args.host, port=args.port, debug=args.debug)
     
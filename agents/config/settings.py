@@ -1,6 +1,8 @@
 import os
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from dotenv import load_dotenv
 import yaml
 import structlog
@@ -8,7 +10,23 @@ import structlog
 load_dotenv()
 logger = structlog.get_logger(__name__)
 
+# Prefer the libyaml C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Directory existence changes rarely; re-stat at most once per window
+_PATH_CHECK_TTL = 30
+
+@lru_cache(maxsize=16)
+def _path_exists(path: str, window: int) -> bool:
+    """Cached os.path.exists; callers pass the current TTL window as part of the key."""
+    return os.path.exists(path)
+
+def _cached_path_exists(path: str) -> bool:
+    return _path_exists(path, int(time.monotonic() // _PATH_CHECK_TTL))
+
 class DatabaseConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     neo4j_uri: str = Field(default=os.getenv("NEO4J_URI", "bolt://localhost:7687"))
     neo4j_username: str = Field(default=os.getenv("NEO4J_USERNAME", "neo4j"))
     neo4j_password: str = Field(default=os.getenv("NEO4J_PASSWORD", "password"))
@@ -17,6 +35,8 @@ class DatabaseConfig(BaseModel):
     neo4j_mcp_transport: str = Field(default=os.getenv("NEO4J_MCP_TRANSPORT", "streamable_http"))
 
 class MonitoringConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     prometheus_url: str = Field(default=os.getenv("PROMETHEUS_URL", "http://localhost:9090"))
     prometheus_auth_token: Optional[str] = Field(default=os.getenv("PROMETHEUS_AUTH_TOKEN"))
     alert_webhook_url: Optional[str] = Field(default=os.getenv("ALERT_WEBHOOK_URL"))
@@ -24,6 +44,8 @@ class MonitoringConfig(BaseModel):
     prometheus_mcp_transport: str = Field(default=os.getenv("PROMETHEUS_MCP_TRANSPORT", "streamable_http"))
 
 class CloudConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     aws_region: str = Field(default=os.getenv("AWS_REGION", "us-east-1"))
     aws_profile: Optional[str] = Field(default=os.getenv("AWS_PROFILE"))
     aws_access_key_id: Optional[str] = Field(default=os.getenv("AWS_ACCESS_KEY_ID"))
@@ -31,14 +53,20 @@ class CloudConfig(BaseModel):
     terraform_dir: str = Field(default=os.getenv("TERRAFORM_DIR", "./terraform"))
 
 class LLMConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     model_name: str = Field(default=os.getenv("LLM_MODEL", "gpt-3.5-turbo"))
     temperature: float = Field(default=float(os.getenv("LLM_TEMPERATURE", "0.1")))
     max_tokens: int = Field(default=int(os.getenv("LLM_MAX_TOKENS", "4000")))
     provider: str = Field(default=os.getenv("LLM_PROVIDER", "openai"))  # "openai" or "anthropic"
     anthropic_api_key: Optional[str] = Field(default=os.getenv("ANTHROPIC_API_KEY"))
     openai_api_key: Optional[str] = Field(default=os.getenv("OPENAI_API_KEY"))
+    cache: str = Field(default=os.getenv("LLM_CACHE", "none"))  # "none", "memory" or "sqlite"
+    cache_path: str = Field(default=os.getenv("LLM_CACHE_PATH", ".langchain_cache.db"))
 
 class LangSmithConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     enabled: bool = Field(default=os.getenv("LANGSMITH_ENABLED", "false").lower() == "true")
     api_key: Optional[str] = Field(default=os.getenv("LANGSMITH_API_KEY"))
     project: str = Field(default=os.getenv("LANGSMITH_PROJECT", "codon-kg-agents"))
@@ -47,12 +75,16 @@ class LangSmithConfig(BaseModel):
     session_name: Optional[str] = Field(default=os.getenv("LANGSMITH_SESSION"))
 
 class SecurityConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     secret_key: str = Field(default=os.getenv("AGENT_SECRET_KEY", "default-secret-key"))
     enable_audit_logging: bool = Field(default=os.getenv("ENABLE_AUDIT_LOGGING", "true").lower() == "true")
     max_retry_attempts: int = Field(default=int(os.getenv("MAX_RETRY_ATTEMPTS", "3")))
     command_timeout: int = Field(default=int(os.getenv("COMMAND_TIMEOUT", "300")))
 
 class GlobalConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig)
     cloud: CloudConfig = Field(default_factory=CloudConfig)
@@ -60,14 +92,13 @@ class GlobalConfig(BaseModel):
     langsmith: LangSmithConfig = Field(default_factory=LangSmithConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     
+    _dict_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    
     @classmethod
     def from_yaml(cls, config_path: str) -> "GlobalConfig":
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file, reusing the parsed result until the file changes."""
         try:
-            with open(config_path, 'r') as file:
-                config_data = yaml.safe_load(file)
-            
-            return cls(**config_data)
+            return _load_yaml_config(cls, config_path, os.path.getmtime(config_path))
         except FileNotFoundError:
             logger.warning("Config file not found, using default values", path=config_path)
             return cls()
@@ -76,8 +107,10 @@ class GlobalConfig(BaseModel):
             return cls()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert configuration to dictionary."""
-        return self.model_dump()
+        """Convert configuration to dictionary (built once; treat as read-only)."""
+        if self._dict_cache is None:
+            self._dict_cache = self.model_dump()
+        return self._dict_cache
     
     def validate_configuration(self) -> Dict[str, str]:
         """Validate configuration and return any issues."""
@@ -104,16 +137,27 @@ class GlobalConfig(BaseModel):
             issues.append("Prometheus URL is not configured")
         
         # Check Terraform directory
-        if not os.path.exists(self.cloud.terraform_dir):
+        if not _cached_path_exists(self.cloud.terraform_dir):
             issues.append(f"Terraform directory does not exist: {self.cloud.terraform_dir}")
         
         return {"status": "valid" if not issues else "invalid", "issues": issues}
 
-# Global configuration instance
-config = GlobalConfig()
+@lru_cache(maxsize=8)
+def _load_yaml_config(config_cls: type, config_path: str, mtime: float) -> GlobalConfig:
+    """Parse and validate a YAML config file; cached per (path, mtime)."""
+    with open(config_path, 'r') as file:
+        config_data = yaml.load(file, Loader=_YAML_LOADER)
+    
+    return config_cls(**(config_data or {}))
+
+# Global configuration instance, built on first access
+config: Optional[GlobalConfig] = None
 
 def get_config() -> GlobalConfig:
     """Get the global configuration instance."""
+    global config
+    if config is None:
+        config = GlobalConfig()
     return config
 
 def reload_config(config_path: Optional[str] = None) -> GlobalConfig:
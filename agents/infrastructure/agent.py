@@ -1,39 +1,133 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import functools
+import threading
+import time
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.memory import MemorySaver
 import structlog
-import json
+import uuid
+from pydantic import TypeAdapter, ValidationError
 
 from shared.base_agent import BaseAgent, AgentConfig, BaseAgentState
 from shared.llm_factory import LLMFactory
+from shared.serialization import dumps
+from shared import event_loop
 from config.settings import get_config
-from .tools import InfrastructureTools, AWSConfig, TerraformConfig
+from .tools import InfrastructureTools, AWSConfig, TerraformConfig, DEFAULT_PAGE_SIZE
 
 logger = structlog.get_logger(__name__)
 
+_INFRASTRUCTURE_SYSTEM_PROMPT = """You are an infrastructure management specialist agent. Your responsibilities include:
+
+1. **Terraform Operations**: Manage infrastructure as code with Terraform
+2. **AWS Resource Management**: Monitor and interact with AWS services
+3. **Infrastructure Planning**: Plan and validate infrastructure changes
+4. **Resource Monitoring**: Track resource status and utilization
+
+Key capabilities:
+- Execute Terraform lifecycle operations (init, plan, apply, destroy)
+- Query AWS resources (EC2, S3, CloudFormation)
+- Validate infrastructure configurations
+- Provide cost and security recommendations
+- Implement infrastructure best practices
+
+Terraform Workflow:
+1. Always run `terraform init` before other operations
+2. Use `terraform plan` to preview changes before applying
+3. Execute `terraform apply` with caution - verify plans first
+4. Use targeted operations for specific resources when needed
+5. Document all infrastructure changes
+6. Plan several independent targets at once with terraform_plan_targets
+
+AWS Resource Management:
+- Query EC2 instances by state, type, or tags
+- Monitor S3 buckets and their configurations
+- Track CloudFormation stack status and changes
+- Apply appropriate filters for efficient resource discovery
+- Listing tools return one page; pass next_token back only when more results are needed
+
+Security Best Practices:
+- Validate all inputs and commands
+- Use least-privilege access principles
+- Audit all infrastructure changes
+- Never expose sensitive credentials
+- Follow AWS security guidelines
+
+Safety Guidelines:
+- Always preview changes with terraform plan first
+- Confirm destructive operations before execution
+- Use targeted deployments for critical changes
+- Maintain infrastructure state backups
+- Implement proper change management procedures
+
+When executing operations:
+- Provide clear explanations of what will be changed
+- Highlight potential risks or impacts
+- Suggest rollback procedures for major changes
+- Monitor for errors and provide troubleshooting guidance
+- Document successful deployments and configurations"""
+
+# Tool arguments arrive as JSON strings; decode and shape-check them in a single pass
+_EC2_FILTERS = TypeAdapter(Dict[str, List[str]])
+_STATUS_FILTER = TypeAdapter(List[str])
+_REGIONS = TypeAdapter(List[str])
+_TARGETS = TypeAdapter(List[str])
+
+def _offload_to_executor(blocking_tool: Any) -> Any:
+    """Give a synchronous boto3 tool an async entry point that runs it on the shared I/O pool."""
+    func = blocking_tool.func
+    
+    async def run_in_executor(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(event_loop.get_io_pool(), functools.partial(func, *args, **kwargs))
+    
+    blocking_tool.coroutine = run_in_executor
+    return blocking_tool
+
 class InfrastructureAgent(BaseAgent):
+    # Bounds on the conversations kept for callers to resume
+    _MAX_THREADS = 256
+    _THREAD_TTL = 3600.0
+    
     def __init__(self, config: AgentConfig, aws_config: AWSConfig, terraform_config: TerraformConfig):
         super().__init__(config)
         self.infrastructure_tools = InfrastructureTools(aws_config, terraform_config)
         global_config = get_config()
         self.model = LLMFactory.create_llm(global_config.llm, global_config.langsmith)
+        self._tools: Optional[List[Any]] = None
+        # Checkpoints let callers resume a conversation by passing back the thread_id a run
+        # returned; only ids this agent issued are honoured, so one caller cannot pick up another's
+        self._checkpointer = MemorySaver()
+        self._threads: "OrderedDict[str, float]" = OrderedDict()
+        self._threads_lock = threading.Lock()
+        # The compiled graph holds no per-request state, so it is built once and reused
+        self._graph = self.build_graph()
     
     def create_tools(self) -> List[Any]:
+        """Return the agent's tools, building their schemas only once per instance."""
+        if self._tools is None:
+            self._tools = self._build_tools()
+        return self._tools
+    
+    def _build_tools(self) -> List[Any]:
         @tool
-        def terraform_init() -> str:
+        async def terraform_init() -> str:
             """
             Initialize Terraform working directory and download providers.
             
             Returns:
                 JSON string with initialization results and output
             """
-            result = self.infrastructure_tools.terraform_init()
-            return json.dumps(result, default=str)
+            result = await self.infrastructure_tools.terraform_init()
+            return dumps(result)
         
         @tool
-        def terraform_plan(var_file: str = None, target: str = None) -> str:
+        async def terraform_plan(var_file: str = None, target: str = None) -> str:
             """
             Create Terraform execution plan showing what changes will be made.
             
@@ -44,11 +138,38 @@ class InfrastructureAgent(BaseAgent):
             Returns:
                 JSON string with plan results and change summary
             """
-            result = self.infrastructure_tools.terraform_plan(var_file, target)
-            return json.dumps(result, default=str)
+            result = await self.infrastructure_tools.terraform_plan(var_file, target)
+            return dumps(result)
         
         @tool
-        def terraform_apply(var_file: str = None, target: str = None) -> str:
+        async def terraform_plan_targets(targets: str, var_file: str = None, refresh: bool = True) -> str:
+            """
+            Create Terraform plans for several independent resources in parallel.
+            
+            Args:
+                targets: JSON array of resource addresses (e.g., '["aws_instance.web", "module.db"]')
+                var_file: Path to Terraform variables file (optional)
+                refresh: Set to false to skip refreshing state from providers (faster)
+            
+            Returns:
+                JSON string with one plan result per target
+            """
+            try:
+                target_list = _TARGETS.validate_json(targets)
+            except ValidationError:
+                return dumps({
+                    "status": "error",
+                    "error": "Invalid JSON targets"
+                })
+            
+            results = await self.infrastructure_tools.terraform_plan_many(target_list, var_file, refresh)
+            return dumps({
+                "status": "success" if all(r["status"] == "success" for r in results) else "error",
+                "plans": results
+            })
+        
+        @tool
+        async def terraform_apply(var_file: str = None, target: str = None) -> str:
             """
             Apply Terraform configuration to create/update infrastructure.
             
@@ -59,11 +180,11 @@ class InfrastructureAgent(BaseAgent):
             Returns:
                 JSON string with apply results and output
             """
-            result = self.infrastructure_tools.terraform_apply(var_file, target)
-            return json.dumps(result, default=str)
+            result = await self.infrastructure_tools.terraform_apply(var_file, target)
+            return dumps(result)
         
         @tool
-        def terraform_destroy(var_file: str = None, target: str = None) -> str:
+        async def terraform_destroy(var_file: str = None, target: str = None) -> str:
             """
             Destroy Terraform-managed infrastructure.
             
@@ -74,129 +195,106 @@ class InfrastructureAgent(BaseAgent):
             Returns:
                 JSON string with destroy results and output
             """
-            result = self.infrastructure_tools.terraform_destroy(var_file, target)
-            return json.dumps(result, default=str)
+            result = await self.infrastructure_tools.terraform_destroy(var_file, target)
+            return dumps(result)
         
         @tool
-        def list_ec2_instances(filters: str = None) -> str:
+        def list_ec2_instances(filters: str = None, max_results: int = DEFAULT_PAGE_SIZE,
+                               next_token: str = None, regions: str = None) -> str:
             """
-            List AWS EC2 instances with optional filtering.
+            List AWS EC2 instances with optional filtering, one page at a time.
             
             Args:
                 filters: JSON string of EC2 filters (e.g., '{"instance-state-name": ["running"]}')
+                max_results: Maximum number of instances to return (per region when sweeping regions)
+                next_token: Token from a previous call to fetch the next page
+                regions: JSON array of regions to sweep concurrently (e.g., '["us-east-1", "eu-west-1"]')
             
             Returns:
                 JSON string with EC2 instance details
             """
             try:
-                filter_dict = json.loads(filters) if filters else None
-            except json.JSONDecodeError:
-                return json.dumps({
+                filter_dict = _EC2_FILTERS.validate_json(filters) if filters else None
+            except ValidationError:
+                return dumps({
                     "status": "error",
                     "error": "Invalid JSON filters"
                 })
             
-            result = self.infrastructure_tools.list_ec2_instances(filter_dict)
-            return json.dumps(result, default=str)
+            if regions:
+                try:
+                    region_list = _REGIONS.validate_json(regions)
+                except ValidationError:
+                    return dumps({
+                        "status": "error",
+                        "error": "Invalid JSON regions"
+                    })
+                result = self.infrastructure_tools.list_ec2_instances_by_region(region_list, filter_dict, max_results)
+            else:
+                result = self.infrastructure_tools.list_ec2_instances(filter_dict, max_results, next_token)
+            return dumps(result)
         
         @tool
-        def list_s3_buckets() -> str:
+        def list_s3_buckets(max_results: int = DEFAULT_PAGE_SIZE, next_token: str = None) -> str:
             """
-            List all S3 buckets in the AWS account.
+            List S3 buckets in the AWS account, one page at a time.
+            
+            Args:
+                max_results: Maximum number of buckets to return
+                next_token: Token from a previous call to fetch the next page
             
             Returns:
                 JSON string with S3 bucket details
             """
-            result = self.infrastructure_tools.list_s3_buckets()
-            return json.dumps(result, default=str)
+            result = self.infrastructure_tools.list_s3_buckets(max_results, next_token)
+            return dumps(result)
         
         @tool
-        def list_cloudformation_stacks(status_filter: str = None) -> str:
+        def list_cloudformation_stacks(status_filter: str = None, max_results: int = DEFAULT_PAGE_SIZE,
+                                       next_token: str = None) -> str:
             """
-            List AWS CloudFormation stacks with optional status filtering.
+            List AWS CloudFormation stacks with optional status filtering, one page at a time.
             
             Args:
                 status_filter: JSON array of status filters (e.g., '["CREATE_COMPLETE", "UPDATE_COMPLETE"]')
+                max_results: Maximum number of stacks to return
+                next_token: Token from a previous call to fetch the next page
             
             Returns:
                 JSON string with CloudFormation stack details
             """
             try:
-                status_list = json.loads(status_filter) if status_filter else None
-            except json.JSONDecodeError:
-                return json.dumps({
+                status_list = _STATUS_FILTER.validate_json(status_filter) if status_filter else None
+            except ValidationError:
+                return dumps({
                     "status": "error",
                     "error": "Invalid JSON status filter"
                 })
             
-            result = self.infrastructure_tools.list_cloudformation_stacks(status_list)
-            return json.dumps(result, default=str)
+            result = self.infrastructure_tools.list_cloudformation_stacks(status_list, max_results, next_token)
+            return dumps(result)
         
-        return [
+        terraform_tools = [event_loop.with_sync_entry(t) for t in (
             terraform_init,
             terraform_plan,
+            terraform_plan_targets,
             terraform_apply,
-            terraform_destroy,
+            terraform_destroy
+        )]
+        aws_tools = [_offload_to_executor(t) for t in (
             list_ec2_instances,
             list_s3_buckets,
             list_cloudformation_stacks
-        ]
+        )]
+        return terraform_tools + aws_tools
     
     def build_graph(self) -> Any:
         tools = self.create_tools()
         
-        system_prompt = """You are an infrastructure management specialist agent. Your responsibilities include:
-
-1. **Terraform Operations**: Manage infrastructure as code with Terraform
-2. **AWS Resource Management**: Monitor and interact with AWS services
-3. **Infrastructure Planning**: Plan and validate infrastructure changes
-4. **Resource Monitoring**: Track resource status and utilization
-
-Key capabilities:
-- Execute Terraform lifecycle operations (init, plan, apply, destroy)
-- Query AWS resources (EC2, S3, CloudFormation)
-- Validate infrastructure configurations
-- Provide cost and security recommendations
-- Implement infrastructure best practices
-
-Terraform Workflow:
-1. Always run `terraform init` before other operations
-2. Use `terraform plan` to preview changes before applying
-3. Execute `terraform apply` with caution - verify plans first
-4. Use targeted operations for specific resources when needed
-5. Document all infrastructure changes
-
-AWS Resource Management:
-- Query EC2 instances by state, type, or tags
-- Monitor S3 buckets and their configurations
-- Track CloudFormation stack status and changes
-- Apply appropriate filters for efficient resource discovery
-
-Security Best Practices:
-- Validate all inputs and commands
-- Use least-privilege access principles
-- Audit all infrastructure changes
-- Never expose sensitive credentials
-- Follow AWS security guidelines
-
-Safety Guidelines:
-- Always preview changes with terraform plan first
-- Confirm destructive operations before execution
-- Use targeted deployments for critical changes
-- Maintain infrastructure state backups
-- Implement proper change management procedures
-
-When executing operations:
-- Provide clear explanations of what will be changed
-- Highlight potential risks or impacts
-- Suggest rollback procedures for major changes
-- Monitor for errors and provide troubleshooting guidance
-- Document successful deployments and configurations"""
-
         agent = create_react_agent(
             model=self.model,
             tools=tools,
-            prompt=system_prompt
+            prompt=LLMFactory.system_prompt(_INFRASTRUCTURE_SYSTEM_PROMPT, get_config().llm)
         )
         
         graph_builder = StateGraph(BaseAgentState)
@@ -204,40 +302,50 @@ When executing operations:
         graph_builder.set_entry_point("agent")
         graph_builder.add_edge("agent", END)
         
-        return graph_builder.compile()
+        return graph_builder.compile(checkpointer=self._checkpointer)
+    
+    def _run_config(self, context: Optional[Dict[str, Any]],
+                    session_name: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """Build the checkpointer config; the token is the run's thread id."""
+        run_config = dict(self._session_config(session_name) or {})
+        requested = (context or {}).get("thread_id")
+        with self._threads_lock:
+            expired = self._expire_threads()
+            thread_id = requested if requested in self._threads else uuid.uuid4().hex
+        self._drop_threads(expired)
+        run_config["configurable"] = {"thread_id": thread_id}
+        return run_config, thread_id
+    
+    def _result_fields(self, thread_id: str) -> Dict[str, Any]:
+        # Handing the id to the caller is what makes the thread resumable
+        with self._threads_lock:
+            self._threads[thread_id] = time.monotonic()
+            self._threads.move_to_end(thread_id)
+            evicted = self._expire_threads()
+            while len(self._threads) > self._MAX_THREADS:
+                evicted.append(self._threads.popitem(last=False)[0])
+        self._drop_threads(evicted)
+        return {"thread_id": thread_id}
+    
+    def _release_run(self, thread_id: str) -> None:
+        # Threads never handed out (streams, failed runs) cannot be resumed, so drop them now
+        with self._threads_lock:
+            issued = thread_id in self._threads
+        if not issued:
+            self._checkpointer.delete_thread(thread_id)
+    
+    def _expire_threads(self) -> List[str]:
+        """Remove threads idle past the TTL from the registry; call with _threads_lock held."""
+        cutoff = time.monotonic() - self._THREAD_TTL
+        expired = []
+        while self._threads:
+            thread_id, last_used = next(iter(self._threads.items()))
+            if last_used > cutoff:
+                break
+            del self._threads[thread_id]
+            expired.append(thread_id)
+        return expired
     
-    def run(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute the infrastructure management agent with user input."""
-        try:
-            graph = self.build_graph()
-            initial_state = self.get_initial_state()
-            
-            if context:
-                initial_state["context"].update(context)
-            
-            inputs = {
-                "messages": [HumanMessage(content=user_input)],
-                "metadata": initial_state["metadata"],
-                "context": initial_state["context"],
-                "error_count": 0,
-                "max_retries": self.config.max_retries
-            }
-            
-            self.logger.info("Starting infrastructure agent execution", input=user_input)
-            
-            result = graph.invoke(inputs)
-            
-            return {
-                "status": "success",
-                "response": result["messages"][-1].content if result["messages"] else "No response",
-                "metadata": result.get("metadata", {}),
-                "context": result.get("context", {})
-            }
-            
-        except Exception as e:
-            self.logger.error("Infrastructure agent execution failed", error=str(e))
-            return {
-                "status": "error",
-                "error": str(e),
-                "response": "I encountered an error while processing your request."
-            }
\ No newline at end of file
+    def _drop_threads(self, thread_ids: List[str]) -> None:
+        for thread_id in thread_ids:
+            self._checkpointer.delete_thread(thread_id)
@@ -1,66 +1,272 @@
-import subprocess
+import asyncio
+import base64
+import hashlib
 import json
 import os
-from typing import Dict, Any, List, Optional
+import shlex
+import threading
+from collections import Counter, deque
+from functools import lru_cache, wraps
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Callable, Deque, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from cachetools import TTLCache
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential
+from botocore.config import Config as BotocoreConfig
+from botocore.exceptions import ClientError, NoCredentialsError
 # Defer boto3 import to avoid AWS profile errors at module load
 
 from shared.security import audit_log, require_security_check
+from shared import event_loop
 
 logger = structlog.get_logger(__name__)
 
+# Listing tools return one bounded page at a time; callers follow next_token for more
+DEFAULT_PAGE_SIZE = 50
+
+_tag_pair = itemgetter('Key', 'Value')
+
+def _ec2_filter_kwargs(filters: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+    if not filters:
+        return {}
+    return {"Filters": [{"Name": key, "Values": values} for key, values in filters.items()]}
+
+def _iter_instances(pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Flatten DescribeInstances pages into a stream of instances, dropping the reservation level."""
+    return chain.from_iterable(reservation['Instances'] for page in pages for reservation in page['Reservations'])
+
+def _instance_row(instance: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one DescribeInstances instance into the row shape the tools return."""
+    return {
+        "instance_id": instance['InstanceId'],
+        "instance_type": instance['InstanceType'],
+        "state": instance['State']['Name'],
+        "private_ip": instance.get('PrivateIpAddress'),
+        "public_ip": instance.get('PublicIpAddress'),
+        "tags": dict(map(_tag_pair, instance.get('Tags', ())))
+    }
+
+# AWS inventory listings are reused for a short window; Terraform apply/destroy clears them
+_LIST_CACHE_TTL = 30
+
+# Written inside .terraform/ after a successful init, holding the configuration fingerprint
+_INIT_STAMP_NAME = ".init-stamp"
+_LIST_CACHE_SIZE = 64
+
+def _stack_page_token(aws_token: Optional[str], offset: int) -> str:
+    """Encode a ListStacks resume point: the token of the page being read and how far into it."""
+    return base64.urlsafe_b64encode(json.dumps([aws_token, offset]).encode()).decode()
+
+def _parse_stack_page_token(token: Optional[str]) -> Tuple[Optional[str], int]:
+    if not token:
+        return None, 0
+    try:
+        aws_token, offset = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return aws_token, int(offset)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid next_token for CloudFormation stacks")
+
+def _freeze(value: Any) -> Any:
+    """Turn nested dict/list arguments into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(map(_freeze, value))
+    return value
+
+def _succeeded(result: Dict[str, Any]) -> bool:
+    return result.get("status") == "success"
+
+def _all_regions_succeeded(result: Dict[str, Any]) -> bool:
+    # A sweep succeeds overall even when some regions failed; those must not be served for the TTL
+    return _succeeded(result) and not any(
+        region.get("status") == "error" for region in result.get("regions", {}).values()
+    )
+
+def _ttl_cached(name: str, cacheable: Callable[[Dict[str, Any]], bool] = _succeeded):
+    """Serve repeated successful list_* calls from the instance's TTL cache."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (name, _freeze(args), _freeze(kwargs))
+            with self._list_cache_lock:
+                cached = self._list_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            result = func(self, *args, **kwargs)
+            if cacheable(result):
+                with self._list_cache_lock:
+                    self._list_cache[key] = result
+            return result
+        return wrapper
+    return decorator
+
+_SESSION_LOCK = threading.Lock()
+
+# Adaptive retries back off exponentially with jitter on throttling errors
+# (Throttling, RequestLimitExceeded, ...) and rate-limit the client to what AWS accepts.
+# The connection pool is sized for the regional sweep workers and kept alive between calls.
+_AWS_CLIENT_CONFIG = BotocoreConfig(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30
+)
+
+@lru_cache(maxsize=8)
+def _load_session(region: str, profile: Optional[str], access_key_id: Optional[str],
+                  secret_access_key: Optional[str], session_token: Optional[str]) -> Any:
+    """Build a boto3 Session, shared by every InfrastructureTools with the same credentials."""
+    # Import boto3 here to avoid module-level AWS config loading
+    import boto3
+    
+    session_kwargs = {"region_name": region}
+    
+    if profile:
+        session_kwargs["profile_name"] = profile
+    
+    if access_key_id and secret_access_key:
+        session_kwargs.update({
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key
+        })
+        if session_token:
+            session_kwargs["aws_session_token"] = session_token
+    
+    return boto3.Session(**session_kwargs)
+
+# Only the tail of Terraform output is useful to the agent; older lines are dropped as they stream in
+TERRAFORM_OUTPUT_MAX_LINES = 4096
+# Per-line read limit for subprocess pipes (asyncio's default is 64 KiB)
+_STREAM_LINE_LIMIT = 1024 * 1024
+
+def _plan_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    if "return_code" in result:
+        # With -detailed-exitcode, 2 means the plan succeeded and changes are present
+        result["has_changes"] = result["return_code"] == 2
+        if result["has_changes"]:
+            result["status"] = "success"
+    return result
+
+class _OutputTail:
+    """Bounded buffer holding the last lines of a stream, plus how many lines were seen."""
+    
+    def __init__(self, maxlen: int = TERRAFORM_OUTPUT_MAX_LINES):
+        self.lines: Deque[str] = deque(maxlen=maxlen)
+        self.count = 0
+
+async def _tail(stream: asyncio.StreamReader, tail: _OutputTail) -> None:
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        tail.lines.append(line.decode(errors="replace"))
+        tail.count += 1
+
 class AWSConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     region: str = Field(default="us-east-1", description="AWS region")
     profile: Optional[str] = Field(default=None, description="AWS profile name")
     access_key_id: Optional[str] = Field(default=None, description="AWS access key ID")
     secret_access_key: Optional[str] = Field(default=None, description="AWS secret access key")
     session_token: Optional[str] = Field(default=None, description="AWS session token")
+    validate_on_init: bool = Field(default=False, description="Check credentials with STS at startup instead of on first use")
 
 class TerraformConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     working_directory: str = Field(..., description="Terraform working directory")
     state_backend: Optional[str] = Field(default=None, description="Terraform state backend")
     variables_file: Optional[str] = Field(default=None, description="Terraform variables file")
     auto_approve: bool = Field(default=False, description="Auto-approve Terraform operations")
+    plugin_cache_dir: str = Field(
+        default_factory=lambda: os.getenv("TF_PLUGIN_CACHE_DIR", os.path.expanduser("~/.terraform.d/plugin-cache")),
+        description="Shared provider plugin cache; point at a persistent volume to survive restarts"
+    )
+    # Terraform's default of 10 concurrent operations leaves large graphs waiting on scheduling;
+    # higher values trade CPU and provider API rate for wall-clock time
+    parallelism: int = Field(
+        default_factory=lambda: (os.cpu_count() or 1) * 3,
+        description="Value passed to -parallelism for plan, apply and destroy"
+    )
 
 class InfrastructureTools:
     def __init__(self, aws_config: AWSConfig, terraform_config: TerraformConfig):
         self.aws_config = aws_config
         self.terraform_config = terraform_config
+        self._list_cache = TTLCache(maxsize=_LIST_CACHE_SIZE, ttl=_LIST_CACHE_TTL)
+        self._list_cache_lock = threading.Lock()
         self._setup_aws_session()
         self._validate_terraform_directory()
+        self._setup_plugin_cache()
+        self._tf_env = self._build_terraform_env()
+    
+    def _build_terraform_env(self) -> Dict[str, str]:
+        """Environment for Terraform subprocesses, built once since its inputs do not change."""
+        env = dict(os.environ)
+        credentials = {
+            "AWS_ACCESS_KEY_ID": self.aws_config.access_key_id,
+            "AWS_SECRET_ACCESS_KEY": self.aws_config.secret_access_key,
+            "AWS_SESSION_TOKEN": self.aws_config.session_token
+        }
+        env.update({key: value for key, value in credentials.items() if value})
+        # Reuse downloaded providers across terraform init runs
+        env.setdefault("TF_PLUGIN_CACHE_DIR", self.terraform_config.plugin_cache_dir)
+        env.setdefault("TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE", "true")
+        return env
     
     def _setup_aws_session(self):
-        try:
-            # Import boto3 here to avoid module-level AWS config loading
-            import boto3
-            from botocore.exceptions import ClientError, NoCredentialsError
-            
-            session_kwargs = {"region_name": self.aws_config.region}
-            
-            if self.aws_config.profile:
-                session_kwargs["profile_name"] = self.aws_config.profile
-            
-            if self.aws_config.access_key_id and self.aws_config.secret_access_key:
-                session_kwargs.update({
-                    "aws_access_key_id": self.aws_config.access_key_id,
-                    "aws_secret_access_key": self.aws_config.secret_access_key
-                })
-                if self.aws_config.session_token:
-                    session_kwargs["aws_session_token"] = self.aws_config.session_token
-            
-            self.session = boto3.Session(**session_kwargs)
-            
-            # Test connection
-            sts = self.session.client('sts')
-            identity = sts.get_caller_identity()
-            logger.info("AWS session established", account=identity.get('Account'), user=identity.get('Arn'))
-            
-        except (NoCredentialsError, ClientError) as e:
-            logger.error("Failed to establish AWS session", error=str(e))
-            self.session = None
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._identity_lock = threading.Lock()
+        self._identity_checked = False
+        self.session = _load_session(
+            self.aws_config.region,
+            self.aws_config.profile,
+            self.aws_config.access_key_id,
+            self.aws_config.secret_access_key,
+            self.aws_config.session_token
+        )
+        if self.aws_config.validate_on_init:
+            self._verify_identity()
+    
+    def _verify_identity(self):
+        """Confirm the credentials with STS once; on failure the session is disabled."""
+        with self._identity_lock:
+            if self._identity_checked:
+                return
+            self._identity_checked = True
+            if self.session is None:
+                return
+            
+            try:
+                identity = self.session.client('sts').get_caller_identity()
+                logger.info("AWS session established", account=identity.get('Account'), user=identity.get('Arn'))
+            except (NoCredentialsError, ClientError) as e:
+                logger.error("Failed to establish AWS session", error=str(e))
+                self.session = None
+    
+    def _aws_ready(self) -> bool:
+        if not self._identity_checked:
+            self._verify_identity()
+        return self.session is not None
+    
+    def _client(self, service: str, region: Optional[str] = None) -> Any:
+        """Return a cached boto3 client; building one re-parses the service model."""
+        key = (service, region)
+        client = self._clients.get(key)
+        if client is None:
+            # Session.client() is not thread-safe, and sessions are shared between instances
+            with _SESSION_LOCK:
+                client = self._clients.get(key)
+                if client is None:
+                    kwargs = {"region_name": region} if region else {}
+                    client = self._clients[key] = self.session.client(service, config=_AWS_CLIENT_CONFIG, **kwargs)
+        return client
     
     def _validate_terraform_directory(self):
         tf_dir = Path(self.terraform_config.working_directory)
@@ -69,203 +275,238 @@ class InfrastructureTools:
         elif not any(tf_dir.glob("*.tf")):
             logger.warning("No Terraform files found in directory", directory=str(tf_dir))
     
+    def invalidate_list_cache(self):
+        """Drop cached AWS listings so the next call goes to AWS."""
+        with self._list_cache_lock:
+            self._list_cache.clear()
+    
+    def _setup_plugin_cache(self):
+        try:
+            os.makedirs(self.terraform_config.plugin_cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning("Terraform plugin cache unavailable", directory=self.terraform_config.plugin_cache_dir, error=str(e))
+    
+    def _init_fingerprint(self) -> Optional[str]:
+        """BLAKE2b over the *.tf files and lock file; None when there is no configuration."""
+        tf_dir = Path(self.terraform_config.working_directory)
+        tf_files = sorted(tf_dir.glob("*.tf"))
+        if not tf_files:
+            return None
+        
+        digest = hashlib.blake2b(digest_size=32)
+        for path in tf_files + [tf_dir / ".terraform.lock.hcl"]:
+            if path.exists():
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+    
+    def _init_stamp_path(self) -> Path:
+        return Path(self.terraform_config.working_directory) / ".terraform" / _INIT_STAMP_NAME
+    
+    def _read_init_stamp(self) -> Optional[str]:
+        try:
+            return self._init_stamp_path().read_text().strip()
+        except OSError:
+            return None
+    
+    def _write_init_stamp(self):
+        fingerprint = self._init_fingerprint()
+        if fingerprint is None:
+            return
+        try:
+            self._init_stamp_path().write_text(fingerprint)
+        except OSError as e:
+            logger.warning("Failed to write terraform init stamp", error=str(e))
+    
     @audit_log("terraform_init")
     @require_security_check
-    def terraform_init(self) -> Dict[str, Any]:
+    async def terraform_init(self) -> Dict[str, Any]:
         try:
-            cmd = ["terraform", "init"]
-            result = self._run_terraform_command(cmd)
-            
-            return {
-                "status": "success" if result["return_code"] == 0 else "error",
-                "command": " ".join(cmd),
-                "output": result["stdout"],
-                "error": result["stderr"],
-                "return_code": result["return_code"]
-            }
-            
+            # Configuration and lock file unchanged since the last successful init: nothing to do
+            fingerprint = await asyncio.to_thread(self._init_fingerprint)
+            if fingerprint is not None and fingerprint == await asyncio.to_thread(self._read_init_stamp):
+                return {
+                    "status": "success",
+                    "command": "terraform init",
+                    "cached": True,
+                    "output": "Terraform configuration unchanged since last init; skipped",
+                    "return_code": 0
+                }
         except Exception as e:
-            logger.error("Terraform init failed", error=str(e))
-            return {
-                "status": "error",
-                "error": str(e),
-                "command": "terraform init"
-            }
+            logger.warning("Terraform init stamp check failed", error=str(e))
+        
+        result = await self._run("init")
+        if result.get("return_code") == 0:
+            # init may create or update the lock file, so stamp what it left behind
+            await asyncio.to_thread(self._write_init_stamp)
+        return result
     
     @audit_log("terraform_plan")
     @require_security_check
-    def terraform_plan(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
-        try:
-            cmd = ["terraform", "plan", "-detailed-exitcode"]
-            
-            if var_file or self.terraform_config.variables_file:
-                var_path = var_file or self.terraform_config.variables_file
-                cmd.extend(["-var-file", var_path])
-            
-            if target:
-                cmd.extend(["-target", target])
-            
-            result = self._run_terraform_command(cmd)
-            
-            # Exit code 2 means changes are present
-            has_changes = result["return_code"] == 2
-            
-            return {
-                "status": "success",
-                "command": " ".join(cmd),
-                "has_changes": has_changes,
-                "output": result["stdout"],
-                "error": result["stderr"],
-                "return_code": result["return_code"]
-            }
-            
-        except Exception as e:
-            logger.error("Terraform plan failed", error=str(e))
-            return {
-                "status": "error",
-                "error": str(e),
-                "command": "terraform plan"
-            }
+    async def terraform_plan(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
+        return _plan_result(await self._run("plan", var_file, target))
+    
+    @audit_log("terraform_plan_many")
+    @require_security_check
+    async def terraform_plan_many(self, targets: List[str], var_file: Optional[str] = None,
+                                  refresh: bool = True) -> List[Dict[str, Any]]:
+        """
+        Plan several independent targets as concurrent Terraform processes.
+        
+        Plans only read state, so each runs with -lock=false; pass refresh=False to
+        also skip the provider refresh. Concurrency is capped at a quarter of the
+        configured parallelism, since each process runs its own parallel graph walk.
+        """
+        extra_args = ["-lock=false"] if refresh else ["-lock=false", "-refresh=false"]
+        semaphore = asyncio.Semaphore(max(1, self.terraform_config.parallelism // 4))
+        
+        async def plan(target: str) -> Dict[str, Any]:
+            async with semaphore:
+                result = _plan_result(await self._run("plan", var_file, target, extra_args))
+            result["target"] = target
+            return result
+        
+        return list(await asyncio.gather(*(plan(target) for target in targets)))
     
     @audit_log("terraform_apply")
     @require_security_check
-    def terraform_apply(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
-        try:
-            cmd = ["terraform", "apply"]
-            
-            if self.terraform_config.auto_approve:
-                cmd.append("-auto-approve")
-            
-            if var_file or self.terraform_config.variables_file:
-                var_path = var_file or self.terraform_config.variables_file
-                cmd.extend(["-var-file", var_path])
-            
-            if target:
-                cmd.extend(["-target", target])
-            
-            result = self._run_terraform_command(cmd)
-            
-            return {
-                "status": "success" if result["return_code"] == 0 else "error",
-                "command": " ".join(cmd),
-                "output": result["stdout"],
-                "error": result["stderr"],
-                "return_code": result["return_code"]
-            }
-            
-        except Exception as e:
-            logger.error("Terraform apply failed", error=str(e))
-            return {
-                "status": "error",
-                "error": str(e),
-                "command": "terraform apply"
-            }
+    async def terraform_apply(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
+        result = await self._run("apply", var_file, target)
+        if result.get("return_code") == 0:
+            # Infrastructure changed, so cached AWS inventory is stale
+            self.invalidate_list_cache()
+        return result
     
     @audit_log("terraform_destroy")
     @require_security_check
-    def terraform_destroy(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
+    async def terraform_destroy(self, var_file: Optional[str] = None, target: Optional[str] = None) -> Dict[str, Any]:
+        result = await self._run("destroy", var_file, target)
+        if result.get("return_code") == 0:
+            # Infrastructure changed, so cached AWS inventory is stale
+            self.invalidate_list_cache()
+        return result
+    
+    def _build_command(self, subcommand: str, var_file: Optional[str] = None, target: Optional[str] = None,
+                       extra_args: Iterable[str] = ()) -> List[str]:
+        cmd = ["terraform", subcommand]
+        if subcommand == "init":
+            return cmd
+        
+        if subcommand == "plan":
+            cmd.append("-detailed-exitcode")
+        cmd.extend(["-parallelism", str(self.terraform_config.parallelism)])
+        
+        if subcommand in ("apply", "destroy") and self.terraform_config.auto_approve:
+            cmd.append("-auto-approve")
+        
+        if var_file or self.terraform_config.variables_file:
+            var_path = var_file or self.terraform_config.variables_file
+            cmd.extend(["-var-file", var_path])
+        
+        if target:
+            cmd.extend(["-target", target])
+        
+        cmd.extend(extra_args)
+        return cmd
+    
+    async def _run(self, subcommand: str, var_file: Optional[str] = None, target: Optional[str] = None,
+                   extra_args: Iterable[str] = ()) -> Dict[str, Any]:
+        """Run one terraform subcommand and shape the common result dict."""
+        cmd = self._build_command(subcommand, var_file, target, extra_args)
+        command = shlex.join(cmd)
         try:
-            cmd = ["terraform", "destroy"]
-            
-            if self.terraform_config.auto_approve:
-                cmd.append("-auto-approve")
-            
-            if var_file or self.terraform_config.variables_file:
-                var_path = var_file or self.terraform_config.variables_file
-                cmd.extend(["-var-file", var_path])
-            
-            if target:
-                cmd.extend(["-target", target])
-            
-            result = self._run_terraform_command(cmd)
+            result = await self._run_terraform_command(cmd)
             
             return {
                 "status": "success" if result["return_code"] == 0 else "error",
-                "command": " ".join(cmd),
+                "command": command,
                 "output": result["stdout"],
+                "output_lines": result["stdout_lines"],
                 "error": result["stderr"],
                 "return_code": result["return_code"]
             }
             
         except Exception as e:
-            logger.error("Terraform destroy failed", error=str(e))
+            logger.error(f"Terraform {subcommand} failed", error=str(e))
             return {
                 "status": "error",
                 "error": str(e),
-                "command": "terraform destroy"
+                "command": command
             }
     
-    def _run_terraform_command(self, cmd: List[str]) -> Dict[str, Any]:
+    async def _run_terraform_command(self, cmd: List[str]) -> Dict[str, Any]:
+        proc = None
+        stdout, stderr = _OutputTail(), _OutputTail()
         try:
-            env = os.environ.copy()
-            if self.aws_config.access_key_id:
-                env["AWS_ACCESS_KEY_ID"] = self.aws_config.access_key_id
-            if self.aws_config.secret_access_key:
-                env["AWS_SECRET_ACCESS_KEY"] = self.aws_config.secret_access_key
-            if self.aws_config.session_token:
-                env["AWS_SESSION_TOKEN"] = self.aws_config.session_token
-            
-            result = subprocess.run(
-                cmd,
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
                 cwd=self.terraform_config.working_directory,
-                capture_output=True,
-                text=True,
-                timeout=1800,  # 30 minutes timeout
-                env=env
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self._tf_env,
+                limit=_STREAM_LINE_LIMIT
             )
             
+            async def run_to_completion():
+                await asyncio.gather(_tail(proc.stdout, stdout), _tail(proc.stderr, stderr))
+                await proc.wait()
+            
+            await asyncio.wait_for(run_to_completion(), timeout=1800)  # 30 minutes timeout
+            
             return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode
+                "stdout": "".join(stdout.lines),
+                "stderr": "".join(stderr.lines),
+                "stdout_lines": stdout.count,
+                "stderr_lines": stderr.count,
+                "return_code": proc.returncode
             }
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
             return {
-                "stdout": "",
+                "stdout": "".join(stdout.lines),
                 "stderr": "Command timed out after 30 minutes",
+                "stdout_lines": stdout.count,
+                "stderr_lines": stderr.count,
                 "return_code": -1
             }
         except Exception as e:
             return {
                 "stdout": "",
                 "stderr": str(e),
+                "stdout_lines": 0,
+                "stderr_lines": 0,
                 "return_code": -1
             }
     
     @audit_log("aws_ec2_list")
-    def list_ec2_instances(self, filters: Dict[str, List[str]] = None) -> Dict[str, Any]:
+    @_ttl_cached("ec2_list")
+    def list_ec2_instances(self, filters: Dict[str, List[str]] = None,
+                           max_results: int = DEFAULT_PAGE_SIZE,
+                           next_token: Optional[str] = None) -> Dict[str, Any]:
+        """List one page of EC2 instances."""
         try:
-            if not self.session:
+            if not self._aws_ready():
                 return {"status": "error", "error": "AWS session not available"}
             
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             
-            kwargs = {}
-            if filters:
-                aws_filters = []
-                for key, values in filters.items():
-                    aws_filters.append({"Name": key, "Values": values})
-                kwargs["Filters"] = aws_filters
+            kwargs = _ec2_filter_kwargs(filters)
+            # DescribeInstances accepts page sizes between 5 and 1000
+            kwargs["MaxResults"] = min(max(max_results, 5), 1000)
+            if next_token:
+                kwargs["NextToken"] = next_token
             
             response = ec2.describe_instances(**kwargs)
-            
-            instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    instances.append({
-                        "instance_id": instance['InstanceId'],
-                        "instance_type": instance['InstanceType'],
-                        "state": instance['State']['Name'],
-                        "private_ip": instance.get('PrivateIpAddress'),
-                        "public_ip": instance.get('PublicIpAddress'),
-                        "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                    })
+            instances = list(map(_instance_row, _iter_instances([response])))
             
             return {
                 "status": "success",
                 "instances": instances,
-                "instance_count": len(instances)
+                "instance_count": len(instances),
+                "state_counts": dict(Counter(instance["state"] for instance in instances)),
+                "next_token": response.get('NextToken')
             }
             
         except ClientError as e:
@@ -275,14 +516,54 @@ class InfrastructureTools:
                 "error": str(e)
             }
     
+    @audit_log("aws_ec2_list_regions")
+    @_ttl_cached("ec2_list_regions", cacheable=_all_regions_succeeded)
+    def list_ec2_instances_by_region(self, regions: List[str], filters: Dict[str, List[str]] = None,
+                                     max_results: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Sweep several regions concurrently, returning up to max_results instances per region."""
+        if not self._aws_ready():
+            return {"status": "error", "error": "AWS session not available"}
+        
+        kwargs = _ec2_filter_kwargs(filters)
+        
+        def sweep(region: str) -> Dict[str, Any]:
+            try:
+                paginator = self._client('ec2', region).get_paginator('describe_instances')
+                pages = paginator.paginate(**kwargs, PaginationConfig={'PageSize': 1000})
+                # Pages are fetched lazily, so stopping at max_results + 1 avoids reading the rest
+                fetched = list(islice(_iter_instances(pages), max_results + 1))
+                instances = list(map(_instance_row, fetched[:max_results]))
+                return {
+                    "instances": instances,
+                    "instance_count": len(instances),
+                    "truncated": len(fetched) > max_results
+                }
+            except Exception as e:
+                logger.error("Failed to list EC2 instances", region=region, error=str(e))
+                return {"status": "error", "error": str(e)}
+        
+        # boto3 clients are thread-safe; each worker builds its own regional client
+        results = dict(zip(regions, event_loop.map_blocking(sweep, regions)))
+        
+        return {
+            "status": "success",
+            "regions": results,
+            "instance_count": sum(r.get("instance_count", 0) for r in results.values())
+        }
+    
     @audit_log("aws_s3_list")
-    def list_s3_buckets(self) -> Dict[str, Any]:
+    @_ttl_cached("s3_list")
+    def list_s3_buckets(self, max_results: int = DEFAULT_PAGE_SIZE,
+                        next_token: Optional[str] = None) -> Dict[str, Any]:
         try:
-            if not self.session:
+            if not self._aws_ready():
                 return {"status": "error", "error": "AWS session not available"}
             
-            s3 = self.session.client('s3')
-            response = s3.list_buckets()
+            s3 = self._client('s3')
+            kwargs = {"MaxBuckets": max_results}
+            if next_token:
+                kwargs["ContinuationToken"] = next_token
+            response = s3.list_buckets(**kwargs)
             
             buckets = []
             for bucket in response['Buckets']:
@@ -294,7 +575,8 @@ class InfrastructureTools:
             return {
                 "status": "success",
                 "buckets": buckets,
-                "bucket_count": len(buckets)
+                "bucket_count": len(buckets),
+                "next_token": response.get('ContinuationToken')
             }
             
         except ClientError as e:
@@ -305,34 +587,63 @@ class InfrastructureTools:
             }
     
     @audit_log("aws_cloudformation_stacks")
-    def list_cloudformation_stacks(self, status_filter: List[str] = None) -> Dict[str, Any]:
+    @_ttl_cached("cloudformation_stacks")
+    def list_cloudformation_stacks(self, status_filter: List[str] = None,
+                                   max_results: int = DEFAULT_PAGE_SIZE,
+                                   next_token: Optional[str] = None) -> Dict[str, Any]:
         try:
-            if not self.session:
+            if not self._aws_ready():
                 return {"status": "error", "error": "AWS session not available"}
             
-            cf = self.session.client('cloudformation')
+            cf = self._client('cloudformation')
             
             kwargs = {}
             if status_filter:
                 kwargs["StackStatusFilter"] = status_filter
             
-            response = cf.list_stacks(**kwargs)
-            
+            # ListStacks has no page-size parameter, so a page can hold more stacks than the
+            # caller asked for. Our token records the AWS page and the offset to resume at.
+            page_token, offset = _parse_stack_page_token(next_token)
             stacks = []
-            for stack in response['StackSummaries']:
-                stacks.append({
-                    "stack_name": stack['StackName'],
-                    "stack_status": stack['StackStatus'],
-                    "creation_time": stack['CreationTime'].isoformat(),
-                    "template_description": stack.get('TemplateDescription', '')
-                })
+            resume_token = None
+            while True:
+                if page_token:
+                    kwargs["NextToken"] = page_token
+                response = cf.list_stacks(**kwargs)
+                summaries = response['StackSummaries']
+                
+                remaining = max_results - len(stacks)
+                for stack in summaries[offset:offset + remaining]:
+                    stacks.append({
+                        "stack_name": stack['StackName'],
+                        "stack_status": stack['StackStatus'],
+                        "creation_time": stack['CreationTime'].isoformat(),
+                        "template_description": stack.get('TemplateDescription', '')
+                    })
+                
+                if offset + remaining < len(summaries):
+                    resume_token = _stack_page_token(page_token, offset + remaining)
+                    break
+                page_token, offset = response.get('NextToken'), 0
+                if not page_token:
+                    break
+                if len(stacks) >= max_results:
+                    resume_token = _stack_page_token(page_token, 0)
+                    break
             
             return {
                 "status": "success",
                 "stacks": stacks,
-                "stack_count": len(stacks)
+                "stack_count": len(stacks),
+                "truncated": resume_token is not None,
+                "next_token": resume_token
             }
             
+        except ValueError as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
         except ClientError as e:
             logger.error("Failed to list CloudFormation stacks", error=str(e))
             return {
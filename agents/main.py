@@ -15,30 +15,25 @@ Usage:
 
 import argparse
 import asyncio
-import json
 import sys
 import os
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import wait
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Any, Iterable, List, Optional
 import structlog
+from cachetools import TTLCache
+import orjson
 
 # Add current directory to Python path to resolve module imports
-sys.path.append(os.path.dirname(__file__))
+_MODULE_DIR = os.path.dirname(__file__)
+if _MODULE_DIR not in sys.path:
+    sys.path.append(_MODULE_DIR)
 
 from config.settings import get_config, reload_config
 from shared.base_agent import AgentConfig
-
-from prometheus.agent import PrometheusAgent
-from prometheus.tools import PrometheusConfig
-from neo4j_agent.agent import Neo4jAgent
-from neo4j_agent.tools import Neo4jConfig
-# Import infrastructure agent conditionally to avoid AWS config issues
-try:
-    from infrastructure.agent import InfrastructureAgent
-    from infrastructure.tools import AWSConfig, TerraformConfig
-    INFRASTRUCTURE_AVAILABLE = True
-except Exception as e:
-    print(f"Infrastructure agent not available: {e}")
-    INFRASTRUCTURE_AVAILABLE = False
+from shared import event_loop
+from shared.serialization import dumps, loads
 
 # Configure structured logging
 structlog.configure(
@@ -51,7 +46,7 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=lambda event, **_: dumps(event, option=orjson.OPT_NAIVE_UTC))
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -61,109 +56,213 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Health probes touch every backend; web pages and liveness checks reuse a recent result
+HEALTH_CHECK_TTL = 10
+
+# Static description of the agents the system can provide
+AGENT_CATALOG: Dict[str, Any] = {
+    "agents": {
+        "prometheus": {
+            "description": "Monitors metrics and detects anomalies using Prometheus",
+            "capabilities": [
+                "Query Prometheus metrics",
+                "Check system health",
+                "Monitor active alerts",
+                "Detect metric anomalies"
+            ]
+        },
+        "neo4j": {
+            "description": "Interacts with Neo4j knowledge graphs",
+            "capabilities": [
+                "Execute Cypher queries",
+                "Search nodes and relationships",
+                "Find shortest paths",
+                "Analyze graph schema"
+            ]
+        },
+        "infrastructure": {
+            "description": "Manages AWS resources and Terraform deployments",
+            "capabilities": [
+                "Terraform operations (init, plan, apply, destroy)",
+                "List EC2 instances",
+                "Manage S3 buckets",
+                "Monitor CloudFormation stacks"
+            ]
+        }
+    }
+}
+
+@dataclass(slots=True)
+class _AgentBundle:
+    """Everything a request needs about one agent, resolved once at startup."""
+    name: str
+    info: Dict[str, Any]
+    agent: Optional[Any]
+    health: Callable[[], Dict[str, Any]]
+
 class AgentManager:
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, enabled_agents: Optional[Iterable[str]] = None):
         self.global_config = reload_config(config_path)
+        # Agents to build; the CLI passes just the one it is about to run
+        self.enabled_agents = frozenset(enabled_agents or AGENT_CATALOG["agents"])
         self.agents = {}
+        self._health_cache = TTLCache(maxsize=1, ttl=HEALTH_CHECK_TTL)
+        self._health_lock = threading.Lock()
+        # The process-wide pool for blocking work (agent startup, health probes, sync agent
+        # runs, tool fan-out); it also backs asyncio.to_thread on the shared background loop
+        self._io_pool = event_loop.get_io_pool()
         self._initialize_agents()
+        self._agent_by_name = self._build_dispatch_table()
+        # Discover MCP tools for all agents at once in the background, so the first
+        # query does not wait on the handshakes one agent at a time
+        self._tool_prefetch = event_loop.submit(self._prefetch_mcp_tools())
+    
+    async def _prefetch_mcp_tools(self):
+        agents = {name: agent for name, agent in self.agents.items() if hasattr(agent, "get_mcp_tools")}
+        results = await asyncio.gather(*(agent.get_mcp_tools() for agent in agents.values()), return_exceptions=True)
+        for name, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.warning("MCP tool prefetch failed", agent=name, error=str(result))
+    
+    def _build_dispatch_table(self) -> Dict[str, _AgentBundle]:
+        """Map every catalogued agent name to its bundle; agents that failed to start have agent=None."""
+        return {
+            name: _AgentBundle(
+                name=name,
+                info=info,
+                agent=self.agents.get(name),
+                health=lambda name=name: self.health_check().get("agents", {}).get(name, {})
+            )
+            for name, info in AGENT_CATALOG["agents"].items()
+        }
+    
+    def get_agent_bundle(self, agent_name: str) -> Optional[_AgentBundle]:
+        """Look up a catalogued agent by name."""
+        return self._agent_by_name.get(agent_name)
     
     def _initialize_agents(self):
-        """Initialize all agents with their configurations."""
+        """Initialize the enabled agents concurrently; their constructors do independent network I/O."""
+        builders = {
+            "prometheus": self._create_prometheus_agent,
+            "neo4j": self._create_neo4j_agent,
+            "infrastructure": self._create_infrastructure_agent
+        }
+        builders = {name: build for name, build in builders.items() if name in self.enabled_agents}
+        if not builders:
+            return
+        
+        futures = {name: self._io_pool.submit(build) for name, build in builders.items()}
+        wait(futures.values())
+        
         try:
-            # Prometheus Agent
-            prometheus_config = PrometheusConfig(
-                base_url=self.global_config.monitoring.prometheus_url,
-                auth_token=self.global_config.monitoring.prometheus_auth_token,
-                timeout=30,
-                verify_ssl=True,
-                mcp_url=self.global_config.monitoring.prometheus_mcp_url,
-                mcp_transport=self.global_config.monitoring.prometheus_mcp_transport
-            )
+            for name, future in futures.items():
+                agent = future.result()
+                if agent is not None:
+                    self.agents[name] = agent
+                    logger.info("Agent initialized", agent=name)
+        except Exception as e:
+            logger.error("Failed to initialize agents", error=str(e))
+            raise
+    
+    # Agent modules pull in LangChain, the Neo4j driver, boto3 and friends, so each
+    # is imported only when that agent is actually built
+    
+    def _create_prometheus_agent(self):
+        from prometheus.agent import PrometheusAgent
+        from prometheus.tools import PrometheusConfig
+        
+        prometheus_config = PrometheusConfig(
+            base_url=self.global_config.monitoring.prometheus_url,
+            auth_token=self.global_config.monitoring.prometheus_auth_token,
+            timeout=30,
+            verify_ssl=True,
+            mcp_url=self.global_config.monitoring.prometheus_mcp_url,
+            mcp_transport=self.global_config.monitoring.prometheus_mcp_transport
+        )
+        
+        prometheus_agent_config = AgentConfig(
+            name="prometheus_agent",
+            model_name=self.global_config.llm.model_name,
+            temperature=self.global_config.llm.temperature,
+            max_tokens=self.global_config.llm.max_tokens,
+            max_retries=self.global_config.security.max_retry_attempts,
+            system_prompt="You are a Prometheus monitoring specialist."
+        )
+        
+        return PrometheusAgent(prometheus_agent_config, prometheus_config)
+    
+    def _create_neo4j_agent(self):
+        from neo4j_agent.agent import Neo4jAgent
+        from neo4j_agent.tools import Neo4jConfig
+        
+        neo4j_config = Neo4jConfig(
+            uri=self.global_config.database.neo4j_uri,
+            username=self.global_config.database.neo4j_username,
+            password=self.global_config.database.neo4j_password,
+            database=self.global_config.database.neo4j_database,
+            mcp_url=self.global_config.database.neo4j_mcp_url,
+            mcp_transport=self.global_config.database.neo4j_mcp_transport
+        )
+        
+        neo4j_agent_config = AgentConfig(
+            name="neo4j_agent",
+            model_name=self.global_config.llm.model_name,
+            temperature=self.global_config.llm.temperature,
+            max_tokens=self.global_config.llm.max_tokens,
+            max_retries=self.global_config.security.max_retry_attempts,
+            system_prompt="You are a Neo4j knowledge graph specialist."
+        )
+        
+        return Neo4jAgent(neo4j_agent_config, neo4j_config)
+    
+    def _create_infrastructure_agent(self):
+        """Build the infrastructure agent, or return None if AWS is not configured or unavailable."""
+        # Infrastructure agent is conditional - only if AWS is properly configured
+        if not (self.global_config.cloud.aws_access_key_id or self.global_config.cloud.aws_profile):
+            logger.info("Infrastructure agent disabled - no AWS credentials configured")
+            return None
+        
+        try:
+            from infrastructure.agent import InfrastructureAgent
+            from infrastructure.tools import AWSConfig, TerraformConfig
             
-            prometheus_agent_config = AgentConfig(
-                name="prometheus_agent",
-                model_name=self.global_config.llm.model_name,
-                temperature=self.global_config.llm.temperature,
-                max_tokens=self.global_config.llm.max_tokens,
-                max_retries=self.global_config.security.max_retry_attempts,
-                system_prompt="You are a Prometheus monitoring specialist."
+            aws_config = AWSConfig(
+                region=self.global_config.cloud.aws_region,
+                profile=self.global_config.cloud.aws_profile,
+                access_key_id=self.global_config.cloud.aws_access_key_id,
+                secret_access_key=self.global_config.cloud.aws_secret_access_key
             )
             
-            self.agents["prometheus"] = PrometheusAgent(prometheus_agent_config, prometheus_config)
-            logger.info("Prometheus agent initialized")
-            
-            # Neo4j Agent
-            neo4j_config = Neo4jConfig(
-                uri=self.global_config.database.neo4j_uri,
-                username=self.global_config.database.neo4j_username,
-                password=self.global_config.database.neo4j_password,
-                database=self.global_config.database.neo4j_database,
-                mcp_url=self.global_config.database.neo4j_mcp_url,
-                mcp_transport=self.global_config.database.neo4j_mcp_transport
+            terraform_config = TerraformConfig(
+                working_directory=self.global_config.cloud.terraform_dir,
+                auto_approve=False  # Safety first
             )
             
-            neo4j_agent_config = AgentConfig(
-                name="neo4j_agent",
+            infrastructure_agent_config = AgentConfig(
+                name="infrastructure_agent",
                 model_name=self.global_config.llm.model_name,
                 temperature=self.global_config.llm.temperature,
                 max_tokens=self.global_config.llm.max_tokens,
                 max_retries=self.global_config.security.max_retry_attempts,
-                system_prompt="You are a Neo4j knowledge graph specialist."
+                system_prompt="You are an infrastructure management specialist."
             )
             
-            self.agents["neo4j"] = Neo4jAgent(neo4j_agent_config, neo4j_config)
-            logger.info("Neo4j agent initialized")
-            
-            # Infrastructure Agent (conditional - only if AWS is properly configured)
-            if INFRASTRUCTURE_AVAILABLE and (
-                self.global_config.cloud.aws_access_key_id or 
-                self.global_config.cloud.aws_profile
-            ):
-                try:
-                    aws_config = AWSConfig(
-                        region=self.global_config.cloud.aws_region,
-                        profile=self.global_config.cloud.aws_profile,
-                        access_key_id=self.global_config.cloud.aws_access_key_id,
-                        secret_access_key=self.global_config.cloud.aws_secret_access_key
-                    )
-                    
-                    terraform_config = TerraformConfig(
-                        working_directory=self.global_config.cloud.terraform_dir,
-                        auto_approve=False  # Safety first
-                    )
-                    
-                    infrastructure_agent_config = AgentConfig(
-                        name="infrastructure_agent",
-                        model_name=self.global_config.llm.model_name,
-                        temperature=self.global_config.llm.temperature,
-                        max_tokens=self.global_config.llm.max_tokens,
-                        max_retries=self.global_config.security.max_retry_attempts,
-                        system_prompt="You are an infrastructure management specialist."
-                    )
-                    
-                    self.agents["infrastructure"] = InfrastructureAgent(
-                        infrastructure_agent_config, aws_config, terraform_config
-                    )
-                    logger.info("Infrastructure agent initialized")
-                except Exception as e:
-                    logger.warning("Failed to initialize infrastructure agent", error=str(e))
-            else:
-                logger.info("Infrastructure agent disabled - no AWS credentials configured")
-            
+            return InfrastructureAgent(infrastructure_agent_config, aws_config, terraform_config)
         except Exception as e:
-            logger.error("Failed to initialize agents", error=str(e))
-            raise
+            logger.warning("Failed to initialize infrastructure agent", error=str(e))
+            return None
     
     def run_agent(self, agent_name: str, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Run a specific agent with the given query."""
-        if agent_name not in self.agents:
+        bundle = self._agent_by_name.get(agent_name)
+        if bundle is None or bundle.agent is None:
             return {
                 "status": "error",
                 "error": f"Unknown agent: {agent_name}",
                 "available_agents": list(self.agents.keys())
             }
         
-        agent = self.agents[agent_name]
+        agent = bundle.agent
         logger.info("Running agent", agent=agent_name, query=query)
         
         try:
@@ -179,76 +278,118 @@ class AgentManager:
                 "agent": agent_name
             }
     
+    async def arun_agent(self, agent_name: str, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run a specific agent with the given query without blocking the event loop."""
+        bundle = self._agent_by_name.get(agent_name)
+        if bundle is None or bundle.agent is None:
+            return {
+                "status": "error",
+                "error": f"Unknown agent: {agent_name}",
+                "available_agents": list(self.agents.keys())
+            }
+        
+        agent = bundle.agent
+        logger.info("Running agent", agent=agent_name, query=query)
+        
+        try:
+            if hasattr(agent, "arun"):
+                result = await agent.arun(query, context or {})
+            else:
+                # Agents without a native async path run in a worker thread
+                result = await asyncio.to_thread(agent.run, query, context or {})
+            logger.info("Agent execution completed", agent=agent_name, status=result.get("status"))
+            return result
+            
+        except Exception as e:
+            logger.error("Agent execution failed", agent=agent_name, error=str(e))
+            return {
+                "status": "error",
+                "error": str(e),
+                "agent": agent_name
+            }
+    
+    async def astream_agent(self, agent_name: str, query: str, context: Dict[str, Any] = None) -> AsyncIterator[str]:
+        """Stream an agent's response text; agents without streaming yield their full response once."""
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            raise ValueError(f"Unknown agent: {agent_name}")
+        
+        if hasattr(agent, "astream"):
+            async for text in agent.astream(query, context or {}):
+                yield text
+        else:
+            result = await self.arun_agent(agent_name, query, context)
+            yield result.get("response", "")
+    
     def list_agents(self) -> Dict[str, Any]:
         """List all available agents and their capabilities."""
-        return {
-            "agents": {
-                "prometheus": {
-                    "description": "Monitors metrics and detects anomalies using Prometheus",
-                    "capabilities": [
-                        "Query Prometheus metrics",
-                        "Check system health",
-                        "Monitor active alerts",
-                        "Detect metric anomalies"
-                    ]
-                },
-                "neo4j": {
-                    "description": "Interacts with Neo4j knowledge graphs",
-                    "capabilities": [
-                        "Execute Cypher queries",
-                        "Search nodes and relationships",
-                        "Find shortest paths",
-                        "Analyze graph schema"
-                    ]
-                },
-                "infrastructure": {
-                    "description": "Manages AWS resources and Terraform deployments",
-                    "capabilities": [
-                        "Terraform operations (init, plan, apply, destroy)",
-                        "List EC2 instances",
-                        "Manage S3 buckets",
-                        "Monitor CloudFormation stacks"
-                    ]
-                }
-            }
-        }
+        return AGENT_CATALOG
     
     def health_check(self) -> Dict[str, Any]:
-        """Perform health checks on all agents."""
+        """Perform health checks on all agents, reusing results for HEALTH_CHECK_TTL seconds."""
+        with self._health_lock:
+            cached = self._health_cache.get("health")
+            if cached is not None:
+                return cached
+            
+            health_status = event_loop.run_sync(self._run_health_checks())
+            self._health_cache["health"] = health_status
+            return health_status
+    
+    async def ahealth_check(self) -> Dict[str, Any]:
+        """Async variant of health_check for callers already running on an event loop."""
+        cached = self._health_cache.get("health")
+        if cached is not None:
+            return cached
+        
+        health_status = await self._run_health_checks()
+        self._health_cache["health"] = health_status
+        return health_status
+    
+    async def _run_health_checks(self) -> Dict[str, Any]:
+        """Probe every agent concurrently without consulting the cache."""
         health_status = {"status": "healthy", "agents": {}}
         
-        for agent_name, agent in self.agents.items():
-            try:
-                if agent_name == "prometheus":
-                    # Try MCP health check first, fallback to direct API
-                    try:
-                        # This will use MCP if available, fallback to direct API if not
-                        tools = agent.create_tools()
-                        result = {"status": "healthy", "message": "Agent tools initialized", "tool_count": len(tools)}
-                    except Exception:
-                        result = {"status": "healthy", "message": "Agent initialized"}
-                elif agent_name == "neo4j":
-                    # Try MCP health check first, fallback to direct connection
-                    try:
-                        tools = agent.create_tools()
-                        result = {"status": "healthy", "message": "Agent tools initialized", "tool_count": len(tools)}
-                    except Exception:
-                        result = {"status": "healthy", "message": "Agent initialized"}
-                elif agent_name == "infrastructure":
-                    # Basic AWS connectivity check
-                    result = {"status": "healthy", "message": "Agent initialized"}
-                
-                health_status["agents"][agent_name] = result
-                
-            except Exception as e:
+        names = list(self.agents)
+        # Probes block on network I/O, so each runs in a worker thread and they overlap
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._probe_agent, name, self.agents[name]) for name in names),
+            return_exceptions=True
+        )
+        
+        for agent_name, result in zip(names, results):
+            if isinstance(result, Exception):
                 health_status["agents"][agent_name] = {
                     "status": "unhealthy",
-                    "error": str(e)
+                    "error": str(result)
                 }
                 health_status["status"] = "degraded"
+            else:
+                health_status["agents"][agent_name] = result
         
         return health_status
     
+    @staticmethod
+    def _probe_agent(agent_name: str, agent: Any) -> Dict[str, Any]:
+        if agent_name == "prometheus":
+            # Try MCP health check first, fallback to direct API
+            try:
+                # This will use MCP if available, fallback to direct API if not
+                tools = agent.create_tools()
+                return {"status": "healthy", "message": "Agent tools initialized", "tool_count": len(tools)}
+            except Exception:
+                return {"status": "healthy", "message": "Agent initialized"}
+        elif agent_name == "neo4j":
+            # Try MCP health check first, fallback to direct connection
+            try:
+                tools = agent.create_tools()
+                return {"status": "healthy", "message": "Agent tools initialized", "tool_count": len(tools)}
+            except Exception:
+                return {"status": "healthy", "message": "Agent initialized"}
+        
+        # Basic AWS connectivity check
+        return {"status": "healthy", "message": "Agent initialized"}
+    
     def cleanup(self):
         """Clean up agent resources."""
         for agent_name, agent in self.agents.items():
@@ -258,6 +399,11 @@ class AgentManager:
                 logger.info("Agent cleaned up", agent=agent_name)
             except Exception as e:
                 logger.error("Failed to cleanup agent", agent=agent_name, error=str(e))
+        
+        event_loop.shutdown_io_pool()
+
+def _pretty(obj: Any) -> str:
+    return dumps(obj, option=orjson.OPT_INDENT_2)
 
 def main():
     parser = argparse.ArgumentParser(description="LangChain/LangGraph Multi-Agent System")
@@ -271,42 +417,42 @@ def main():
     
     args = parser.parse_args()
     
+    # The catalog is static, so listing agents needs no agents to be built
+    if args.list_agents:
+        print(_pretty(AGENT_CATALOG))
+        return
+    
+    if not args.health_check and (not args.agent or not args.query):
+        parser.error("Both --agent and --query are required")
+    
     try:
-        # Initialize agent manager
-        manager = AgentManager(args.config)
-        
-        if args.list_agents:
-            result = manager.list_agents()
-            print(json.dumps(result, indent=2))
-            return
+        # Initialize agent manager; a single query only needs its own agent
+        manager = AgentManager(args.config, enabled_agents=None if args.health_check else [args.agent])
         
         if args.health_check:
             result = manager.health_check()
-            print(json.dumps(result, indent=2))
+            print(_pretty(result))
             return
         
-        if not args.agent or not args.query:
-            parser.error("Both --agent and --query are required")
-        
         # Parse context if provided
         context = {}
         if args.context:
             try:
-                context = json.loads(args.context)
-            except json.JSONDecodeError:
+                context = loads(args.context)
+            except orjson.JSONDecodeError:
                 logger.error("Invalid JSON context provided")
                 sys.exit(1)
         
         # Run the agent
         result = manager.run_agent(args.agent, args.query, context)
-        print(json.dumps(result, indent=2, default=str))
+        print(_pretty(result))
         
         # Return appropriate exit code
         sys.exit(0 if result.get("status") == "success" else 1)
         
     except Exception as e:
         logger.error("Application failed", error=str(e))
-        print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        print(_pretty({"status": "error", "error": str(e)}))
         sys.exit(1)
     
     finally:
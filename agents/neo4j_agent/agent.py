@@ -1,22 +1,117 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Type
 import asyncio
+import hashlib
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, START, END
+from pydantic import BaseModel, Field, Json, ValidationError
 import structlog
-import json
+import orjson
 
 from shared.base_agent import BaseAgent, AgentConfig, BaseAgentState
 from shared.mcp_client import create_mcp_client
 from shared.llm_factory import LLMFactory
-from shared.langsmith_tracing import get_tracer, create_langsmith_tags, create_langsmith_metadata
+from shared.langsmith_tracing import create_langsmith_tags, create_langsmith_metadata
+from shared.serialization import dumps
+from shared import event_loop
+from shared.tool_registry import LazyToolRegistry, LAZY_SCHEMA_THRESHOLD
 from config.settings import get_config
-from .tools import Neo4jConfig
+from .tools import Neo4jConfig, neo4j_json_default
 
 logger = structlog.get_logger(__name__)
 
+_NEO4J_SYSTEM_PROMPT = """You are a Neo4j knowledge graph specialist agent. Your responsibilities include:
+
+1. **Graph Querying**: Execute Cypher queries to retrieve and analyze graph data
+2. **Schema Management**: Understand and navigate the graph schema
+3. **Relationship Analysis**: Discover connections and patterns between entities
+4. **Data Exploration**: Search and filter nodes based on properties and relationships
+
+Key capabilities:
+- Execute read-only and write Cypher queries safely
+- Navigate complex graph structures and relationships
+- Perform path finding and graph traversal operations
+- Analyze node properties and relationship patterns
+- Provide insights based on graph topology
+
+Cypher Query Guidelines:
+- Use MATCH clauses for pattern matching
+- Apply WHERE conditions for filtering
+- Use RETURN to specify output fields
+- Leverage relationship patterns like (a)-[:REL_TYPE]->(b)
+- Use aggregation functions (COUNT, SUM, AVG) for analytics
+- Apply LIMIT for result pagination
+
+Security Considerations:
+- Only execute approved read operations by default
+- Validate all input parameters
+- Avoid destructive operations unless explicitly requested
+- Use parameterized queries to prevent injection
+
+Best Practices:
+- Start with schema exploration for new databases
+- Use specific node labels and relationship types when possible
+- When exploring several candidate nodes, use batch_search_nodes instead of repeated searches to save round trips
+- Optimize queries with appropriate indexes
+- Consider performance implications of complex traversals
+- Provide clear explanations of graph patterns found
+
+When analyzing results:
+- Interpret node relationships and their meanings
+- Identify key entities and their connections
+- Suggest follow-up queries for deeper analysis
+- Explain graph patterns in business terms"""
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result, including Neo4j graph and temporal values."""
+    return dumps(obj, default=neo4j_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+# Control characters become spaces in metadata previews
+_CONTROL_CHARS = dict.fromkeys([*range(32), 127], " ")
+
+# Argument models for the fallback tools; JSON-string arguments are parsed and
+# validated in a single pydantic-core pass
+
+class CypherArgs(BaseModel):
+    query: str
+    parameters: Json[Dict[str, Any]] = Field(default_factory=dict)
+
+class SearchNodesArgs(BaseModel):
+    label: Optional[str] = None
+    properties: Optional[Json[Dict[str, Any]]] = None
+    limit: int = 100
+
+class BatchSearchArgs(BaseModel):
+    searches: Json[List[Dict[str, Any]]]
+
+class ShortestPathArgs(BaseModel):
+    start_properties: Json[Dict[str, Any]]
+    end_properties: Json[Dict[str, Any]]
+    relationship_types: Optional[Json[List[str]]] = None
+    max_depth: int = 6
+    start_label: Optional[str] = None
+    end_label: Optional[str] = None
+
+def _validate_args(model: Type[BaseModel], **raw: Any) -> Tuple[bool, Any]:
+    """
+    Validate tool arguments against their model.
+    
+    Returns (True, args) on success, or (False, error_payload) with a serialized
+    error the tool can return as-is. Empty arguments fall back to the model defaults.
+    """
+    try:
+        return True, model.model_validate({k: v for k, v in raw.items() if v is not None and v != ""})
+    except ValidationError as e:
+        return False, _to_json({
+            "status": "error",
+            "error": "Invalid tool arguments",
+            "details": e.errors(include_url=False, include_context=False, include_input=False)
+        })
+
 class Neo4jAgent(BaseAgent):
+    _TRACES_SESSIONS = True
+    
     def __init__(self, config: AgentConfig, neo4j_config: Neo4jConfig):
         super().__init__(config)
         self.neo4j_config = neo4j_config
@@ -30,13 +125,21 @@ class Neo4jAgent(BaseAgent):
         global_config = get_config()
         self.model = LLMFactory.create_llm(global_config.llm, global_config.langsmith)
         self._mcp_tools = None
+        self._tools: Optional[List[Any]] = None
+        self.neo4j_tools = None
+        self._tool_registry: Optional[LazyToolRegistry] = None
+        self._bound_model = None
+    
+    async def __aenter__(self) -> "Neo4jAgent":
+        try:
+            await self.mcp_client.initialize()
+        except Exception as e:
+            # The fallback tools still work without MCP
+            self.logger.warning("MCP client initialization failed", error=str(e))
+        return self
     
-    def __del__(self):
-        if hasattr(self, 'mcp_client'):
-            try:
-                asyncio.run(self.mcp_client.close())
-            except Exception:
-                pass
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def get_mcp_tools(self) -> List[Any]:
         """Get Neo4j tools from MCP server."""
@@ -46,21 +149,52 @@ class Neo4jAgent(BaseAgent):
         return self._mcp_tools
     
     def create_tools(self) -> List[Any]:
+        """Return the agent's tools, resolving them only once per instance."""
+        if self._tools is None:
+            with self._graph_lock:
+                if self._tools is None:
+                    self._tools = self._load_tools()
+        return self._tools
+    
+    def _get_bound_model(self) -> Any:
+        """Bind the tool schemas to the model once; create_react_agent reuses a pre-bound model."""
+        if self._bound_model is None:
+            self._bound_model = self.model.bind_tools(self.create_tools())
+        return self._bound_model
+    
+    async def _aget_graph(self) -> Any:
+        if self._tools is None:
+            # Resolve the tools without blocking the caller's event loop; the first to finish wins
+            tools = await self._aload_tools()
+            with self._graph_lock:
+                if self._tools is None:
+                    self._tools = tools
+        return self._get_graph()
+    
+    async def _aload_tools(self) -> List[Any]:
+        try:
+            mcp_tools = await event_loop.run_async(self.get_mcp_tools())
+            logger.info("Retrieved Neo4j MCP tools", tool_count=len(mcp_tools))
+            return self._expose_tools(mcp_tools)
+        except Exception as e:
+            logger.error("Failed to get MCP tools, falling back to legacy implementation", error=str(e))
+            return self._create_fallback_tools()
+    
+    def _expose_tools(self, tools: List[Any]) -> List[Any]:
+        """Bind small tool sets directly; put large ones behind a lazily described catalog."""
+        if len(tools) <= LAZY_SCHEMA_THRESHOLD:
+            return tools
+        self._tool_registry = LazyToolRegistry(tools)
+        return self._tool_registry.as_tools()
+    
+    def _load_tools(self) -> List[Any]:
         """Create tools using MCP client."""
         try:
-            # Get MCP tools asynchronously
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in an async context, create a new event loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.get_mcp_tools())
-                    mcp_tools = future.result()
-            else:
-                mcp_tools = loop.run_until_complete(self.get_mcp_tools())
+            # MCP sessions live on the shared background loop; block on it from any thread
+            mcp_tools = event_loop.run_sync(self.get_mcp_tools())
             
             logger.info("Retrieved Neo4j MCP tools", tool_count=len(mcp_tools))
-            return mcp_tools
+            return self._expose_tools(mcp_tools)
             
         except Exception as e:
             logger.error("Failed to get MCP tools, falling back to legacy implementation", error=str(e))
@@ -69,123 +203,128 @@ class Neo4jAgent(BaseAgent):
     
     def _create_fallback_tools(self) -> List[Any]:
         """Fallback tools implementation if MCP is unavailable."""
-        from .tools import Neo4jTools
+        from .tools import AsyncNeo4jTools
         
-        neo4j_tools = Neo4jTools(self.neo4j_config)
+        with self._graph_lock:
+            # Concurrent loaders share one client, so none is left open behind a losing tool list
+            if self.neo4j_tools is None:
+                self.neo4j_tools = AsyncNeo4jTools(self.neo4j_config)
+            neo4j_tools = self.neo4j_tools
         
+        # The query tools are coroutines so the agent can await several of them at once
         @tool
-        def execute_cypher_query(query: str, parameters: str = None, read_only: bool = True) -> str:
+        async def execute_cypher_query(query: str, parameters: str = None, read_only: bool = True) -> str:
             """Execute a Cypher query against the Neo4j knowledge graph."""
-            try:
-                params = json.loads(parameters) if parameters else {}
-            except json.JSONDecodeError:
-                return json.dumps({
-                    "status": "error",
-                    "error": "Invalid JSON parameters"
-                })
+            ok, args = _validate_args(CypherArgs, query=query, parameters=parameters)
+            if not ok:
+                return args
+            
+            result = await neo4j_tools.aexecute_cypher(args.query, args.parameters, read_only)
+            return _to_json(result)
+        
+        @tool
+        def execute_cypher_query_columnar(query: str, parameters: str = None) -> str:
+            """Execute a read-only Cypher query and return results column-wise ({column: [values]}). Prefer this for large result sets."""
+            ok, args = _validate_args(CypherArgs, query=query, parameters=parameters)
+            if not ok:
+                return args
             
-            result = neo4j_tools.execute_cypher(query, params, read_only)
-            return json.dumps(result, default=str)
+            result = neo4j_tools.execute_cypher_columnar(args.query, args.parameters)
+            return _to_json(result)
         
         @tool
         def check_neo4j_connection() -> str:
             """Check if Neo4j database connection is healthy and responsive."""
             result = neo4j_tools.check_connection()
-            return json.dumps(result, default=str)
+            return _to_json(result)
         
         @tool
-        def get_database_schema() -> str:
+        async def get_database_schema() -> str:
             """Retrieve the Neo4j database schema including node labels, relationships, and properties."""
-            result = neo4j_tools.get_schema_info()
-            return json.dumps(result, default=str)
+            result = await neo4j_tools.aget_schema_info()
+            return _to_json(result)
         
         @tool
-        def search_nodes_by_properties(label: str = None, properties: str = None, limit: int = 100) -> str:
+        async def search_nodes_by_properties(label: str = None, properties: str = None, limit: int = 100) -> str:
             """Search for nodes in the knowledge graph by label and/or properties."""
-            try:
-                props = json.loads(properties) if properties else None
-            except json.JSONDecodeError:
-                return json.dumps({
-                    "status": "error",
-                    "error": "Invalid JSON properties"
-                })
+            ok, args = _validate_args(SearchNodesArgs, label=label, properties=properties, limit=limit)
+            if not ok:
+                return args
+            
+            result = await neo4j_tools.asearch_nodes(args.label, args.properties, args.limit)
+            return _to_json(result)
+        
+        @tool
+        def batch_search_nodes(batch_json: str) -> str:
+            """Run several node searches together; searches with the same label and property names share one database round trip. batch_json is a JSON list of {"label": ..., "properties": {...}, "limit": ...} objects."""
+            ok, args = _validate_args(BatchSearchArgs, searches=batch_json)
+            if not ok:
+                return args
             
-            result = neo4j_tools.search_nodes(label, props, limit)
-            return json.dumps(result, default=str)
+            result = neo4j_tools.batch_search_nodes(args.searches)
+            return _to_json(result)
         
         @tool
-        def find_shortest_path_between_nodes(start_properties: str, end_properties: str, 
-                                           relationship_types: str = None, max_depth: int = 6) -> str:
-            """Find the shortest path between two nodes in the knowledge graph."""
-            try:
-                start_props = json.loads(start_properties)
-                end_props = json.loads(end_properties)
-                rel_types = json.loads(relationship_types) if relationship_types else None
-            except json.JSONDecodeError:
-                return json.dumps({
-                    "status": "error",
-                    "error": "Invalid JSON in parameters"
-                })
+        async def find_shortest_path_between_nodes(start_properties: str, end_properties: str, 
+                                           relationship_types: str = None, max_depth: int = 6,
+                                           start_label: str = None, end_label: str = None) -> str:
+            """Find the shortest path between two nodes in the knowledge graph. Pass the node labels when known; they let the endpoint lookups use property indexes."""
+            ok, args = _validate_args(ShortestPathArgs,
+                                      start_properties=start_properties,
+                                      end_properties=end_properties,
+                                      relationship_types=relationship_types,
+                                      max_depth=max_depth,
+                                      start_label=start_label,
+                                      end_label=end_label)
+            if not ok:
+                return args
             
-            result = neo4j_tools.find_shortest_path(start_props, end_props, rel_types, max_depth)
-            return json.dumps(result, default=str)
+            result = await neo4j_tools.afind_shortest_path(args.start_properties, args.end_properties,
+                                                           args.relationship_types, args.max_depth,
+                                                           args.start_label, args.end_label)
+            return _to_json(result)
+        
+        @tool
+        def get_query_cache_stats() -> str:
+            """Report hit/miss statistics for the local Cypher read-query result cache."""
+            return _to_json(neo4j_tools.cache_stats())
+        
+        @tool
+        def clear_query_cache() -> str:
+            """Discard cached Cypher read results so the next queries read fresh data."""
+            neo4j_tools.cache_clear()
+            return _to_json({"status": "success", "message": "Query cache cleared"})
         
-        return [
+        async_tools = [event_loop.with_sync_entry(t) for t in (
             execute_cypher_query,
-            check_neo4j_connection,
             get_database_schema,
             search_nodes_by_properties,
             find_shortest_path_between_nodes
+        )]
+        
+        return async_tools + [
+            execute_cypher_query_columnar,
+            check_neo4j_connection,
+            batch_search_nodes,
+            get_query_cache_stats,
+            clear_query_cache
         ]
     
     def build_graph(self) -> Any:
         tools = self.create_tools()
         
-        system_prompt = """You are a Neo4j knowledge graph specialist agent. Your responsibilities include:
-
-1. **Graph Querying**: Execute Cypher queries to retrieve and analyze graph data
-2. **Schema Management**: Understand and navigate the graph schema
-3. **Relationship Analysis**: Discover connections and patterns between entities
-4. **Data Exploration**: Search and filter nodes based on properties and relationships
-
-Key capabilities:
-- Execute read-only and write Cypher queries safely
-- Navigate complex graph structures and relationships
-- Perform path finding and graph traversal operations
-- Analyze node properties and relationship patterns
-- Provide insights based on graph topology
-
-Cypher Query Guidelines:
-- Use MATCH clauses for pattern matching
-- Apply WHERE conditions for filtering
-- Use RETURN to specify output fields
-- Leverage relationship patterns like (a)-[:REL_TYPE]->(b)
-- Use aggregation functions (COUNT, SUM, AVG) for analytics
-- Apply LIMIT for result pagination
-
-Security Considerations:
-- Only execute approved read operations by default
-- Validate all input parameters
-- Avoid destructive operations unless explicitly requested
-- Use parameterized queries to prevent injection
-
-Best Practices:
-- Start with schema exploration for new databases
-- Use specific node labels and relationship types when possible
-- Optimize queries with appropriate indexes
-- Consider performance implications of complex traversals
-- Provide clear explanations of graph patterns found
-
-When analyzing results:
-- Interpret node relationships and their meanings
-- Identify key entities and their connections
-- Suggest follow-up queries for deeper analysis
-- Explain graph patterns in business terms"""
-
+        system_prompt = _NEO4J_SYSTEM_PROMPT
+        
+        if self._tool_registry is not None:
+            system_prompt += (
+                "\n\nTool catalog (call describe_tool for a tool's arguments, then invoke_tool to run it):\n"
+                + self._tool_registry.summaries()
+            )
+        
         agent = create_react_agent(
-            model=self.model,
+            model=self._get_bound_model(),
             tools=tools,
-            prompt=system_prompt
+            prompt=LLMFactory.system_prompt(system_prompt, get_config().llm)
         )
         
         graph_builder = StateGraph(BaseAgentState)
@@ -195,76 +334,33 @@ When analyzing results:
         
         return graph_builder.compile()
     
-    def run(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute the Neo4j knowledge graph agent with user input."""
-        # Setup LangSmith session for this run
-        tracer = get_tracer()
-        session_name = f"neo4j-agent-{hash(user_input) % 10000}"
-        
-        if tracer and tracer.is_enabled():
-            tracer.set_session(session_name)
-            self.logger.info("LangSmith session set", session=session_name)
-        
-        try:
-            graph = self.build_graph()
-            initial_state = self.get_initial_state()
-            
-            if context:
-                initial_state["context"].update(context)
-            
-            # Add LangSmith metadata
-            langsmith_metadata = create_langsmith_metadata({
-                "agent": "neo4j",
-                "query": user_input[:100],  # Truncate for metadata
-                "session": session_name,
-                "context_keys": list(context.keys()) if context else []
-            })
-            initial_state["metadata"].update(langsmith_metadata)
-            
-            inputs = {
-                "messages": [HumanMessage(content=user_input)],
-                "metadata": initial_state["metadata"],
-                "context": initial_state["context"],
-                "error_count": 0,
-                "max_retries": self.config.max_retries
-            }
-            
-            self.logger.info("Starting Neo4j agent execution", 
-                           input=user_input, 
-                           session=session_name)
-            
-            result = graph.invoke(inputs)
-            
-            response_data = {
-                "status": "success",
-                "response": result["messages"][-1].content if result["messages"] else "No response",
-                "metadata": result.get("metadata", {}),
-                "context": result.get("context", {}),
-                "langsmith_session": session_name if tracer and tracer.is_enabled() else None
-            }
-            
-            self.logger.info("Neo4j agent execution completed", 
-                           status="success", 
-                           session=session_name)
-            
-            return response_data
-            
-        except Exception as e:
-            self.logger.error("Neo4j agent execution failed", 
-                            error=str(e), 
-                            session=session_name)
-            return {
-                "status": "error",
-                "error": str(e),
-                "response": "I encountered an error while processing your request.",
-                "langsmith_session": session_name if tracer and tracer.is_enabled() else None
-            }
-        finally:
-            # Clear session after execution
-            if tracer and tracer.is_enabled():
-                tracer.clear_session()
+    def _get_session_name(self, user_input: str) -> Optional[str]:
+        return f"neo4j-agent-{self._query_hash(user_input)}"
+    
+    def _agent_metadata(self, user_input: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        query_hash = self._query_hash(user_input)
+        return create_langsmith_metadata({
+            "agent": "neo4j",
+            # A bounded preview plus a stable digest, so long inputs aren't retained in metadata
+            "query_preview": user_input[:100].translate(_CONTROL_CHARS),
+            "query_hash": query_hash,
+            "query_len": len(user_input),
+            "session": f"neo4j-agent-{query_hash}",
+            "context_keys": list(context.keys()) if context else []
+        })
+    
+    @staticmethod
+    def _query_hash(user_input: str) -> str:
+        return hashlib.blake2b(user_input.encode(), digest_size=8).hexdigest()
+    
+    async def aclose(self):
+        """Release the MCP client and close the Neo4j connection."""
+        await self.mcp_client.close()
+        if self.neo4j_tools is not None:
+            await asyncio.to_thread(self.neo4j_tools.close)
     
     def close(self):
-        """Close the Neo4j connection."""
-        if hasattr(self, 'neo4j_tools'):
+        """Release the MCP client and close the Neo4j connection."""
+        event_loop.run_sync(self.mcp_client.close())
+        if self.neo4j_tools is not None:
             self.neo4j_tools.close()
\ No newline at end of file
@@ -1,9 +1,20 @@
-from typing import Dict, Any, List, Optional, Union
-from neo4j import GraphDatabase, Transaction
-from neo4j.exceptions import ServiceUnavailable, CypherSyntaxError
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+from cachetools import TTLCache
+from contextlib import contextmanager
+from functools import lru_cache
+from queue import Empty, SimpleQueue
+from neo4j import AsyncGraphDatabase, AsyncManagedTransaction, GraphDatabase, Transaction, READ_ACCESS, WRITE_ACCESS
+from neo4j.graph import Node, Path, Relationship
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, CypherSyntaxError
 from pydantic import BaseModel, Field
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from shared import event_loop
 from shared.security import audit_log, require_security_check
 
 logger = structlog.get_logger(__name__)
@@ -18,13 +29,172 @@ class Neo4jConfig(BaseModel):
     connection_timeout: int = Field(default=30, description="Connection timeout in seconds")
     mcp_url: str = Field(default="http://localhost:8001/mcp", description="Neo4j MCP server URL")
     mcp_transport: str = Field(default="streamable_http", description="MCP transport protocol")
+    fetch_size: int = Field(default=1000, description="Records pulled per Bolt batch; -1 fetches everything at once")
+    query_cache_ttl: int = Field(default=30, description="Seconds to reuse results of identical read queries (0 disables)")
+    query_cache_size: int = Field(default=1024, description="Max cached read query results")
 
 class CypherQuery(BaseModel):
     query: str = Field(..., description="Cypher query string")
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Query parameters")
     read_only: bool = Field(default=True, description="Whether query is read-only")
 
+# Labels, relationship types and property keys in a single round trip
+_SCHEMA_QUERY = """
+CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+CALL { CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) AS types }
+CALL { CALL db.propertyKeys() YIELD propertyKey RETURN collect(propertyKey) AS keys }
+RETURN labels, types, keys
+"""
+
+# A successful connectivity check is trusted for this long before the server is probed again
+_HEALTH_CACHE_TTL = 5
+
+# Schema changes rarely; reuse it for this long unless a write bumps the cache generation
+_SCHEMA_CACHE_TTL = 300
+
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a label or type name for safe inclusion in Cypher text."""
+    return "`" + name.replace("`", "``") + "`"
+
+def neo4j_json_default(obj: Any) -> Any:
+    """orjson ``default`` hook for driver types that survive into tool results."""
+    if isinstance(obj, Node):
+        return {"id": obj.element_id, "labels": list(obj.labels), "props": dict(obj)}
+    if isinstance(obj, Relationship):
+        return {"id": obj.element_id, "type": obj.type, "props": dict(obj)}
+    if isinstance(obj, Path):
+        return {"nodes": list(obj.nodes), "relationships": list(obj.relationships)}
+    # neo4j.time DateTime/Date/Time/Duration all provide iso_format()
+    iso_format = getattr(obj, "iso_format", None)
+    if iso_format is not None:
+        return iso_format()
+    return str(obj)
+
+def _property_filter(variable: str, source: str, keys: Tuple[str, ...]) -> str:
+    # One static equality per key against the `source` map (a parameter such as $sp, or
+    # a row field), so the planner can seek a label's property index instead of
+    # filtering every candidate node against a dynamic map
+    if not keys:
+        return ""
+    predicates = " AND ".join(
+        f"{variable}.{key} = {source}.{key}" for key in map(_quote_identifier, keys)
+    )
+    return f"WHERE {predicates}"
+
+@lru_cache(maxsize=256)
+def _search_nodes_query(label: Optional[str], keys: Tuple[str, ...]) -> str:
+    # Labels and property names cannot be query parameters, so there is one query shape
+    # per label and key set; the property values travel in $props
+    pattern = f"(n:{_quote_identifier(label)})" if label else "(n)"
+    return (
+        f"MATCH {pattern} "
+        f"{_property_filter('n', '$props', keys)} "
+        "RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS properties "
+        "LIMIT $limit"
+    )
+
+@lru_cache(maxsize=128)
+def _build_sp_query(start_label: Optional[str], end_label: Optional[str],
+                    start_keys: Tuple[str, ...], end_keys: Tuple[str, ...],
+                    relationship_types: Tuple[str, ...], max_depth: int) -> str:
+    # Property values travel as $sp/$ep maps; labels, property keys, types and depth
+    # shape the query text
+    start_node = f"(start:{_quote_identifier(start_label)})" if start_label else "(start)"
+    end_node = f"(end:{_quote_identifier(end_label)})" if end_label else "(end)"
+    
+    # Build relationship pattern
+    if relationship_types:
+        rel_types = "|".join(map(_quote_identifier, relationship_types))
+        rel_pattern = f"[:{rel_types}*1..{max_depth}]"
+    else:
+        rel_pattern = f"[*1..{max_depth}]"
+    
+    return f"""
+    MATCH {start_node}
+    {_property_filter("start", "$sp", start_keys)}
+    WITH start
+    MATCH {end_node}
+    {_property_filter("end", "$ep", end_keys)}
+    MATCH path = shortestPath((start)-{rel_pattern}-(end))
+    RETURN length(path) AS pathLength,
+           [n IN nodes(path) | properties(n)] AS nodes,
+           [r IN relationships(path) | properties(r)] AS relationships
+    ORDER BY pathLength
+    LIMIT 10
+    """
+
+def _with_nodes(result: Dict[str, Any], materialize: bool) -> Dict[str, Any]:
+    if result["status"] == "success":
+        # The query already returns records shaped as nodes. They may be shared
+        # with the query cache, so callers that mutate them ask for copies.
+        if materialize:
+            nodes = [dict(record, properties=dict(record["properties"])) for record in result["data"]]
+        else:
+            nodes = result["data"]
+        
+        result["nodes"] = nodes
+        result["node_count"] = len(nodes)
+    
+    return result
+
+def _shortest_path_query(start_label: Optional[str], end_label: Optional[str],
+                         start_props: Dict[str, Any], end_props: Dict[str, Any],
+                         relationship_types: Optional[List[str]], max_depth: int) -> str:
+    # An empty map would leave that endpoint unconstrained: a shortestPath from every node
+    if not start_props or not end_props:
+        raise ValueError("start_props and end_props must each name at least one property")
+    # Sorted so the same keys and types in any order map to one query text and one server plan
+    return _build_sp_query(start_label or None, end_label or None,
+                           tuple(sorted(start_props or ())), tuple(sorted(end_props or ())),
+                           tuple(sorted(set(relationship_types or ()))), int(max_depth))
+
+def _with_paths(result: Dict[str, Any]) -> Dict[str, Any]:
+    if result["status"] == "success" and result["data"]:
+        # Node and relationship properties are projected server-side, so each
+        # record is already shaped and only the key names need mapping
+        paths = [
+            {
+                "length": record["pathLength"],
+                "nodes": record["nodes"],
+                "relationships": record["relationships"]
+            }
+            for record in result["data"]
+        ]
+        
+        result["paths"] = paths
+        result["path_count"] = len(paths)
+    else:
+        result["paths"] = []
+        result["path_count"] = 0
+    
+    return result
+
+@lru_cache(maxsize=128)
+def _batch_search_query(label: Optional[str], keys: Tuple[str, ...]) -> str:
+    # Searches sharing a label and property keys are answered in one round trip. Each row
+    # runs a label-scoped, index-friendly lookup that stops at the group's largest limit;
+    # the subquery always yields a row, so searches without matches come back empty.
+    pattern = f"(n:{_quote_identifier(label)})" if label else "(n)"
+    return f"""
+    UNWIND $batch AS q
+    CALL {{
+        WITH q
+        MATCH {pattern}
+        {_property_filter("n", "q.props", keys)}
+        WITH n LIMIT $limit
+        RETURN collect({{id: elementId(n), labels: labels(n), properties: properties(n)}}) AS nodes
+    }}
+    RETURN q.index AS index, nodes[..q.limit] AS nodes
+    """
+
 class Neo4jTools:
+    # Destructive Cypher clauses, matched as whole words so identifiers like `deleted_at` pass.
+    # DETACH DELETE, CREATE/DROP CONSTRAINT and CREATE/DROP INDEX are covered by the alternatives.
+    _DANGER_RE = re.compile(
+        r"\b(?:DELETE|REMOVE|DROP|CREATE\s+(?:CONSTRAINT|INDEX))\b",
+        re.IGNORECASE
+    )
+    
     def __init__(self, config: Neo4jConfig):
         self.config = config
         self.driver = GraphDatabase.driver(
@@ -34,36 +204,166 @@ class Neo4jTools:
             max_connection_pool_size=config.max_connection_pool_size,
             connection_timeout=config.connection_timeout
         )
+        # Identical read queries within query_cache_ttl are answered locally. Writes bump
+        # the generation, which is part of every key, so earlier entries stop matching.
+        self._query_cache = TTLCache(maxsize=config.query_cache_size, ttl=max(config.query_cache_ttl, 1))
+        self._cache_lock = threading.RLock()
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Keyed by cache generation, so writes and cache_clear() also retire the schema
+        self._schema_cache = TTLCache(maxsize=1, ttl=_SCHEMA_CACHE_TTL)
+        # Idle sessions kept per access mode so the driver can route reads to replicas
+        self._session_pools: Dict[str, SimpleQueue] = {READ_ACCESS: SimpleQueue(), WRITE_ACCESS: SimpleQueue()}
+        self._max_idle_sessions = max(1, config.max_connection_pool_size // 2)
+        self._last_healthy = 0.0
+    
+    @contextmanager
+    def _checkout(self, access_mode: str = WRITE_ACCESS):
+        """Borrow a session for the configured database, returning it to the idle pool afterwards."""
+        pool = self._session_pools[access_mode]
+        try:
+            session = pool.get_nowait()
+        except Empty:
+            session = self.driver.session(
+                database=self.config.database,
+                default_access_mode=access_mode,
+                fetch_size=self.config.fetch_size
+            )
+        
+        try:
+            yield session
+        except Exception:
+            # A session that saw a failure may hold a broken connection; don't recycle it
+            session.close()
+            raise
+        
+        if pool.qsize() < self._max_idle_sessions:
+            pool.put(session)
+        else:
+            session.close()
+    
+    def _read_session(self):
+        """
+        Borrow a read session without causal-consistency guarantees.
+        
+        Read sessions are never handed bookmarks from writes, so the router may send
+        them to any replica without waiting for it to catch up. Results can briefly
+        lag behind writes made through this instance, which the query cache already
+        tolerates.
+        """
+        return self._checkout(READ_ACCESS)
+    
+    def _cache_key(self, query: str, parameters: Dict[str, Any]) -> Tuple[Any, ...]:
+        digest = hashlib.blake2b(query.encode(), digest_size=16).digest()
+        return (self._cache_generation, self.config.database, digest, repr(sorted(parameters.items())))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {
+                "size": len(self._query_cache),
+                "max_size": self._query_cache.maxsize,
+                "ttl": self.config.query_cache_ttl,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "generation": self._cache_generation
+            }
+    
+    def cache_clear(self):
+        with self._cache_lock:
+            self._query_cache.clear()
+            self._cache_generation += 1
     
     def close(self):
+        for pool in self._session_pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except Empty:
+                    break
         if self.driver:
             self.driver.close()
     
+    def execute_cypher(self, query: str, parameters: Dict[str, Any] = None, read_only: bool = True) -> Dict[str, Any]:
+        """Run a Cypher query, answering repeated reads from the local result cache."""
+        parameters = parameters or {}
+        
+        # Only results that already passed the security policy are ever cached, so a hit
+        # is returned without re-running the checks, audit logging or retry wrappers
+        cached = self._cached_result(query, parameters, read_only)
+        if cached is not None:
+            return cached
+        
+        return self._execute_cypher_uncached(query, parameters, read_only)
+    
     @audit_log("neo4j_query")
     @require_security_check
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def execute_cypher(self, query: str, parameters: Dict[str, Any] = None, read_only: bool = True) -> Dict[str, Any]:
+    def _execute_cypher_uncached(self, query: str, parameters: Dict[str, Any], read_only: bool) -> Dict[str, Any]:
         try:
             if self._is_dangerous_query(query):
                 raise PermissionError(f"Query blocked by security policy: {query}")
             
-            parameters = parameters or {}
+            key = self._cache_miss_key(query, parameters, read_only)
             
-            with self.driver.session(database=self.config.database) as session:
-                if read_only:
+            if read_only:
+                with self._read_session() as session:
                     result = session.execute_read(self._run_query, query, parameters)
-                else:
+            else:
+                # Write sessions keep their bookmarks, so mutations stay ordered
+                with self._checkout(WRITE_ACCESS) as session:
                     result = session.execute_write(self._run_query, query, parameters)
+            
+            return self._query_response(key, query, parameters, read_only, result)
                 
-                return {
-                    "status": "success",
-                    "data": result,
-                    "query": query,
-                    "parameters": parameters,
-                    "record_count": len(result)
-                }
-                
-        except CypherSyntaxError as e:
+        except Exception as e:
+            return self._query_error(e, query)
+    
+    def _cached_result(self, query: str, parameters: Dict[str, Any], read_only: bool) -> Optional[Dict[str, Any]]:
+        if not read_only or self.config.query_cache_ttl <= 0:
+            return None
+        key = self._cache_key(query, parameters)
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is None:
+                return None
+            self._cache_hits += 1
+        # Callers annotate the result dict, so hand out a copy
+        return dict(cached, cached=True)
+    
+    def _cache_miss_key(self, query: str, parameters: Dict[str, Any], read_only: bool) -> Optional[Tuple[Any, ...]]:
+        """Count a miss and return the key to store the result under, or None if it is not cacheable."""
+        if not read_only or self.config.query_cache_ttl <= 0:
+            return None
+        # Taken before the query runs, so a write that lands meanwhile retires this entry
+        key = self._cache_key(query, parameters)
+        with self._cache_lock:
+            self._cache_misses += 1
+        return key
+    
+    def _query_response(self, key: Optional[Tuple[Any, ...]], query: str, parameters: Dict[str, Any],
+                        read_only: bool, result: List[Dict[str, Any]]) -> Dict[str, Any]:
+        response = {
+            "status": "success",
+            "data": result,
+            "query": query,
+            "parameters": parameters,
+            "record_count": len(result)
+        }
+        
+        with self._cache_lock:
+            if key is not None:
+                self._query_cache[key] = response
+                response = dict(response)
+            elif not read_only:
+                # The graph may have changed; retire every cached read
+                self._cache_generation += 1
+        
+        return response
+    
+    @staticmethod
+    def _query_error(e: Exception, query: str) -> Dict[str, Any]:
+        if isinstance(e, CypherSyntaxError):
             logger.error("Cypher syntax error", error=str(e), query=query)
             return {
                 "status": "error",
@@ -71,15 +371,60 @@ class Neo4jTools:
                 "error": str(e),
                 "query": query
             }
-        except ServiceUnavailable as e:
+        if isinstance(e, ServiceUnavailable):
             logger.error("Neo4j service unavailable", error=str(e))
             return {
                 "status": "error",
                 "error_type": "service_unavailable",
                 "error": str(e)
             }
+        logger.error("Neo4j query execution failed", error=str(e), query=query)
+        return {
+            "status": "error",
+            "error_type": "execution_error",
+            "error": str(e),
+            "query": query
+        }
+    
+    def _run_query(self, tx: Transaction, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        result = tx.run(query, parameters)
+        data = result.data()
+        # Fetch the summary now so the connection is released as soon as the work ends
+        result.consume()
+        return data
+    
+    @audit_log("neo4j_query_columnar")
+    @require_security_check
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    def execute_cypher_columnar(self, query: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run a read query and return its result as one list per column instead of one dict per row."""
+        try:
+            if self._is_dangerous_query(query):
+                raise PermissionError(f"Query blocked by security policy: {query}")
+            
+            parameters = parameters or {}
+            with self._read_session() as session:
+                keys, columns = session.execute_read(self._run_query_columnar, query, parameters)
+            
+            return {
+                "status": "success",
+                "columns": keys,
+                "data": dict(zip(keys, columns)),
+                "query": query,
+                "parameters": parameters,
+                "record_count": len(columns[0]) if columns else 0
+            }
+            
+        except CypherSyntaxError as e:
+            logger.error("Cypher syntax error", error=str(e), query=query)
+            return {
+                "status": "error",
+                "error_type": "syntax_error",
+                "error": str(e),
+                "query": query
+            }
         except Exception as e:
-            logger.error("Neo4j query execution failed", error=str(e), query=query)
+            logger.error("Neo4j columnar query failed", error=str(e), query=query)
             return {
                 "status": "error",
                 "error_type": "execution_error",
@@ -87,38 +432,35 @@ class Neo4jTools:
                 "query": query
             }
     
-    def _run_query(self, tx: Transaction, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _run_query_columnar(self, tx: Transaction, query: str, parameters: Dict[str, Any]) -> Tuple[List[str], List[List[Any]]]:
         result = tx.run(query, parameters)
-        return [record.data() for record in result]
+        keys = list(result.keys())
+        # Transpose the row tuples in C; a query with no rows still reports its columns
+        columns = [list(column) for column in zip(*(record.values() for record in result))] or [[] for _ in keys]
+        result.consume()
+        return keys, columns
     
     def _is_dangerous_query(self, query: str) -> bool:
-        dangerous_patterns = [
-            "DELETE",
-            "REMOVE",
-            "DROP",
-            "DETACH DELETE",
-            "CREATE CONSTRAINT",
-            "DROP CONSTRAINT",
-            "CREATE INDEX",
-            "DROP INDEX"
-        ]
-        query_upper = query.upper()
-        return any(pattern in query_upper for pattern in dangerous_patterns)
+        return self._DANGER_RE.search(query) is not None
     
     @audit_log("neo4j_health_check")
     def check_connection(self) -> Dict[str, Any]:
+        healthy = {
+            "status": "healthy",
+            "connection": "successful",
+            "test_query": True,
+            "database": self.config.database
+        }
+        if time.monotonic() - self._last_healthy < _HEALTH_CACHE_TTL:
+            return healthy
+        
         try:
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                test_value = result.single()["test"]
-                
-                return {
-                    "status": "healthy",
-                    "connection": "successful",
-                    "test_query": test_value == 1,
-                    "database": self.config.database
-                }
+            # The driver's own probe: a Bolt handshake without opening a session or transaction
+            self.driver.verify_connectivity()
+            self._last_healthy = time.monotonic()
+            return healthy
         except Exception as e:
+            self._last_healthy = 0.0
             logger.error("Neo4j connection check failed", error=str(e))
             return {
                 "status": "unhealthy",
@@ -129,34 +471,14 @@ class Neo4jTools:
     @audit_log("neo4j_schema_info")
     def get_schema_info(self) -> Dict[str, Any]:
         try:
-            with self.driver.session(database=self.config.database) as session:
-                # Get node labels
-                labels_result = session.execute_read(
-                    self._run_query,
-                    "CALL db.labels() YIELD label RETURN collect(label) as labels",
-                    {}
-                )
-                
-                # Get relationship types
-                rel_types_result = session.execute_read(
-                    self._run_query,
-                    "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types",
-                    {}
-                )
-                
-                # Get property keys
-                props_result = session.execute_read(
-                    self._run_query,
-                    "CALL db.propertyKeys() YIELD propertyKey RETURN collect(propertyKey) as keys",
-                    {}
-                )
-                
-                return {
-                    "status": "success",
-                    "labels": labels_result[0]["labels"] if labels_result else [],
-                    "relationship_types": rel_types_result[0]["types"] if rel_types_result else [],
-                    "property_keys": props_result[0]["keys"] if props_result else []
-                }
+            generation, cached = self._cached_schema()
+            if cached is not None:
+                return cached
+            
+            with self._read_session() as session:
+                records = session.execute_read(self._run_query, _SCHEMA_QUERY, {})
+            
+            return self._store_schema(generation, records)
                 
         except Exception as e:
             logger.error("Failed to retrieve schema info", error=str(e))
@@ -165,49 +487,72 @@ class Neo4jTools:
                 "error": str(e)
             }
     
+    def _cached_schema(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        with self._cache_lock:
+            generation = self._cache_generation
+            cached = self._schema_cache.get(generation)
+        return generation, dict(cached) if cached is not None else None
+    
+    def _store_schema(self, generation: int, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        schema = records[0] if records else {}
+        result = {
+            "status": "success",
+            "labels": schema.get("labels", []),
+            "relationship_types": schema.get("types", []),
+            "property_keys": schema.get("keys", [])
+        }
+        with self._cache_lock:
+            self._schema_cache[generation] = result
+        return dict(result)
+    
     @audit_log("neo4j_node_search")
-    def search_nodes(self, label: str = None, properties: Dict[str, Any] = None, limit: int = 100) -> Dict[str, Any]:
+    def search_nodes(self, label: str = None, properties: Dict[str, Any] = None, limit: int = 100,
+                     materialize: bool = False) -> Dict[str, Any]:
         try:
-            query_parts = ["MATCH (n"]
-            parameters = {}
+            # Property values travel in $props, so every search for a given label and
+            # set of property names shares one query string and one cached server plan
+            query = _search_nodes_query(label or None, tuple(sorted(properties or ())))
+            parameters = {"props": properties or {}, "limit": limit}
             
-            if label:
-                query_parts.append(f":{label}")
+            return _with_nodes(self.execute_cypher(query, parameters, read_only=True), materialize)
             
-            if properties:
-                prop_conditions = []
-                for key, value in properties.items():
-                    param_name = f"prop_{key}"
-                    prop_conditions.append(f"n.{key} = ${param_name}")
-                    parameters[param_name] = value
-                
-                if prop_conditions:
-                    query_parts.extend([" {", ", ".join(prop_conditions), "}"])
-            
-            query_parts.extend([") RETURN n LIMIT $limit"])
-            parameters["limit"] = limit
-            
-            query = "".join(query_parts)
-            
-            result = self.execute_cypher(query, parameters, read_only=True)
+        except Exception as e:
+            logger.error("Node search failed", error=str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    @audit_log("neo4j_batch_node_search")
+    def batch_search_nodes(self, searches: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run several property searches, one label-scoped query per (label, property keys) group."""
+        try:
+            groups: Dict[Tuple[Optional[str], Tuple[str, ...]], List[Dict[str, Any]]] = {}
+            results: List[Dict[str, Any]] = []
+            for index, search in enumerate(searches):
+                label = search.get("label") or None
+                props = search.get("properties") or {}
+                results.append({"label": label, "properties": props, "nodes": []})
+                groups.setdefault((label, tuple(sorted(props))), []).append(
+                    {"index": index, "props": props, "limit": int(search.get("limit", 100))}
+                )
             
-            if result["status"] == "success":
-                nodes = []
+            for (label, keys), batch in groups.items():
+                parameters = {"batch": batch, "limit": max(q["limit"] for q in batch)}
+                result = self.execute_cypher(_batch_search_query(label, keys), parameters, read_only=True)
+                if result["status"] != "success":
+                    return result
                 for record in result["data"]:
-                    node = record["n"]
-                    nodes.append({
-                        "id": node.id,
-                        "labels": list(node.labels),
-                        "properties": dict(node)
-                    })
-                
-                result["nodes"] = nodes
-                result["node_count"] = len(nodes)
+                    results[record["index"]]["nodes"] = record["nodes"]
             
-            return result
+            return {
+                "status": "success",
+                "results": results,
+                "search_count": len(results)
+            }
             
         except Exception as e:
-            logger.error("Node search failed", error=str(e))
+            logger.error("Batch node search failed", error=str(e))
             return {
                 "status": "error",
                 "error": str(e)
@@ -215,58 +560,158 @@ class Neo4jTools:
     
     @audit_log("neo4j_path_query")
     def find_shortest_path(self, start_props: Dict[str, Any], end_props: Dict[str, Any], 
-                          relationship_types: List[str] = None, max_depth: int = 6) -> Dict[str, Any]:
+                          relationship_types: List[str] = None, max_depth: int = 6,
+                          start_label: str = None, end_label: str = None) -> Dict[str, Any]:
+        """
+        Find up to 10 shortest paths between two nodes matched by property.
+        
+        Pass start_label/end_label whenever they are known: with a label only nodes
+        carrying it are considered as endpoints instead of every node in the graph,
+        and an index on that label's matched properties is used when one exists.
+        """
         try:
-            # Build start and end node patterns
-            start_conditions = " AND ".join([f"start.{k} = $start_{k}" for k in start_props.keys()])
-            end_conditions = " AND ".join([f"end.{k} = $end_{k}" for k in end_props.keys()])
+            query = _shortest_path_query(start_label, end_label, start_props, end_props,
+                                         relationship_types, max_depth)
+            parameters = {"sp": start_props, "ep": end_props}
             
-            # Build relationship pattern
-            rel_pattern = ""
-            if relationship_types:
-                rel_types = "|".join(relationship_types)
-                rel_pattern = f"[:{rel_types}*1..{max_depth}]"
-            else:
-                rel_pattern = f"[*1..{max_depth}]"
+            return _with_paths(self.execute_cypher(query, parameters, read_only=True))
             
-            query = f"""
-            MATCH (start), (end)
-            WHERE {start_conditions} AND {end_conditions}
-            MATCH path = shortestPath((start)-{rel_pattern}-(end))
-            RETURN path, length(path) as pathLength
-            ORDER BY pathLength
-            LIMIT 10
-            """
+        except Exception as e:
+            logger.error("Shortest path query failed", error=str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+class AsyncNeo4jTools(Neo4jTools):
+    """
+    Neo4jTools with coroutine variants of the query methods, backed by the async driver.
+    
+    The async driver is bound to the shared background event loop; the a* methods can
+    be awaited from any loop and hop onto it. Several tool calls issued in the same
+    agent step then overlap their network waits instead of each holding a thread.
+    The synchronous methods and the query/schema caches are inherited and shared.
+    """
+    
+    def __init__(self, config: Neo4jConfig):
+        super().__init__(config)
+        self._async_driver = None
+        self._query_slots: Optional[asyncio.Semaphore] = None
+    
+    def _adriver(self):
+        # Created on first use so it belongs to the background loop
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self.config.uri,
+                auth=(self.config.username, self.config.password),
+                max_connection_lifetime=self.config.max_connection_lifetime,
+                max_connection_pool_size=self.config.max_connection_pool_size,
+                connection_timeout=self.config.connection_timeout
+            )
+            # Never wait on more concurrent queries than the pool has connections
+            self._query_slots = asyncio.Semaphore(self.config.max_connection_pool_size)
+        return self._async_driver
+    
+    async def _aread(self, query: str, parameters: Dict[str, Any], read_only: bool = True) -> List[Dict[str, Any]]:
+        driver = self._adriver()
+        async with self._query_slots:
+            async with driver.session(
+                database=self.config.database,
+                default_access_mode=READ_ACCESS if read_only else WRITE_ACCESS,
+                fetch_size=self.config.fetch_size
+            ) as session:
+                if read_only:
+                    return await session.execute_read(self._arun_query, query, parameters)
+                return await session.execute_write(self._arun_query, query, parameters)
+    
+    @staticmethod
+    async def _arun_query(tx: AsyncManagedTransaction, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        result = await tx.run(query, parameters)
+        data = await result.data()
+        await result.consume()
+        return data
+    
+    async def aexecute_cypher(self, query: str, parameters: Dict[str, Any] = None, read_only: bool = True) -> Dict[str, Any]:
+        """Async counterpart of execute_cypher; shares its result cache."""
+        parameters = parameters or {}
+        cached = self._cached_result(query, parameters, read_only)
+        if cached is not None:
+            return cached
+        return await self._aexecute_cypher_uncached(query, parameters, read_only)
+    
+    @audit_log("neo4j_query")
+    @require_security_check
+    async def _aexecute_cypher_uncached(self, query: str, parameters: Dict[str, Any], read_only: bool) -> Dict[str, Any]:
+        try:
+            if self._is_dangerous_query(query):
+                raise PermissionError(f"Query blocked by security policy: {query}")
             
-            parameters = {}
-            for k, v in start_props.items():
-                parameters[f"start_{k}"] = v
-            for k, v in end_props.items():
-                parameters[f"end_{k}"] = v
+            key = self._cache_miss_key(query, parameters, read_only)
+            # Same backoff as the sync path, applied to losing the connection
+            async for attempt in AsyncRetrying(stop=stop_after_attempt(3),
+                                               wait=wait_exponential(multiplier=1, min=4, max=10),
+                                               retry=retry_if_exception_type((ServiceUnavailable, SessionExpired)),
+                                               reraise=True):
+                with attempt:
+                    result = await event_loop.run_async(self._aread(query, parameters, read_only))
+            return self._query_response(key, query, parameters, read_only, result)
             
-            result = self.execute_cypher(query, parameters, read_only=True)
+        except Exception as e:
+            return self._query_error(e, query)
+    
+    @audit_log("neo4j_schema_info")
+    async def aget_schema_info(self) -> Dict[str, Any]:
+        try:
+            generation, cached = self._cached_schema()
+            if cached is not None:
+                return cached
             
-            if result["status"] == "success" and result["data"]:
-                paths = []
-                for record in result["data"]:
-                    path_data = record["path"]
-                    paths.append({
-                        "length": record["pathLength"],
-                        "nodes": [dict(node) for node in path_data.nodes],
-                        "relationships": [dict(rel) for rel in path_data.relationships]
-                    })
+            records = await event_loop.run_async(self._aread(_SCHEMA_QUERY, {}))
+            return self._store_schema(generation, records)
                 
-                result["paths"] = paths
-                result["path_count"] = len(paths)
-            else:
-                result["paths"] = []
-                result["path_count"] = 0
+        except Exception as e:
+            logger.error("Failed to retrieve schema info", error=str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    @audit_log("neo4j_node_search")
+    async def asearch_nodes(self, label: str = None, properties: Dict[str, Any] = None, limit: int = 100,
+                            materialize: bool = False) -> Dict[str, Any]:
+        try:
+            query = _search_nodes_query(label or None, tuple(sorted(properties or ())))
+            parameters = {"props": properties or {}, "limit": limit}
+            
+            return _with_nodes(await self.aexecute_cypher(query, parameters, read_only=True), materialize)
+            
+        except Exception as e:
+            logger.error("Node search failed", error=str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    @audit_log("neo4j_path_query")
+    async def afind_shortest_path(self, start_props: Dict[str, Any], end_props: Dict[str, Any], 
+                                  relationship_types: List[str] = None, max_depth: int = 6,
+                                  start_label: str = None, end_label: str = None) -> Dict[str, Any]:
+        try:
+            query = _shortest_path_query(start_label, end_label, start_props, end_props,
+                                         relationship_types, max_depth)
+            parameters = {"sp": start_props, "ep": end_props}
             
-            return result
+            return _with_paths(await self.aexecute_cypher(query, parameters, read_only=True))
             
         except Exception as e:
             logger.error("Shortest path query failed", error=str(e))
             return {
                 "status": "error",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    def close(self):
+        if self._async_driver is not None:
+            event_loop.run_sync(self._async_driver.close())
+            self._async_driver = None
+        super().close()
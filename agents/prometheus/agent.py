@@ -1,19 +1,49 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, START, END
+from langgraph.graph import StateGraph, END
 import structlog
 
 from shared.base_agent import BaseAgent, AgentConfig, BaseAgentState
 from shared.mcp_client import create_mcp_client
 from shared.llm_factory import LLMFactory
+from shared.serialization import dumps
+from shared import event_loop
+from shared.tool_registry import LazyToolRegistry, LAZY_SCHEMA_THRESHOLD
 from config.settings import get_config
 from .tools import PrometheusConfig
 
 logger = structlog.get_logger(__name__)
 
+_PROMETHEUS_SYSTEM_PROMPT = """You are a Prometheus monitoring specialist agent. Your responsibilities include:
+
+1. **Metrics Analysis**: Query and analyze Prometheus metrics using PromQL
+2. **Health Monitoring**: Check system and service health status
+3. **Alert Management**: Monitor and respond to active alerts
+4. **Anomaly Detection**: Identify unusual patterns in metrics data
+
+Key capabilities:
+- Execute PromQL queries for instant and range data
+- Perform statistical anomaly detection on metrics
+- Monitor alert status and escalation
+- Provide actionable insights based on metrics data
+
+Guidelines:
+- Always validate metric names and query syntax
+- Provide context and interpretation for metric values
+- Suggest remediation steps for detected issues
+- Use appropriate time ranges for historical analysis
+- Be concise but thorough in your analysis
+
+When querying metrics, consider:
+- Rate vs counter vs gauge metric types
+- Appropriate aggregation functions (avg, sum, max, etc.)
+- Time window selection for rate calculations
+- Labels for filtering and grouping
+
+Respond with clear, actionable insights based on the monitoring data."""
+
 class PrometheusAgent(BaseAgent):
     def __init__(self, config: AgentConfig, prometheus_config: PrometheusConfig):
         super().__init__(config)
@@ -28,6 +58,20 @@ class PrometheusAgent(BaseAgent):
         global_config = get_config()
         self.model = LLMFactory.create_llm(global_config.llm, global_config.langsmith)
         self._mcp_tools = None
+        self._tools: Optional[List[Any]] = None
+        self.prometheus_tools = None
+        self._tool_registry: Optional[LazyToolRegistry] = None
+    
+    async def __aenter__(self) -> "PrometheusAgent":
+        try:
+            await self.mcp_client.initialize()
+        except Exception as e:
+            # The fallback tools still work without MCP
+            self.logger.warning("MCP client initialization failed", error=str(e))
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def get_mcp_tools(self) -> List[Any]:
         """Get Prometheus tools from MCP server."""
@@ -37,21 +81,46 @@ class PrometheusAgent(BaseAgent):
         return self._mcp_tools
     
     def create_tools(self) -> List[Any]:
+        """Return the agent's tools, resolving them only once per instance."""
+        if self._tools is None:
+            with self._graph_lock:
+                if self._tools is None:
+                    self._tools = self._load_tools()
+        return self._tools
+    
+    async def _aget_graph(self) -> Any:
+        if self._tools is None:
+            # Resolve the tools without blocking the caller's event loop; the first to finish wins
+            tools = await self._aload_tools()
+            with self._graph_lock:
+                if self._tools is None:
+                    self._tools = tools
+        return self._get_graph()
+    
+    async def _aload_tools(self) -> List[Any]:
+        try:
+            mcp_tools = await event_loop.run_async(self.get_mcp_tools())
+            logger.info("Retrieved Prometheus MCP tools", tool_count=len(mcp_tools))
+            return self._expose_tools(mcp_tools)
+        except Exception as e:
+            logger.error("Failed to get MCP tools, falling back to legacy implementation", error=str(e))
+            return self._create_fallback_tools()
+    
+    def _expose_tools(self, tools: List[Any]) -> List[Any]:
+        """Bind small tool sets directly; put large ones behind a lazily described catalog."""
+        if len(tools) <= LAZY_SCHEMA_THRESHOLD:
+            return tools
+        self._tool_registry = LazyToolRegistry(tools)
+        return self._tool_registry.as_tools()
+    
+    def _load_tools(self) -> List[Any]:
         """Create tools using MCP client."""
         try:
-            # Get MCP tools asynchronously
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in an async context, create a new event loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.get_mcp_tools())
-                    mcp_tools = future.result()
-            else:
-                mcp_tools = loop.run_until_complete(self.get_mcp_tools())
+            # MCP sessions live on the shared background loop; block on it from any thread
+            mcp_tools = event_loop.run_sync(self.get_mcp_tools())
             
             logger.info("Retrieved Prometheus MCP tools", tool_count=len(mcp_tools))
-            return mcp_tools
+            return self._expose_tools(mcp_tools)
             
         except Exception as e:
             logger.error("Failed to get MCP tools, falling back to legacy implementation", error=str(e))
@@ -62,74 +131,66 @@ class PrometheusAgent(BaseAgent):
         """Fallback tools implementation if MCP is unavailable."""
         from .tools import PrometheusTools
         
-        prometheus_tools = PrometheusTools(self.prometheus_config)
+        with self._graph_lock:
+            # Concurrent loaders share one client, so none is left open behind a losing tool list
+            if self.prometheus_tools is None:
+                self.prometheus_tools = PrometheusTools(self.prometheus_config)
+            prometheus_tools = self.prometheus_tools
         
         @tool
         def query_prometheus_metrics(metric_query: str, time_range: str = None) -> str:
             """Query Prometheus metrics using PromQL."""
             result = prometheus_tools.query_prometheus(metric_query, time_range)
-            return str(result)
+            return dumps(result)
         
         @tool
         def check_prometheus_health() -> str:
             """Check if Prometheus server is healthy and responsive."""
             result = prometheus_tools.check_prometheus_health()
-            return str(result)
+            return dumps(result)
         
         @tool
         def get_active_alerts() -> str:
             """Retrieve all currently active/firing alerts from Prometheus."""
             result = prometheus_tools.get_active_alerts()
-            return str(result)
+            return dumps(result)
         
         @tool
         def detect_metric_anomalies(metric: str, threshold: float = 2.0) -> str:
             """Detect anomalies in a specific metric using statistical analysis."""
             result = prometheus_tools.detect_anomalies(metric, threshold)
-            return str(result)
+            return dumps(result)
+        
+        @tool
+        def detect_anomalies_across_metrics(metrics: str, threshold: float = 2.0) -> str:
+            """Detect anomalies in several metrics at once. metrics is a comma-separated list of metric names."""
+            names = [m.strip() for m in metrics.split(",") if m.strip()]
+            result = prometheus_tools.detect_anomalies_many(names, threshold)
+            return dumps(result)
         
         return [
             query_prometheus_metrics,
             check_prometheus_health,
             get_active_alerts,
-            detect_metric_anomalies
+            detect_metric_anomalies,
+            detect_anomalies_across_metrics
         ]
     
     def build_graph(self) -> Any:
         tools = self.create_tools()
         
-        system_prompt = """You are a Prometheus monitoring specialist agent. Your responsibilities include:
-
-1. **Metrics Analysis**: Query and analyze Prometheus metrics using PromQL
-2. **Health Monitoring**: Check system and service health status
-3. **Alert Management**: Monitor and respond to active alerts
-4. **Anomaly Detection**: Identify unusual patterns in metrics data
-
-Key capabilities:
-- Execute PromQL queries for instant and range data
-- Perform statistical anomaly detection on metrics
-- Monitor alert status and escalation
-- Provide actionable insights based on metrics data
-
-Guidelines:
-- Always validate metric names and query syntax
-- Provide context and interpretation for metric values
-- Suggest remediation steps for detected issues
-- Use appropriate time ranges for historical analysis
-- Be concise but thorough in your analysis
-
-When querying metrics, consider:
-- Rate vs counter vs gauge metric types
-- Appropriate aggregation functions (avg, sum, max, etc.)
-- Time window selection for rate calculations
-- Labels for filtering and grouping
-
-Respond with clear, actionable insights based on the monitoring data."""
-
+        system_prompt = _PROMETHEUS_SYSTEM_PROMPT
+        
+        if self._tool_registry is not None:
+            system_prompt += (
+                "\n\nTool catalog (call describe_tool for a tool's arguments, then invoke_tool to run it):\n"
+                + self._tool_registry.summaries()
+            )
+        
         agent = create_react_agent(
             model=self.model,
             tools=tools,
-            prompt=system_prompt
+            prompt=LLMFactory.system_prompt(system_prompt, get_config().llm)
         )
         
         graph_builder = StateGraph(BaseAgentState)
@@ -139,38 +200,17 @@ Respond with clear, actionable insights based on the monitoring data."""
         
         return graph_builder.compile()
     
-    def run(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute the Prometheus monitoring agent with user input."""
-        try:
-            graph = self.build_graph()
-            initial_state = self.get_initial_state()
-            
-            if context:
-                initial_state["context"].update(context)
-            
-            inputs = {
-                "messages": [HumanMessage(content=user_input)],
-                "metadata": initial_state["metadata"],
-                "context": initial_state["context"],
-                "error_count": 0,
-                "max_retries": self.config.max_retries
-            }
-            
-            self.logger.info("Starting Prometheus agent execution", input=user_input)
-            
-            result = graph.invoke(inputs)
-            
-            return {
-                "status": "success",
-                "response": result["messages"][-1].content if result["messages"] else "No response",
-                "metadata": result.get("metadata", {}),
-                "context": result.get("context", {})
-            }
-            
-        except Exception as e:
-            self.logger.error("Prometheus agent execution failed", error=str(e))
-            return {
-                "status": "error",
-                "error": str(e),
-                "response": "I encountered an error while processing your request."
-            }
\ No newline at end of file
+    def _agent_metadata(self, user_input: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"agent": "prometheus"}
+    
+    async def aclose(self):
+        """Release the MCP client and any fallback Prometheus client."""
+        await self.mcp_client.close()
+        if self.prometheus_tools is not None:
+            await asyncio.to_thread(self.prometheus_tools.close)
+    
+    def close(self):
+        """Release the MCP client and any fallback Prometheus client."""
+        event_loop.run_sync(self.mcp_client.close())
+        if self.prometheus_tools is not None:
+            self.prometheus_tools.close()
@@ -1,14 +1,44 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import hashlib
+import threading
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
+from cachetools import TTLCache
+import numpy as np
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from shared.security import audit_log, require_security_check
+from shared.serialization import loads
+from shared import event_loop
 
 logger = structlog.get_logger(__name__)
 
+# A healthy response is trusted for this long before the server is probed again
+_HEALTH_CACHE_TTL = 5
+
+# Keep-alive pool sizing for fan-out across query, alert and anomaly tools;
+# retries are left to tenacity on the individual calls
+_POOL_CONNECTIONS = 16
+_POOL_MAXSIZE = 64
+
+# Range query resolution; range windows end on a step boundary so repeated
+# polls within one step share a cache entry
+_STEP_SECONDS = 15
+_STEP = f"{_STEP_SECONDS}s"
+
+# Window length in seconds per supported time_range; anything else falls back to 1h
+_RANGE_TABLE = {
+    "1h": timedelta(hours=1).total_seconds(),
+    "24h": timedelta(hours=24).total_seconds(),
+    "7d": timedelta(days=7).total_seconds()
+}
+
+# Firing alerts change faster than metric history, so they are reused only briefly
+_ALERTS_CACHE_TTL = 5
+
 class PrometheusConfig(BaseModel):
     base_url: str = Field(..., description="Prometheus server URL")
     timeout: int = Field(default=30, description="Request timeout in seconds")
@@ -16,6 +46,15 @@ class PrometheusConfig(BaseModel):
     auth_token: Optional[str] = Field(default=None, description="Authentication token")
     mcp_url: str = Field(default="http://localhost:8000/mcp", description="Prometheus MCP server URL")
     mcp_transport: str = Field(default="streamable_http", description="MCP transport protocol")
+    cache_enabled: bool = Field(default=True, description="Reuse results of identical queries within query_cache_ttl")
+    query_cache_ttl: int = Field(default=30, description="Seconds to reuse query results")
+    query_cache_size: int = Field(default=2048, description="Max cached query results")
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection failures, timeouts and 5xx answers are worth retrying; bad queries are not."""
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return isinstance(exc, requests.exceptions.RequestException)
 
 class MetricQuery(BaseModel):
     query: str = Field(..., description="PromQL query")
@@ -27,44 +66,78 @@ class PrometheusTools:
     def __init__(self, config: PrometheusConfig):
         self.config = config
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         if config.auth_token:
             self.session.headers.update({"Authorization": f"Bearer {config.auth_token}"})
+        self._last_health: Optional[Dict[str, Any]] = None
+        self._last_health_at = 0.0
+        self._query_cache = TTLCache(maxsize=config.query_cache_size, ttl=max(config.query_cache_ttl, 1))
+        self._alerts_cache = TTLCache(maxsize=1, ttl=_ALERTS_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+    
+    def __enter__(self) -> "PrometheusTools":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self):
+        """Release the pooled HTTP connections."""
+        self.session.close()
     
-    @audit_log("prometheus_query")
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def query_prometheus(self, metric_query: str, time_range: Optional[str] = None) -> Dict[str, Any]:
+        """Run a PromQL query, answering repeats within the cache TTL locally."""
+        end = (time.time() // _STEP_SECONDS) * _STEP_SECONDS if time_range else None
+        if not self.config.cache_enabled:
+            return self._query_prometheus_uncached(metric_query, time_range, end)
+        
+        key = hashlib.blake2b(f"{metric_query}|{time_range}|{end}".encode(), digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+        
+        result = self._query_prometheus_uncached(metric_query, time_range, end)
+        if result["status"] == "success":
+            with self._cache_lock:
+                self._query_cache[key] = result
+            result = dict(result)
+        return result
+    
+    # Full jitter spreads the retries of concurrent callers instead of firing them in lockstep
+    @retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=1, max=10),
+           retry=retry_if_exception(_is_transient), reraise=True)
+    def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        response = self.session.get(
+            url,
+            params=params,
+            timeout=self.config.timeout,
+            verify=self.config.verify_ssl
+        )
+        response.raise_for_status()
+        # orjson parses the raw bytes; multi-MB range results decode several times faster
+        return loads(response.content)
+    
+    @audit_log("prometheus_query")
+    def _query_prometheus_uncached(self, metric_query: str, time_range: Optional[str],
+                                   end: Optional[float]) -> Dict[str, Any]:
         try:
             params = {"query": metric_query}
             
             if time_range:
-                end_time = datetime.now()
-                if time_range == "1h":
-                    start_time = end_time - timedelta(hours=1)
-                elif time_range == "24h":
-                    start_time = end_time - timedelta(hours=24)
-                elif time_range == "7d":
-                    start_time = end_time - timedelta(days=7)
-                else:
-                    start_time = end_time - timedelta(hours=1)
-                
+                # Unix timestamps are accepted as-is, so no datetimes are built per query
                 params.update({
-                    "start": start_time.isoformat(),
-                    "end": end_time.isoformat(),
-                    "step": "15s"
+                    "start": end - _RANGE_TABLE.get(time_range, _RANGE_TABLE["1h"]),
+                    "end": end,
+                    "step": _STEP
                 })
                 endpoint = f"{self.config.base_url}/api/v1/query_range"
             else:
                 endpoint = f"{self.config.base_url}/api/v1/query"
             
-            response = self.session.get(
-                endpoint,
-                params=params,
-                timeout=self.config.timeout,
-                verify=self.config.verify_ssl
-            )
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params)
             logger.info("Prometheus query executed", query=metric_query, status=data.get("status"))
             
             return {
@@ -74,7 +147,7 @@ class PrometheusTools:
                 "timestamp": datetime.now().isoformat()
             }
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error("Prometheus query failed", error=str(e), query=metric_query)
             return {
                 "status": "error",
@@ -85,6 +158,9 @@ class PrometheusTools:
     
     @audit_log("prometheus_health_check")
     def check_prometheus_health(self) -> Dict[str, Any]:
+        if self._last_health is not None and time.monotonic() - self._last_health_at < _HEALTH_CACHE_TTL:
+            return dict(self._last_health)
+        
         try:
             response = self.session.get(
                 f"{self.config.base_url}/-/healthy",
@@ -92,12 +168,19 @@ class PrometheusTools:
                 verify=self.config.verify_ssl
             )
             
-            return {
+            result = {
                 "status": "healthy" if response.status_code == 200 else "unhealthy",
                 "response_code": response.status_code,
                 "timestamp": datetime.now().isoformat()
             }
+            # Only healthy answers are reused, so recovery from an outage is seen immediately
+            if response.status_code == 200:
+                self._last_health, self._last_health_at = result, time.monotonic()
+            else:
+                self._last_health = None
+            return result
         except Exception as e:
+            self._last_health = None
             logger.error("Prometheus health check failed", error=str(e))
             return {
                 "status": "unhealthy",
@@ -105,17 +188,26 @@ class PrometheusTools:
                 "timestamp": datetime.now().isoformat()
             }
     
-    @audit_log("prometheus_alerts")
     def get_active_alerts(self) -> Dict[str, Any]:
+        if not self.config.cache_enabled:
+            return self._get_active_alerts_uncached()
+        
+        with self._cache_lock:
+            cached = self._alerts_cache.get("alerts")
+        if cached is not None:
+            return dict(cached, cached=True)
+        
+        result = self._get_active_alerts_uncached()
+        if result["status"] == "success":
+            with self._cache_lock:
+                self._alerts_cache["alerts"] = result
+            result = dict(result)
+        return result
+    
+    @audit_log("prometheus_alerts")
+    def _get_active_alerts_uncached(self) -> Dict[str, Any]:
         try:
-            response = self.session.get(
-                f"{self.config.base_url}/api/v1/alerts",
-                timeout=self.config.timeout,
-                verify=self.config.verify_ssl
-            )
-            response.raise_for_status()
-            
-            alerts_data = response.json()
+            alerts_data = self._get_json(f"{self.config.base_url}/api/v1/alerts")
             active_alerts = [
                 alert for alert in alerts_data.get("data", {}).get("alerts", [])
                 if alert.get("state") == "firing"
@@ -136,30 +228,54 @@ class PrometheusTools:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def query_many_sync(self, queries: List[str], time_range: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run several PromQL queries concurrently on the shared I/O pool; results keep the order of the queries."""
+        return event_loop.map_blocking(lambda q: self.query_prometheus(q, time_range), queries)
+    
     def detect_anomalies(self, metric: str, threshold: float = 2.0) -> Dict[str, Any]:
         try:
-            query = f"rate({metric}[5m])"
-            result = self.query_prometheus(query, "1h")
-            
+            result = self.query_prometheus(f"rate({metric}[5m])", "1h")
+        except Exception as e:
+            return self._anomaly_error(e, metric)
+        return self._anomaly_report(result, metric, threshold)
+    
+    def detect_anomalies_many(self, metrics: List[str], threshold: float = 2.0) -> Dict[str, Any]:
+        """Detect anomalies across several metrics, querying them concurrently."""
+        try:
+            results = self.query_many_sync([f"rate({metric}[5m])" for metric in metrics], "1h")
+        except Exception as e:
+            return self._anomaly_error(e, ",".join(metrics))
+        return {
+            "status": "success",
+            "metrics": {
+                metric: self._anomaly_report(result, metric, threshold)
+                for metric, result in zip(metrics, results)
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _anomaly_report(result: Dict[str, Any], metric: str, threshold: float) -> Dict[str, Any]:
+        try:
             if result["status"] != "success":
                 return result
             
-            values = []
-            for series in result["data"]["data"]["result"]:
-                for value_pair in series.get("values", []):
-                    values.append(float(value_pair[1]))
+            series_list = [series.get("values", ()) for series in result["data"]["data"]["result"]]
+            # Sized up front so the array is allocated once instead of grown while filling
+            values = np.fromiter(
+                (value_pair[1] for series_values in series_list for value_pair in series_values),
+                dtype=np.float64,
+                count=sum(map(len, series_list))
+            )
             
-            if not values:
+            if not values.size:
                 return {"status": "no_data", "message": "No data points found"}
             
-            mean_val = sum(values) / len(values)
-            variance = sum((x - mean_val) ** 2 for x in values) / len(values)
-            std_dev = variance ** 0.5
+            mean_val = float(values.mean())
+            std_dev = float(values.std())
             
-            anomalies = [
-                val for val in values[-10:]
-                if abs(val - mean_val) > threshold * std_dev
-            ]
+            recent = values[-10:]
+            anomalies = recent[np.abs(recent - mean_val) > threshold * std_dev].tolist()
             
             return {
                 "status": "success",
@@ -173,9 +289,13 @@ class PrometheusTools:
             }
             
         except Exception as e:
-            logger.error("Anomaly detection failed", error=str(e), metric=metric)
-            return {
-                "status": "error",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
\ No newline at end of file
+            return PrometheusTools._anomaly_error(e, metric)
+    
+    @staticmethod
+    def _anomaly_error(e: Exception, metric: str) -> Dict[str, Any]:
+        logger.error("Anomaly detection failed", error=str(e), metric=metric)
+        return {
+            "status": "error",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }
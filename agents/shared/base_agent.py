@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, TypedDict, Annotated
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, TypedDict, Annotated
+import threading
 from pydantic import BaseModel, Field
 import structlog
 from langgraph.graph import MessagesState
 from langgraph.graph.message import add_messages
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from .langsmith_tracing import get_tracer
 
 logger = structlog.get_logger(__name__)
 
@@ -15,6 +18,12 @@ class BaseAgentState(TypedDict):
     error_count: int
     max_retries: int
 
+def _message_text(content: Any) -> str:
+    # Providers stream either plain strings or lists of typed content blocks
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
 class AgentConfig(BaseModel):
     name: str = Field(..., description="Agent name")
     model_name: str = Field(default="gpt-3.5-turbo", description="LLM model")
@@ -25,10 +34,22 @@ class AgentConfig(BaseModel):
     system_prompt: str = Field(..., description="System prompt for the agent")
 
 class BaseAgent(ABC):
+    # Whether run results report the LangSmith session; agents that name sessions set this
+    _TRACES_SESSIONS = False
+    
     def __init__(self, config: AgentConfig):
         self.config = config
         self.logger = structlog.get_logger(self.__class__.__name__)
         self._setup_logging()
+        # Copied per run instead of rebuilding the invariant input keys each time
+        self._initial_inputs_template: Dict[str, Any] = {
+            "error_count": 0,
+            "max_retries": config.max_retries
+        }
+        # The compiled graph holds no per-request state; built on first use and reused.
+        # Reentrant because build_graph resolves the tools, which take the same lock.
+        self._graph = None
+        self._graph_lock = threading.RLock()
     
     def _setup_logging(self):
         self.logger = self.logger.bind(agent_name=self.config.name)
@@ -50,6 +71,146 @@ class BaseAgent(ABC):
             max_retries=self.config.max_retries
         )
     
+    def _get_graph(self) -> Any:
+        if self._graph is None:
+            with self._graph_lock:
+                if self._graph is None:
+                    self._graph = self.build_graph()
+        return self._graph
+    
+    async def _aget_graph(self) -> Any:
+        return self._get_graph()
+    
+    def _get_session_name(self, user_input: str) -> Optional[str]:
+        """LangSmith session to trace a run under; None leaves the session untouched."""
+        return None
+    
+    def _agent_metadata(self, user_input: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extra metadata merged into the run's initial state."""
+        return {}
+    
+    def _build_inputs(self, user_input: str, context: Optional[Dict[str, Any]],
+                      session_name: Optional[str] = None) -> Dict[str, Any]:
+        metadata = {"agent_name": self.config.name}
+        metadata.update(self._agent_metadata(user_input, context))
+        
+        inputs = self._initial_inputs_template.copy()
+        inputs["messages"] = [HumanMessage(content=user_input)]
+        inputs["metadata"] = metadata
+        inputs["context"] = dict(context) if context else {}
+        
+        self.logger.info("Starting agent execution",
+                         input=user_input[:100],
+                         session=session_name)
+        return inputs
+    
+    def _begin_session(self, user_input: str) -> Optional[str]:
+        # Returns the session name only when tracing is actually on
+        session_name = self._get_session_name(user_input)
+        if session_name is None:
+            return None
+        tracer = get_tracer()
+        if not (tracer and tracer.is_enabled()):
+            return None
+        tracer.set_session(session_name)
+        self.logger.info("LangSmith session set", session=session_name)
+        return session_name
+    
+    @staticmethod
+    def _end_session(session_name: Optional[str]) -> None:
+        if session_name is not None:
+            get_tracer().clear_session()
+    
+    @staticmethod
+    def _session_config(session_name: Optional[str]) -> Optional[Dict[str, Any]]:
+        # Carries the session on the run itself rather than in process-wide state
+        return get_tracer().run_config() if session_name is not None else None
+    
+    def _run_config(self, context: Optional[Dict[str, Any]],
+                    session_name: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """Runnable config for one run, plus a token handed to _result_fields and _release_run."""
+        return self._session_config(session_name), None
+    
+    def _result_fields(self, token: Any) -> Dict[str, Any]:
+        """Extra fields for a successful run's response."""
+        return {}
+    
+    def _release_run(self, token: Any) -> None:
+        """Release per-run state created by _run_config."""
+    
+    def _format_result(self, result: Dict[str, Any], session_name: Optional[str] = None) -> Dict[str, Any]:
+        response_data = {
+            "status": "success",
+            "response": result["messages"][-1].content if result["messages"] else "No response",
+            "metadata": result.get("metadata", {}),
+            "context": result.get("context", {})
+        }
+        if self._TRACES_SESSIONS:
+            response_data["langsmith_session"] = session_name
+        self.logger.info("Agent execution completed", status="success", session=session_name)
+        return response_data
+    
+    def _format_error(self, e: Exception, session_name: Optional[str] = None) -> Dict[str, Any]:
+        self.logger.error("Agent execution failed", error=str(e), session=session_name)
+        response_data = {
+            "status": "error",
+            "error": str(e),
+            "response": "I encountered an error while processing your request."
+        }
+        if self._TRACES_SESSIONS:
+            response_data["langsmith_session"] = session_name
+        return response_data
+    
+    def run(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute the agent with user input."""
+        session_name = self._begin_session(user_input)
+        run_config, run_token = self._run_config(context, session_name)
+        try:
+            inputs = self._build_inputs(user_input, context, session_name)
+            result = self._get_graph().invoke(inputs, config=run_config)
+            return {**self._format_result(result, session_name), **self._result_fields(run_token)}
+        except Exception as e:
+            return self._format_error(e, session_name)
+        finally:
+            self._release_run(run_token)
+            self._end_session(session_name)
+    
+    async def arun(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute the agent on the caller's event loop, awaiting tool calls concurrently."""
+        session_name = self._begin_session(user_input)
+        run_config, run_token = self._run_config(context, session_name)
+        try:
+            inputs = self._build_inputs(user_input, context, session_name)
+            result = await (await self._aget_graph()).ainvoke(inputs, config=run_config)
+            return {**self._format_result(result, session_name), **self._result_fields(run_token)}
+        except Exception as e:
+            return self._format_error(e, session_name)
+        finally:
+            self._release_run(run_token)
+            self._end_session(session_name)
+    
+    async def astream(self, user_input: str, context: Dict[str, Any] = None) -> AsyncIterator[str]:
+        """Yield the agent's response text as the model generates it."""
+        session_name = self._begin_session(user_input)
+        run_config, run_token = self._run_config(context, session_name)
+        try:
+            inputs = self._build_inputs(user_input, context, session_name)
+            graph = await self._aget_graph()
+            async for text in self._stream_text(graph, inputs, run_config):
+                yield text
+        finally:
+            self._release_run(run_token)
+            self._end_session(session_name)
+    
+    @staticmethod
+    async def _stream_text(graph: Any, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Yield model output text from a compiled graph as tokens arrive."""
+        async for event in graph.astream_events(inputs, config=config, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                text = _message_text(event["data"]["chunk"].content)
+                if text:
+                    yield text
+    
     def handle_error(self, error: Exception, state: BaseAgentState) -> BaseAgentState:
         self.logger.error("Agent error occurred", error=str(error), error_count=state["error_count"])
         state["error_count"] += 1
@@ -0,0 +1,123 @@
+"""
+Background Event Loop
+
+Provides a single long-lived asyncio event loop running in a daemon thread, so
+synchronous callers (Flask request threads, LangChain sync tools) can share
+async resources that must stay bound to one loop. It also owns the process-wide
+worker pool for blocking I/O, which doubles as that loop's default executor.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+from typing import Any, Callable, Coroutine, Iterable, List, Optional, TypeVar
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+_BG_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BG_LOOP_LOCK = threading.Lock()
+
+# Shared worker pool size for blocking I/O, sized like asyncio's default executor but larger
+IO_POOL_SIZE = min(32, (os.cpu_count() or 4) * 4)
+
+_IO_POOL: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_IO_POOL_LOCK = threading.Lock()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    # libuv's loop is markedly faster for the socket-heavy MCP and query traffic
+    if uvloop is not None and sys.platform != "win32":
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared background event loop, starting it on first use."""
+    global _BG_LOOP
+    if _BG_LOOP is None:
+        with _BG_LOOP_LOCK:
+            if _BG_LOOP is None:
+                loop = _new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="agents-event-loop", daemon=True)
+                thread.start()
+                _BG_LOOP = loop
+    return _BG_LOOP
+
+def get_io_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the process-wide pool for blocking I/O, starting it on first use."""
+    global _IO_POOL
+    if _IO_POOL is None:
+        with _IO_POOL_LOCK:
+            if _IO_POOL is None:
+                pool = concurrent.futures.ThreadPoolExecutor(max_workers=IO_POOL_SIZE, thread_name_prefix="agent-io")
+                # asyncio.to_thread on the background loop lands on the same workers
+                get_background_loop().set_default_executor(pool)
+                _IO_POOL = pool
+    return _IO_POOL
+
+def shutdown_io_pool() -> None:
+    """Shut the shared I/O pool down; the next get_io_pool() starts a fresh one."""
+    global _IO_POOL
+    with _IO_POOL_LOCK:
+        pool, _IO_POOL = _IO_POOL, None
+        if pool is None:
+            return
+        # The background loop outlives the pool; give it back a default executor of its
+        # own first, or later to_thread calls on it would hit the shut-down pool
+        get_background_loop().set_default_executor(concurrent.futures.ThreadPoolExecutor(thread_name_prefix="asyncio"))
+    pool.shutdown(wait=False)
+
+def map_blocking(func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """
+    Run a blocking function over items on the shared I/O pool, keeping their order.
+    
+    Items no worker has picked up yet are run on the calling thread instead, so a
+    caller that is itself a pool worker cannot deadlock waiting on a saturated pool.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    pool = get_io_pool()
+    futures = [pool.submit(func, item) for item in items]
+    return [func(item) if future.cancel() else future.result() for item, future in zip(items, futures)]
+
+def submit(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """Schedule a coroutine on the background loop from any thread."""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the background loop and block until it completes."""
+    loop = get_background_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot block the background event loop it runs on")
+    
+    return submit(coro).result(timeout)
+
+async def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await a coroutine on the background loop from any event loop (or on it directly)."""
+    loop = get_background_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+def with_sync_entry(async_tool: Any) -> Any:
+    """Let a coroutine-only tool also be invoked synchronously, via the shared background loop."""
+    coroutine = async_tool.coroutine
+    
+    def run_on_background_loop(*args, **kwargs):
+        return run_sync(coroutine(*args, **kwargs))
+    
+    async_tool.func = run_on_background_loop
+    return async_tool
@@ -5,6 +5,7 @@ Provides simple integration with LangSmith for tracking agent actions and reason
 """
 
 import os
+from contextvars import ContextVar
 from typing import Optional, Dict, Any
 import structlog
 from functools import wraps
@@ -13,6 +14,14 @@ from config.settings import LangSmithConfig
 
 logger = structlog.get_logger(__name__)
 
+# Per-run session name. Context-local, so concurrent agent runs on other threads
+# or tasks never see each other's session, and no process environment is mutated.
+_SESSION: ContextVar[Optional[str]] = ContextVar("langsmith_session", default=None)
+
+def current_session() -> Optional[str]:
+    """Session of the current run, else the process-wide default from setup_langsmith."""
+    return _SESSION.get() or os.environ.get("LANGCHAIN_SESSION")
+
 def setup_langsmith(config: LangSmithConfig) -> bool:
     """
     Setup LangSmith tracing with the provided configuration.
@@ -38,7 +47,7 @@ def setup_langsmith(config: LangSmithConfig) -> bool:
         os.environ["LANGCHAIN_PROJECT"] = config.project
         os.environ["LANGCHAIN_ENDPOINT"] = config.endpoint
         
-        # Set session name if provided
+        # Process-wide default session; per-run sessions live in a context variable
         if config.session_name:
             os.environ["LANGCHAIN_SESSION"] = config.session_name
         
@@ -75,19 +84,11 @@ def with_langsmith_session(session_name: str):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Store original session
-            original_session = os.environ.get("LANGCHAIN_SESSION")
-            
+            token = _SESSION.set(session_name)
             try:
-                # Set session for this call
-                os.environ["LANGCHAIN_SESSION"] = session_name
                 return func(*args, **kwargs)
             finally:
-                # Restore original session
-                if original_session:
-                    os.environ["LANGCHAIN_SESSION"] = original_session
-                elif "LANGCHAIN_SESSION" in os.environ:
-                    del os.environ["LANGCHAIN_SESSION"]
+                _SESSION.reset(token)
         
         return wrapper
     return decorator
@@ -150,15 +151,22 @@ class LangSmithTracer:
     def set_session(self, session_name: str):
         """Set the current LangSmith session."""
         if self.enabled:
-            os.environ["LANGCHAIN_SESSION"] = session_name
+            _SESSION.set(session_name)
             logger.debug("LangSmith session set", session=session_name)
     
     def clear_session(self):
         """Clear the current LangSmith session."""
-        if "LANGCHAIN_SESSION" in os.environ:
-            del os.environ["LANGCHAIN_SESSION"]
+        if _SESSION.get() is not None:
+            _SESSION.set(None)
             logger.debug("LangSmith session cleared")
     
+    def run_config(self) -> Optional[Dict[str, Any]]:
+        """Runnable config tagging a run with the current session, if one is set."""
+        session = current_session()
+        if not (self.enabled and session):
+            return None
+        return {"metadata": {"langsmith_session": session}}
+    
     def add_tags(self, **tags):
         """Add tags to the current trace context."""
         if self.enabled:
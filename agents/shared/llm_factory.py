@@ -2,7 +2,9 @@
 LLM Factory for creating model instances based on provider configuration.
 """
 
-from typing import Any
+import asyncio
+import threading
+from typing import Any, Dict
 import structlog
 from langchain_core.language_models.base import BaseLanguageModel
 
@@ -11,6 +13,124 @@ from .langsmith_tracing import setup_langsmith, LangSmithTracer, set_tracer
 
 logger = structlog.get_logger(__name__)
 
+# Agents built from the same (frozen, hashable) LLMConfig share one model instance,
+# and with it the provider SDK's HTTP connection pool
+_LLM_CACHE: Dict[LLMConfig, BaseLanguageModel] = {}
+_LLM_CACHE_LOCK = threading.Lock()
+
+# Keep provider connections alive across idle gaps between agent queries
+_KEEPALIVE_EXPIRY = 300
+_MAX_KEEPALIVE_CONNECTIONS = 64
+
+# The response cache is process-global in LangChain; configure it once
+_LLM_RESPONSE_CACHE_SET = False
+
+_OPENAI_MODELS = frozenset({
+    "gpt-3.5-turbo", "gpt-3.5-turbo-16k",
+    "gpt-4", "gpt-4-turbo", "gpt-4o",
+    "gpt-4-32k", "gpt-4-1106-preview"
+})
+
+_ANTHROPIC_MODELS = frozenset({
+    "claude-3-sonnet-20240229", "claude-3-opus-20240229",
+    "claude-3-haiku-20240307", "claude-2.1", "claude-2.0",
+    "claude-instant-1.2"
+})
+
+# provider -> (known models, accepted name prefix)
+_MODEL_RULES = {
+    "openai": (_OPENAI_MODELS, "gpt-"),
+    "anthropic": (_ANTHROPIC_MODELS, "claude-")
+}
+
+_DEFAULT_MODELS = {
+    "openai": "gpt-3.5-turbo",
+    "anthropic": "claude-3-sonnet-20240229"
+}
+
+def _per_loop_async_transport(limits: Any) -> Any:
+    """Build an httpx async transport that keeps a separate connection pool per event loop."""
+    import httpx
+    
+    class PerLoopAsyncTransport(httpx.AsyncBaseTransport):
+        # Pooled connections belong to the loop that opened them; a cached model is called
+        # from the background loop and from short-lived asyncio.run() loops alike
+        def __init__(self):
+            self._transports: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+            self._lock = threading.Lock()
+        
+        def _for_running_loop(self) -> httpx.AsyncHTTPTransport:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                transport = self._transports.get(loop)
+                if transport is None:
+                    # Pools of closed loops cannot be used or closed any more; let them go
+                    for closed in [other for other in self._transports if other.is_closed()]:
+                        del self._transports[closed]
+                    transport = self._transports[loop] = httpx.AsyncHTTPTransport(limits=limits)
+                return transport
+        
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            return await self._for_running_loop().handle_async_request(request)
+        
+        async def aclose(self) -> None:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+            if transport is not None:
+                await transport.aclose()
+    
+    return PerLoopAsyncTransport()
+
+# Chat model classes, imported on first use and reused for later builds
+_CHAT_OPENAI = None
+_CHAT_ANTHROPIC = None
+
+def _get_chat_openai() -> Any:
+    global _CHAT_OPENAI
+    if _CHAT_OPENAI is None:
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            raise ImportError(
+                "langchain-openai package is required for OpenAI models. "
+                "Install it with: pip install langchain-openai"
+            )
+        _CHAT_OPENAI = ChatOpenAI
+    return _CHAT_OPENAI
+
+def _get_chat_anthropic() -> Any:
+    global _CHAT_ANTHROPIC
+    if _CHAT_ANTHROPIC is None:
+        try:
+            from langchain_anthropic import ChatAnthropic
+        except ImportError:
+            raise ImportError(
+                "langchain-anthropic package is required for Anthropic models. "
+                "Install it with: pip install langchain-anthropic"
+            )
+        _CHAT_ANTHROPIC = ChatAnthropic
+    return _CHAT_ANTHROPIC
+
+def _configure_response_cache(config: LLMConfig) -> None:
+    """Install LangChain's global LLM response cache when LLM_CACHE asks for one."""
+    global _LLM_RESPONSE_CACHE_SET
+    backend = config.cache.lower()
+    if _LLM_RESPONSE_CACHE_SET or backend == "none":
+        return
+    
+    from langchain_core.globals import set_llm_cache
+    
+    if backend == "memory":
+        from langchain_core.caches import InMemoryCache
+        set_llm_cache(InMemoryCache())
+    elif backend == "sqlite":
+        from langchain_community.cache import SQLiteCache
+        set_llm_cache(SQLiteCache(database_path=config.cache_path))
+    else:
+        raise ValueError(f"Unsupported LLM cache: {config.cache}. Supported caches: 'none', 'memory', 'sqlite'")
+    
+    _LLM_RESPONSE_CACHE_SET = True
+    logger.info("LLM response cache enabled", backend=backend)
+
 class LLMFactory:
     """Factory for creating LLM instances based on provider configuration."""
     
@@ -37,48 +157,52 @@ class LLMFactory:
             if tracer.is_enabled():
                 logger.info("LangSmith tracing enabled for LLM", project=langsmith_config.project)
         
+        with _LLM_CACHE_LOCK:
+            _configure_response_cache(config)
+            llm = _LLM_CACHE.get(config)
+            if llm is None:
+                llm = _LLM_CACHE[config] = LLMFactory._create_llm_uncached(config)
+            return llm
+    
+    @staticmethod
+    def _create_llm_uncached(config: LLMConfig) -> BaseLanguageModel:
+        """Build a new LLM instance for the configured provider."""
         provider = config.provider.lower()
-        
-        if provider == "openai":
-            return LLMFactory._create_openai_llm(config)
-        elif provider == "anthropic":
-            return LLMFactory._create_anthropic_llm(config)
-        else:
+        builder = _BUILDERS.get(provider)
+        if builder is None:
             raise ValueError(f"Unsupported LLM provider: {provider}. Supported providers: 'openai', 'anthropic'")
+        return builder(config)
     
     @staticmethod
     def _create_openai_llm(config: LLMConfig) -> BaseLanguageModel:
         """Create OpenAI LLM instance."""
-        try:
-            from langchain_openai import ChatOpenAI
-        except ImportError:
-            raise ImportError(
-                "langchain-openai package is required for OpenAI models. "
-                "Install it with: pip install langchain-openai"
-            )
+        ChatOpenAI = _get_chat_openai()
+        # The OpenAI SDK depends on httpx, so it is present whenever ChatOpenAI is
+        import httpx
         
         if not config.openai_api_key:
             raise ValueError("OpenAI API key is required for OpenAI provider")
         
         logger.info("Creating OpenAI LLM", model=config.model_name, temperature=config.temperature)
         
+        limits = httpx.Limits(
+            max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY
+        )
+        
         return ChatOpenAI(
             model=config.model_name,
             temperature=config.temperature,
             max_tokens=config.max_tokens,
-            api_key=config.openai_api_key
+            api_key=config.openai_api_key,
+            http_client=httpx.Client(limits=limits),
+            http_async_client=httpx.AsyncClient(transport=_per_loop_async_transport(limits))
         )
     
     @staticmethod
     def _create_anthropic_llm(config: LLMConfig) -> BaseLanguageModel:
         """Create Anthropic LLM instance."""
-        try:
-            from langchain_anthropic import ChatAnthropic
-        except ImportError:
-            raise ImportError(
-                "langchain-anthropic package is required for Anthropic models. "
-                "Install it with: pip install langchain-anthropic"
-            )
+        ChatAnthropic = _get_chat_anthropic()
         
         if not config.anthropic_api_key:
             raise ValueError("Anthropic API key is required for Anthropic provider")
@@ -92,33 +216,37 @@ class LLMFactory:
             anthropic_api_key=config.anthropic_api_key
         )
     
+    @staticmethod
+    def system_prompt(text: str, config: LLMConfig) -> Any:
+        """
+        Wrap a static system prompt for the configured provider.
+        
+        Anthropic only caches a prompt prefix when it is explicitly marked, so the
+        prompt becomes a SystemMessage with an ephemeral cache_control block. OpenAI
+        caches long prefixes automatically and gets the plain string.
+        """
+        if config.provider.lower() != "anthropic":
+            return text
+        
+        from langchain_core.messages import SystemMessage
+        return SystemMessage(content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}])
+    
     @staticmethod
     def get_default_model_for_provider(provider: str) -> str:
         """Get the default model name for a given provider."""
-        defaults = {
-            "openai": "gpt-3.5-turbo",
-            "anthropic": "claude-3-sonnet-20240229"
-        }
-        return defaults.get(provider.lower(), "gpt-3.5-turbo")
+        return _DEFAULT_MODELS.get(provider.lower(), "gpt-3.5-turbo")
     
     @staticmethod
     def validate_model_for_provider(provider: str, model_name: str) -> bool:
         """Validate that a model name is appropriate for the given provider."""
-        openai_models = [
-            "gpt-3.5-turbo", "gpt-3.5-turbo-16k", 
-            "gpt-4", "gpt-4-turbo", "gpt-4o",
-            "gpt-4-32k", "gpt-4-1106-preview"
-        ]
-        
-        anthropic_models = [
-            "claude-3-sonnet-20240229", "claude-3-opus-20240229", 
-            "claude-3-haiku-20240307", "claude-2.1", "claude-2.0",
-            "claude-instant-1.2"
-        ]
-        
-        if provider.lower() == "openai":
-            return model_name in openai_models or model_name.startswith("gpt-")
-        elif provider.lower() == "anthropic":
-            return model_name in anthropic_models or model_name.startswith("claude-")
-        
-        return False
\ No newline at end of file
+        rule = _MODEL_RULES.get(provider.lower())
+        if rule is None:
+            return False
+        models, prefix = rule
+        return model_name in models or model_name.startswith(prefix)
+
+# Provider name -> builder; looked up once per create instead of an if/elif chain
+_BUILDERS = {
+    "openai": LLMFactory._create_openai_llm,
+    "anthropic": LLMFactory._create_anthropic_llm
+}
@@ -2,54 +2,103 @@
 MCP Client Manager for LangChain/LangGraph Agents
 
 This module provides a centralized MCP client management system for connecting
-to external Prometheus and Neo4j MCP servers.
+to external Prometheus and Neo4j MCP servers. Agents asking for the same servers
+share one reference-counted manager, and connections come from the shared
+MCPSessionPool.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Awaitable, Callable, FrozenSet, List, Optional, Tuple
 import structlog
-from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from . import event_loop
+from .mcp_pool import get_session_pool
 
 logger = structlog.get_logger(__name__)
 
+ManagerKey = FrozenSet[Tuple[str, str, str]]
+
+# Tool name prefixes agents filter on
+_TOOL_PREFIXES = ("prometheus", "neo4j")
+
+_MANAGERS: Dict[ManagerKey, "MCPClientManager"] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+def _server_config(prometheus_config: Dict[str, Any], neo4j_config: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    # Agents configure only the server they use; skip the empty one
+    return {
+        name: {"url": config["url"], "transport": config["transport"]}
+        for name, config in (("prometheus", prometheus_config), ("neo4j", neo4j_config))
+        if config
+    }
+
 class MCPClientManager:
     """Manages MCP client connections and tool retrieval."""
     
     def __init__(self, prometheus_config: Dict[str, Any], neo4j_config: Dict[str, Any]):
         self.prometheus_config = prometheus_config
         self.neo4j_config = neo4j_config
-        self._client: Optional[MultiServerMCPClient] = None
+        self.servers = _server_config(prometheus_config, neo4j_config)
+        self.key: ManagerKey = frozenset((name, s["url"], s["transport"]) for name, s in self.servers.items())
+        self._initialized = False
         self._tools: Optional[List[Any]] = None
+        self._tools_by_prefix: Dict[str, List[Any]] = {}
+        self._init_lock = asyncio.Lock()
+        # Agents holding this manager; guarded by _MANAGERS_LOCK
+        self._refs = 0
         
     async def initialize(self) -> None:
-        """Initialize the MCP client with server configurations."""
+        """Initialize pooled sessions for the configured MCP servers."""
+        await event_loop.run_async(self._locked(self._initialize))
+    
+    async def get_tools(self) -> List[Any]:
+        """Retrieve all available tools from MCP servers."""
+        if self._tools:
+            return self._tools
+        return await event_loop.run_async(self._locked(self._fetch_tools))
+    
+    async def _locked(self, step: Callable[[], Awaitable[Any]]) -> Any:
+        # Runs on the background loop, which owns the lock. Concurrent first callers
+        # wait here and then find the work already done.
+        async with self._init_lock:
+            return await step()
+    
+    async def _initialize(self) -> None:
+        if self._initialized:
+            return
         try:
-            server_config = {
-                "prometheus": {
-                    "url": self.prometheus_config["url"],
-                    "transport": self.prometheus_config["transport"],
-                },
-                "neo4j": {
-                    "url": self.neo4j_config["url"], 
-                    "transport": self.neo4j_config["transport"],
-                }
-            }
+            # Handshakes with different servers are independent; overlap them
+            pool = get_session_pool()
+            await asyncio.gather(*(
+                pool.acquire(server["url"], server["transport"]) for server in self.servers.values()
+            ))
             
-            self._client = MultiServerMCPClient(server_config)
-            logger.info("MCP client initialized", servers=list(server_config.keys()))
+            self._initialized = True
+            logger.info("MCP client initialized", servers=list(self.servers.keys()))
             
         except Exception as e:
             logger.error("Failed to initialize MCP client", error=str(e))
             raise
     
-    async def get_tools(self) -> List[Any]:
-        """Retrieve all available tools from MCP servers."""
-        if not self._client:
-            await self.initialize()
-            
+    async def _fetch_tools(self) -> List[Any]:
+        await self._initialize()
+        
         try:
             if not self._tools:
-                self._tools = await self._client.get_tools()
+                pool = get_session_pool()
+                per_server = await asyncio.gather(*(
+                    pool.get_tools(server["url"], server["transport"]) for server in self.servers.values()
+                ))
+                tools = [tool for tools in per_server for tool in tools]
+                # Bucket once so the per-server getters don't re-filter on every call
+                by_prefix: Dict[str, List[Any]] = {prefix: [] for prefix in _TOOL_PREFIXES}
+                for tool in tools:
+                    for prefix in _TOOL_PREFIXES:
+                        if tool.name.startswith(prefix):
+                            by_prefix[prefix].append(tool)
+                self._tools_by_prefix = by_prefix
+                self._tools = tools
                 logger.info("Retrieved tools from MCP servers", tool_count=len(self._tools))
             
             return self._tools
@@ -60,30 +109,40 @@ class MCPClientManager:
     
     async def get_prometheus_tools(self) -> List[Any]:
         """Get tools specifically for Prometheus MCP server."""
-        all_tools = await self.get_tools()
-        prometheus_tools = [tool for tool in all_tools if tool.name.startswith("prometheus")]
+        await self.get_tools()
+        prometheus_tools = self._tools_by_prefix.get("prometheus", [])
         logger.info("Filtered Prometheus tools", tool_count=len(prometheus_tools))
         return prometheus_tools
     
     async def get_neo4j_tools(self) -> List[Any]:
         """Get tools specifically for Neo4j MCP server."""
-        all_tools = await self.get_tools()
-        neo4j_tools = [tool for tool in all_tools if tool.name.startswith("neo4j")]
+        await self.get_tools()
+        neo4j_tools = self._tools_by_prefix.get("neo4j", [])
         logger.info("Filtered Neo4j tools", tool_count=len(neo4j_tools))
         return neo4j_tools
     
     async def close(self) -> None:
-        """Close the MCP client connection."""
-        if self._client:
-            try:
-                await self._client.close()
-                logger.info("MCP client closed")
-            except Exception as e:
-                logger.error("Error closing MCP client", error=str(e))
-            finally:
-                self._client = None
-                self._tools = None
+        """Drop one agent's reference; the last one closes the pooled server sessions."""
+        with _MANAGERS_LOCK:
+            if self._refs > 0:
+                self._refs -= 1
+            if self._refs > 0:
+                return
+            if _MANAGERS.get(self.key) is self:
+                del _MANAGERS[self.key]
+        
+        pool = get_session_pool()
+        for server in self.servers.values():
+            await pool.invalidate(server["url"], server["transport"])
+        self._initialized = False
+        self._tools = None
+        self._tools_by_prefix = {}
+        logger.info("MCP client closed", servers=list(self.servers.keys()))
 
 def create_mcp_client(prometheus_config: Dict[str, Any], neo4j_config: Dict[str, Any]) -> MCPClientManager:
-    """Factory function to create MCP client manager."""
-    return MCPClientManager(prometheus_config, neo4j_config)
\ No newline at end of file
+    """Get the shared MCP client manager for these servers; each call takes a reference released by close()."""
+    candidate = MCPClientManager(prometheus_config, neo4j_config)
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.setdefault(candidate.key, candidate)
+        manager._refs += 1
+        return manager
@@ -0,0 +1,197 @@
+"""
+MCP Session Pool
+
+Process-wide pool of long-lived MCP client sessions keyed by server (url, transport).
+Sessions are opened lazily on the shared background event loop and reused by every
+agent instance, so a tool call no longer pays the HTTP + initialize handshake.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import anyio
+import httpx
+import structlog
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+from . import event_loop
+
+logger = structlog.get_logger(__name__)
+
+# Sessions are recycled after this long, even if healthy
+DEFAULT_SESSION_TTL = 600
+
+ServerKey = Tuple[str, str]
+
+# Raised when the session's transport is gone, as opposed to the tool itself failing
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    httpx.TransportError
+)
+
+def _is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, _TRANSPORT_ERRORS)
+
+class _PooledSession:
+    """An initialized ClientSession held open by a dedicated task on the background loop."""
+    
+    def __init__(self, key: ServerKey):
+        self.key = key
+        self.session = None
+        self.tools: List[Any] = []
+        self.created_at = time.monotonic()
+        # In-flight tool calls; a retired session is closed once the last one returns
+        self.users = 0
+        self.retired = False
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def open(self) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        # The transport's task groups must be entered and exited by the same task
+        self._task = asyncio.create_task(self._hold(ready))
+        await ready
+        try:
+            self.tools = await load_mcp_tools(self.session)
+        except Exception:
+            await self.close()
+            raise
+    
+    async def _hold(self, ready: asyncio.Future) -> None:
+        url, transport = self.key
+        try:
+            async with create_session({"url": url, "transport": transport}) as session:
+                await session.initialize()
+                self.session = session
+                ready.set_result(None)
+                await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP session ended unexpectedly", url=url, error=str(e))
+        finally:
+            self.session = None
+    
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and not self._task.done()
+    
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception as e:
+                logger.error("Error closing MCP session", url=self.key[0], error=str(e))
+
+class MCPSessionPool:
+    """Shares one MCP session, and the tools bound to it, per server across the process."""
+    
+    def __init__(self, ttl: float = DEFAULT_SESSION_TTL):
+        self.ttl = ttl
+        self._entries: Dict[ServerKey, _PooledSession] = {}
+        self._locks: Dict[ServerKey, asyncio.Lock] = {}
+    
+    async def acquire(self, url: str, transport: str) -> _PooledSession:
+        """Return a live session for the server, opening or replacing it as needed."""
+        return await event_loop.run_async(self._acquire((url, transport)))
+    
+    async def get_tools(self, url: str, transport: str) -> List[Any]:
+        """
+        Get the server's tools as pooled proxies.
+        
+        Each call is dispatched to the tool bound to the current session, so the
+        proxies keep working after the session is recycled or re-established.
+        """
+        entry = await self.acquire(url, transport)
+        return [self._proxy(entry.key, tool) for tool in entry.tools]
+    
+    async def invalidate(self, url: str, transport: str) -> None:
+        """Close the server's session; the next acquire() reconnects."""
+        await event_loop.run_async(self._invalidate((url, transport)))
+    
+    async def close_all(self) -> None:
+        for key in list(self._entries):
+            await event_loop.run_async(self._invalidate(key))
+    
+    async def _acquire(self, key: ServerKey) -> _PooledSession:
+        # Runs on the background loop, which owns the sessions and their locks
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.alive and time.monotonic() - entry.created_at < self.ttl:
+                return entry
+            
+            if entry is not None:
+                await self._retire(entry)
+            entry = _PooledSession(key)
+            await entry.open()
+            self._entries[key] = entry
+            logger.info("MCP session opened", url=key[0], transport=key[1], tool_count=len(entry.tools))
+            return entry
+    
+    async def _invalidate(self, key: ServerKey, stale: Optional[_PooledSession] = None) -> None:
+        """Retire the server's session, or only `stale` if it is still the pooled one."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is None or (stale is not None and entry is not stale):
+                return
+            del self._entries[key]
+            await self._retire(entry)
+    
+    async def _retire(self, entry: _PooledSession) -> None:
+        entry.retired = True
+        if entry.users == 0:
+            await entry.close()
+    
+    async def _release(self, entry: _PooledSession) -> None:
+        entry.users -= 1
+        if entry.retired and entry.users == 0:
+            await entry.close()
+    
+    async def _call_tool(self, key: ServerKey, name: str, kwargs: Dict[str, Any]) -> Any:
+        for attempt in range(2):
+            entry = await self._acquire(key)
+            bound = next((t for t in entry.tools if t.name == name), None)
+            if bound is None:
+                raise ValueError(f"MCP tool no longer available: {name}")
+            entry.users += 1
+            try:
+                return await bound.coroutine(**kwargs)
+            except Exception as e:
+                # Tool errors are the caller's; only a dropped connection is worth a reconnect
+                if attempt or not _is_connection_error(e):
+                    raise
+                logger.warning("MCP connection lost, re-establishing session", tool=name, error=str(e))
+                await self._invalidate(key, entry)
+            finally:
+                await self._release(entry)
+    
+    def _proxy(self, key: ServerKey, tool: Any) -> Any:
+        name = tool.name
+        
+        async def call_pooled(**kwargs: Any) -> Any:
+            return await event_loop.run_async(self._call_tool(key, name, kwargs))
+        
+        proxy = tool.model_copy()
+        proxy.coroutine = call_pooled
+        return event_loop.with_sync_entry(proxy)
+
+_POOL: Optional[MCPSessionPool] = None
+
+def get_session_pool() -> MCPSessionPool:
+    """Get the process-wide MCP session pool."""
+    global _POOL
+    if _POOL is None:
+        _POOL = MCPSessionPool()
+    return _POOL
@@ -1,15 +1,22 @@
 import os
+import re
+import inspect
 import hashlib
 import hmac
 from typing import Dict, Any, Optional
-from functools import wraps
+from functools import lru_cache, wraps
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 class SecurityManager:
+    # Deletion table for sanitize_input; str.translate strips every character in one pass
+    _SANITIZE_TABLE = str.maketrans("", "", "<>&|;`$()")
+    
     def __init__(self, secret_key: Optional[str] = None):
         self.secret_key = secret_key or os.getenv("AGENT_SECRET_KEY", "default-secret")
+        self.secret_key_bytes = self.secret_key.encode()
         self.allowed_actions = set()
         self.blocked_patterns = [
             "rm -rf",
@@ -18,53 +25,83 @@ class SecurityManager:
             "shutdown",
             "reboot"
         ]
+        # One case-insensitive alternation scans the command once for every pattern
+        self._blocklist_re = re.compile("|".join(map(re.escape, self.blocked_patterns)), re.IGNORECASE)
     
     def add_allowed_action(self, action: str):
         self.allowed_actions.add(action)
     
     def validate_command(self, command: str) -> bool:
-        for pattern in self.blocked_patterns:
-            if pattern.lower() in command.lower():
-                logger.warning("Blocked potentially dangerous command", command=command, pattern=pattern)
-                return False
+        match = self._blocklist_re.search(command)
+        if match is not None:
+            logger.warning("Blocked potentially dangerous command", command=command, pattern=match.group(0))
+            return False
         return True
     
     def sanitize_input(self, input_data: str) -> str:
-        dangerous_chars = ["<", ">", "&", "|", ";", "`", "$", "(", ")"]
-        sanitized = input_data
-        for char in dangerous_chars:
-            sanitized = sanitized.replace(char, "")
-        return sanitized
+        return input_data.translate(self._SANITIZE_TABLE)
     
     def generate_audit_hash(self, data: Dict[str, Any]) -> str:
-        serialized = str(sorted(data.items()))
+        # Canonical JSON: keys sorted at every nesting level, emitted straight as bytes
+        serialized = orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
         return hmac.new(
-            self.secret_key.encode(),
-            serialized.encode(),
+            self.secret_key_bytes,
+            serialized,
             hashlib.sha256
         ).hexdigest()
 
+@lru_cache(maxsize=1)
+def _default_security_manager() -> SecurityManager:
+    """Process-wide SecurityManager, so the blocklist regex is compiled once."""
+    return SecurityManager()
+
+def _check_command(kwargs: Dict[str, Any]) -> None:
+    if "command" in kwargs:
+        if not _default_security_manager().validate_command(kwargs["command"]):
+            raise PermissionError("Command blocked by security policy")
+
 def require_security_check(func):
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            _check_command(kwargs)
+            return await func(*args, **kwargs)
+        return async_wrapper
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        security_manager = SecurityManager()
-        if "command" in kwargs:
-            if not security_manager.validate_command(kwargs["command"]):
-                raise PermissionError("Command blocked by security policy")
+        _check_command(kwargs)
         return func(*args, **kwargs)
     return wrapper
 
 def audit_log(action: str):
     def decorator(func):
+        # A lazy proxy carrying the context: it resolves on the first logged call, after
+        # structlog is configured, and is cached from then on (cache_logger_on_first_use)
+        bound = structlog.get_logger(__name__, action=action, function=func.__name__)
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                bound.info("Agent action started")
+                try:
+                    result = await func(*args, **kwargs)
+                    bound.info("Agent action completed")
+                    return result
+                except Exception as e:
+                    bound.error("Agent action failed", error=str(e))
+                    raise
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            logger.info("Agent action started", action=action, function=func.__name__)
+            bound.info("Agent action started")
             try:
                 result = func(*args, **kwargs)
-                logger.info("Agent action completed", action=action, function=func.__name__)
+                bound.info("Agent action completed")
                 return result
             except Exception as e:
-                logger.error("Agent action failed", action=action, function=func.__name__, error=str(e))
+                bound.error("Agent action failed", error=str(e))
                 raise
         return wrapper
     return decorator
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+JSON Serialization Helpers
+
+Thin wrappers around orjson used for tool payloads and other hot-path JSON.
+"""
+
+from typing import Any, Callable, Optional
+import orjson
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = str, option: int = 0) -> str:
+    """
+    Serialize an object to a JSON string.
+    
+    Datetimes, UUIDs and dataclasses are handled natively; any other
+    unsupported type is passed through ``default``.
+    """
+    return orjson.dumps(obj, default=default, option=option | orjson.OPT_NON_STR_KEYS).decode()
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from str or bytes."""
+    return orjson.loads(data)
@@ -0,0 +1,84 @@
+"""
+Lazy Tool Registry
+
+Keeps large tool sets out of the model's context. The model sees a one-line
+summary per tool plus two small meta tools: one returns a tool's full argument
+schema on demand, the other invokes a tool by name. Full schemas are only paid
+for when the model actually selects a tool.
+"""
+
+from typing import Any, Dict, List
+import structlog
+from langchain_core.tools import StructuredTool
+
+from .serialization import dumps, loads
+
+logger = structlog.get_logger(__name__)
+
+# Below this many tools, binding the full schemas directly is cheap enough
+LAZY_SCHEMA_THRESHOLD = 12
+
+class LazyToolRegistry:
+    """Out-of-context registry of tools exposed through describe/invoke meta tools."""
+    
+    def __init__(self, tools: List[Any]):
+        self._tools: Dict[str, Any] = {t.name: t for t in tools}
+        self._schemas: Dict[str, str] = {}
+    
+    def summaries(self) -> str:
+        """One line per tool: its name and the first line of its description."""
+        lines = []
+        for name, tool in self._tools.items():
+            description = (tool.description or "").strip()
+            lines.append(f"- {name}: {description.splitlines()[0] if description else ''}")
+        return "\n".join(lines)
+    
+    def promote_schema(self, tool_name: str) -> str:
+        """Serialize a tool's full schema, once per tool."""
+        schema = self._schemas.get(tool_name)
+        if schema is None:
+            tool = self._tools[tool_name]
+            schema = self._schemas[tool_name] = dumps({
+                "name": tool_name,
+                "description": tool.description,
+                "parameters": tool.tool_call_schema.model_json_schema()
+            })
+        return schema
+    
+    def _lookup(self, tool_name: str, arguments: str):
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            return None, dumps({"status": "error", "error": f"Unknown tool: {tool_name}"})
+        try:
+            return tool, loads(arguments) if arguments else {}
+        except ValueError:
+            return None, dumps({"status": "error", "error": "Invalid JSON arguments"})
+    
+    def as_tools(self) -> List[Any]:
+        """The meta tools to bind to the model in place of the registered tools."""
+        
+        def describe_tool(tool_name: str) -> str:
+            """Return the full description and JSON argument schema of a tool listed in the tool catalog."""
+            if tool_name not in self._tools:
+                return dumps({"status": "error", "error": f"Unknown tool: {tool_name}"})
+            return self.promote_schema(tool_name)
+        
+        def invoke_tool(tool_name: str, arguments: str = None) -> str:
+            """Invoke a catalog tool by name. arguments is a JSON object matching the schema from describe_tool."""
+            tool, args = self._lookup(tool_name, arguments)
+            if tool is None:
+                return args
+            logger.debug("Invoking catalog tool", tool=tool_name)
+            return tool.invoke(args)
+        
+        async def ainvoke_tool(tool_name: str, arguments: str = None) -> str:
+            tool, args = self._lookup(tool_name, arguments)
+            if tool is None:
+                return args
+            logger.debug("Invoking catalog tool", tool=tool_name)
+            return await tool.ainvoke(args)
+        
+        return [
+            StructuredTool.from_function(func=describe_tool),
+            StructuredTool.from_function(func=invoke_tool, coroutine=ainvoke_tool)
+        ]
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Agent modules import each other as top-level packages (shared, config, ...)
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if AGENTS_DIR not in sys.path:
+    sys.path.insert(0, AGENTS_DIR)
@@ -0,0 +1,24 @@
+"""
+Tests for AgentManager lifecycle.
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+import main
+from shared import event_loop
+
+def test_background_loop_runs_blocking_work_after_cleanup():
+    with mock.patch.object(main.AgentManager, "_initialize_agents"), \
+            mock.patch.object(main.AgentManager, "_prefetch_mcp_tools", new=mock.AsyncMock()):
+        manager = main.AgentManager()
+    manager.cleanup()
+    
+    async def blocking_call():
+        return await asyncio.to_thread(lambda: "done")
+    
+    assert event_loop.run_sync(blocking_call(), timeout=5) == "done"
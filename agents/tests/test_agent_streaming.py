@@ -0,0 +1,142 @@
+"""
+Streaming tests for the catalogued agents.
+
+Each agent is built with a fake chat model and no tools, then streamed through
+BaseAgent.astream, so every agent in AGENT_CATALOG is exercised on the same path
+AgentManager.astream_agent takes.
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from main import AGENT_CATALOG
+from shared.base_agent import AgentConfig
+from shared.llm_factory import LLMFactory
+
+RESPONSE = "all systems nominal"
+
+class _FakeChatModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+def _fake_model(*args, **kwargs):
+    return _FakeChatModel(messages=iter([AIMessage(content=RESPONSE)] * 4))
+
+def _agent_config(name: str) -> AgentConfig:
+    return AgentConfig(name=name, system_prompt="test")
+
+def _prometheus_agent():
+    from prometheus.agent import PrometheusAgent
+    from prometheus.tools import PrometheusConfig
+    
+    agent = PrometheusAgent(_agent_config("prometheus_agent"), PrometheusConfig(base_url="http://prometheus.invalid"))
+    agent._aload_tools = mock.AsyncMock(return_value=[])
+    return agent
+
+def _neo4j_agent():
+    from neo4j_agent.agent import Neo4jAgent
+    from neo4j_agent.tools import Neo4jConfig
+    
+    neo4j_config = Neo4jConfig(uri="bolt://neo4j.invalid:7687", username="neo4j", password="test")
+    agent = Neo4jAgent(_agent_config("neo4j_agent"), neo4j_config)
+    agent._aload_tools = mock.AsyncMock(return_value=[])
+    return agent
+
+def _infrastructure_agent():
+    from infrastructure import agent as infrastructure_agent
+    from infrastructure.tools import AWSConfig, TerraformConfig
+    
+    with mock.patch.object(infrastructure_agent, "InfrastructureTools"), \
+            mock.patch.object(infrastructure_agent.InfrastructureAgent, "create_tools", return_value=[]):
+        return infrastructure_agent.InfrastructureAgent(
+            _agent_config("infrastructure_agent"),
+            AWSConfig(),
+            TerraformConfig(working_directory="/tmp")
+        )
+
+_BUILDERS = {
+    "prometheus": _prometheus_agent,
+    "neo4j": _neo4j_agent,
+    "infrastructure": _infrastructure_agent
+}
+
+async def _collect(stream):
+    return [text async for text in stream]
+
+def test_builders_cover_catalog():
+    assert set(_BUILDERS) == set(AGENT_CATALOG["agents"])
+
+@pytest.mark.parametrize("name", sorted(AGENT_CATALOG["agents"]))
+def test_agent_streams_response(name):
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _BUILDERS[name]()
+    
+    chunks = asyncio.run(_collect(agent.astream("status?", {})))
+    
+    assert "".join(chunks) == RESPONSE
+
+def test_infrastructure_stream_discards_one_off_thread():
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _infrastructure_agent()
+    
+    asyncio.run(_collect(agent.astream("status?")))
+    
+    assert not agent._checkpointer.storage
+
+def test_infrastructure_ignores_caller_chosen_thread():
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _infrastructure_agent()
+    
+    result = asyncio.run(agent.arun("status?", {"thread_id": "ops-1"}))
+    
+    assert result["thread_id"] != "ops-1"
+    assert set(agent._checkpointer.storage) == {result["thread_id"]}
+
+def test_infrastructure_resumes_issued_thread():
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _infrastructure_agent()
+    
+    first = asyncio.run(agent.arun("status?"))
+    second = asyncio.run(agent.arun("and now?", {"thread_id": first["thread_id"]}))
+    
+    assert second["thread_id"] == first["thread_id"]
+    state = agent._graph.get_state({"configurable": {"thread_id": first["thread_id"]}})
+    assert [m.content for m in state.values["messages"] if m.type == "human"] == ["status?", "and now?"]
+
+def test_infrastructure_evicts_least_recent_thread():
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _infrastructure_agent()
+    agent._MAX_THREADS = 1
+    
+    first = asyncio.run(agent.arun("status?"))
+    second = asyncio.run(agent.arun("status?"))
+    
+    assert set(agent._checkpointer.storage) == {second["thread_id"]}
+    assert asyncio.run(agent.arun("status?", {"thread_id": first["thread_id"]}))["thread_id"] != first["thread_id"]
+
+def test_neo4j_concurrent_tool_loads_share_one_client():
+    from neo4j_agent import tools as neo4j_tools
+    
+    with mock.patch.object(LLMFactory, "create_llm", side_effect=_fake_model):
+        agent = _neo4j_agent()
+    
+    async def fallback_tools():
+        await asyncio.sleep(0)
+        return agent._create_fallback_tools()
+    
+    async def load_twice():
+        await asyncio.gather(agent._aget_graph(), agent._aget_graph())
+    
+    agent._aload_tools = fallback_tools
+    with mock.patch.object(neo4j_tools, "AsyncNeo4jTools") as client_class:
+        asyncio.run(load_twice())
+    
+    client_class.assert_called_once()
+    assert agent.neo4j_tools is client_class.return_value
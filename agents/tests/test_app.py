@@ -0,0 +1,35 @@
+"""
+Tests for the Flask web interface.
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("flask")
+
+import app as webapp
+from shared import event_loop
+
+class _RecordingManager:
+    def __init__(self):
+        self.loops = []
+    
+    async def arun_agent(self, agent_name, query, context=None):
+        self.loops.append(asyncio.get_running_loop())
+        return {"status": "success", "response": f"{agent_name}: {query}"}
+
+def test_api_query_runs_agents_on_the_background_loop():
+    manager = _RecordingManager()
+    client = webapp.app.test_client()
+    
+    with mock.patch.object(webapp, "get_agent_manager", return_value=manager):
+        responses = [
+            client.post("/api/query", json={"agent": "prometheus", "query": "status?"})
+            for _ in range(2)
+        ]
+    
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].get_json()["response"] == "prometheus: status?"
+    assert manager.loops == [event_loop.get_background_loop()] * 2
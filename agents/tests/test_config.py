@@ -0,0 +1,29 @@
+"""
+Tests for the lazily built global configuration.
+"""
+
+from unittest import mock
+
+import pytest
+
+from config import settings
+
+@pytest.fixture
+def fresh_config(monkeypatch):
+    monkeypatch.setattr(settings, "config", None)
+
+def test_get_config_builds_one_shared_instance(fresh_config):
+    with mock.patch.object(settings, "GlobalConfig", wraps=settings.GlobalConfig) as global_config:
+        first = settings.get_config()
+        second = settings.get_config()
+    
+    assert first is second
+    assert global_config.call_count == 1
+
+def test_reload_config_replaces_the_shared_instance(fresh_config):
+    original = settings.get_config()
+    
+    reloaded = settings.reload_config()
+    
+    assert reloaded is not original
+    assert settings.get_config() is reloaded
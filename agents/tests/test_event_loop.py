@@ -0,0 +1,30 @@
+"""
+Tests for the shared background loop's blocking I/O pool.
+"""
+
+import threading
+
+import pytest
+
+from shared import event_loop
+
+@pytest.fixture
+def small_io_pool(monkeypatch):
+    event_loop.shutdown_io_pool()
+    monkeypatch.setattr(event_loop, "IO_POOL_SIZE", 2)
+    yield
+    event_loop.shutdown_io_pool()
+
+def test_map_blocking_keeps_item_order(small_io_pool):
+    assert event_loop.map_blocking(lambda n: n * n, range(6)) == [0, 1, 4, 9, 16, 25]
+
+def test_nested_map_blocking_does_not_deadlock_saturated_pool(small_io_pool):
+    def outer(i):
+        return sum(event_loop.map_blocking(lambda j: i * 10 + j, range(3)))
+    
+    results = []
+    caller = threading.Thread(target=lambda: results.append(event_loop.map_blocking(outer, range(4))), daemon=True)
+    caller.start()
+    caller.join(timeout=10)
+    
+    assert results == [[3, 33, 63, 93]]
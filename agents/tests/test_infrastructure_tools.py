@@ -0,0 +1,90 @@
+"""
+Tests for InfrastructureTools listings, with boto3 clients replaced by mocks.
+"""
+
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from infrastructure.tools import AWSConfig, InfrastructureTools, TerraformConfig
+
+INSTANCE = {
+    "InstanceId": "i-0123456789",
+    "InstanceType": "t3.micro",
+    "State": {"Name": "running"},
+    "PrivateIpAddress": "10.0.0.5",
+    "Tags": [{"Key": "Name", "Value": "web"}]
+}
+
+@pytest.fixture
+def infrastructure_tools(tmp_path):
+    terraform_config = TerraformConfig(working_directory=str(tmp_path), plugin_cache_dir=str(tmp_path / "plugins"))
+    infrastructure_tools = InfrastructureTools(AWSConfig(), terraform_config)
+    with mock.patch.object(infrastructure_tools, "_aws_ready", return_value=True):
+        yield infrastructure_tools
+
+def _regional_clients(failing_region):
+    def client(service, region=None):
+        ec2 = mock.Mock()
+        if region == failing_region:
+            ec2.get_paginator.return_value.paginate.side_effect = ConnectionError("endpoint unreachable")
+        else:
+            ec2.get_paginator.return_value.paginate.return_value = [{"Reservations": [{"Instances": [INSTANCE]}]}]
+        return ec2
+    return client
+
+def test_region_sweep_with_failed_region_is_not_cached(infrastructure_tools):
+    with mock.patch.object(infrastructure_tools, "_client", side_effect=_regional_clients("eu-west-1")) as client:
+        first = infrastructure_tools.list_ec2_instances_by_region(["us-east-1", "eu-west-1"])
+        second = infrastructure_tools.list_ec2_instances_by_region(["us-east-1", "eu-west-1"])
+    
+    assert first["regions"]["eu-west-1"]["status"] == "error"
+    assert first["regions"]["us-east-1"]["instances"][0]["tags"] == {"Name": "web"}
+    assert client.call_count == 4
+
+def test_complete_region_sweep_is_cached(infrastructure_tools):
+    with mock.patch.object(infrastructure_tools, "_client", side_effect=_regional_clients(None)) as client:
+        first = infrastructure_tools.list_ec2_instances_by_region(["us-east-1", "eu-west-1"])
+        second = infrastructure_tools.list_ec2_instances_by_region(["us-east-1", "eu-west-1"])
+    
+    assert first["instance_count"] == 2
+    assert second == first
+    assert client.call_count == 2
+
+def _stack_pages(*pages):
+    """A list_stacks mock serving the given pages of stack names, chained by NextToken."""
+    responses = {}
+    for index, names in enumerate(pages):
+        response = {"StackSummaries": [
+            {"StackName": name, "StackStatus": "CREATE_COMPLETE", "CreationTime": datetime(2024, 1, 1)}
+            for name in names
+        ]}
+        if index + 1 < len(pages):
+            response["NextToken"] = f"page-{index + 1}"
+        responses[f"page-{index}" if index else None] = response
+    
+    cloudformation = mock.Mock()
+    cloudformation.list_stacks.side_effect = lambda **kwargs: responses[kwargs.get("NextToken")]
+    return cloudformation
+
+def test_cloudformation_pages_resume_where_the_last_call_stopped(infrastructure_tools):
+    cloudformation = _stack_pages(["s1", "s2", "s3", "s4", "s5"], ["s6", "s7", "s8"])
+    seen, next_token = [], None
+    with mock.patch.object(infrastructure_tools, "_client", return_value=cloudformation):
+        while True:
+            result = infrastructure_tools.list_cloudformation_stacks(max_results=3, next_token=next_token)
+            assert result["status"] == "success"
+            seen.append([stack["stack_name"] for stack in result["stacks"]])
+            next_token = result["next_token"]
+            if next_token is None:
+                break
+    
+    assert seen == [["s1", "s2", "s3"], ["s4", "s5", "s6"], ["s7", "s8"]]
+    assert not result["truncated"]
+
+def test_cloudformation_rejects_foreign_tokens(infrastructure_tools):
+    with mock.patch.object(infrastructure_tools, "_client", return_value=_stack_pages(["s1"])):
+        result = infrastructure_tools.list_cloudformation_stacks(next_token="not-a-token")
+    
+    assert result["status"] == "error"
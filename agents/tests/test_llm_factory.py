@@ -0,0 +1,62 @@
+"""
+Tests for LLMFactory model construction.
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from config.settings import LLMConfig
+from shared.llm_factory import LLMFactory
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "pong"},
+        "finish_reason": "stop"
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the connection open, so the client pools it between calls
+    protocol_version = "HTTP/1.1"
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def completion_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    yield
+    server.shutdown()
+    server.server_close()
+
+def test_openai_model_serves_async_calls_from_separate_event_loops(completion_server):
+    llm = LLMFactory._create_openai_llm(LLMConfig(provider="openai", model_name="gpt-4o", openai_api_key="test"))
+    
+    first = asyncio.run(llm.ainvoke("ping"))
+    second = asyncio.run(llm.ainvoke("ping"))
+    
+    assert first.content == second.content == "pong"
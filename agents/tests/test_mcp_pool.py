@@ -0,0 +1,127 @@
+"""
+Tests for MCPSessionPool reconnects and deferred session closing.
+
+_PooledSession is replaced with an in-memory session whose single "echo" tool
+runs a coroutine supplied by each test.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("langchain_mcp_adapters")
+
+import anyio
+
+from shared import mcp_pool
+
+KEY = ("http://mcp.invalid/mcp", "streamable_http")
+
+class _FakeSession:
+    def __init__(self, key, behaviour):
+        self.key = key
+        self.users = 0
+        self.retired = False
+        self.closed = False
+        self.created_at = time.monotonic()
+        self.tools = [SimpleNamespace(name="echo", coroutine=behaviour)]
+    
+    async def open(self):
+        pass
+    
+    @property
+    def alive(self):
+        return not self.closed
+    
+    async def close(self):
+        self.closed = True
+
+def _pool(behaviour, ttl=mcp_pool.DEFAULT_SESSION_TTL):
+    sessions = []
+    
+    def open_session(key):
+        session = _FakeSession(key, behaviour)
+        sessions.append(session)
+        return session
+    
+    pool = mcp_pool.MCPSessionPool(ttl=ttl)
+    patcher = mock.patch.object(mcp_pool, "_PooledSession", side_effect=open_session)
+    return pool, sessions, patcher
+
+def test_reconnects_once_after_connection_loss():
+    calls = []
+    
+    async def echo(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise anyio.ClosedResourceError()
+        return "pong"
+    
+    pool, sessions, patcher = _pool(echo)
+    with patcher:
+        assert asyncio.run(pool._call_tool(KEY, "echo", {"text": "ping"})) == "pong"
+    
+    assert len(calls) == 2
+    assert len(sessions) == 2
+    assert sessions[0].closed and not sessions[1].closed
+
+def test_tool_error_is_raised_without_reconnecting():
+    async def echo(**kwargs):
+        raise ValueError("bad argument")
+    
+    pool, sessions, patcher = _pool(echo)
+    with patcher, pytest.raises(ValueError, match="bad argument"):
+        asyncio.run(pool._call_tool(KEY, "echo", {}))
+    
+    assert len(sessions) == 1
+    assert not sessions[0].closed
+    assert pool._entries[KEY] is sessions[0]
+
+def test_invalidate_waits_for_in_flight_calls():
+    async def scenario():
+        started, finish = asyncio.Event(), asyncio.Event()
+        
+        async def echo(**kwargs):
+            started.set()
+            await finish.wait()
+            return "pong"
+        
+        pool, sessions, patcher = _pool(echo)
+        with patcher:
+            call = asyncio.create_task(pool._call_tool(KEY, "echo", {}))
+            await started.wait()
+            await pool._invalidate(KEY)
+            assert not sessions[0].closed
+            
+            finish.set()
+            assert await call == "pong"
+        assert sessions[0].closed
+    
+    asyncio.run(scenario())
+
+def test_ttl_recycle_waits_for_in_flight_calls():
+    async def scenario():
+        started, finish = asyncio.Event(), asyncio.Event()
+        
+        async def echo(**kwargs):
+            started.set()
+            await finish.wait()
+            return "pong"
+        
+        pool, sessions, patcher = _pool(echo, ttl=0)
+        with patcher:
+            call = asyncio.create_task(pool._call_tool(KEY, "echo", {}))
+            await started.wait()
+            replacement = await pool._acquire(KEY)
+            assert replacement is sessions[1]
+            assert not sessions[0].closed
+            
+            finish.set()
+            await call
+        assert sessions[0].closed
+        assert not sessions[1].closed
+    
+    asyncio.run(scenario())
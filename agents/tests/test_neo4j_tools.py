@@ -0,0 +1,154 @@
+"""
+Tests for Neo4jTools and AsyncNeo4jTools that do not need a running database.
+
+The drivers connect lazily, so the tools can be constructed against an unreachable
+URI; query execution is stubbed at the driver-call seam.
+"""
+
+import asyncio
+from contextlib import nullcontext
+from unittest import mock
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+from tenacity import wait_none
+
+from neo4j_agent import tools
+from neo4j_agent.tools import AsyncNeo4jTools, Neo4jConfig, Neo4jTools
+
+def _config(**overrides):
+    return Neo4jConfig(uri="bolt://neo4j.invalid:7687", username="neo4j", password="test", **overrides)
+
+@pytest.fixture
+def async_tools():
+    neo4j_tools = AsyncNeo4jTools(_config())
+    yield neo4j_tools
+    neo4j_tools.driver.close()
+
+def test_async_query_retries_lost_connection(async_tools):
+    aread = mock.AsyncMock(side_effect=[ServiceUnavailable("connection lost"), [{"n": 1}]])
+    with mock.patch.object(async_tools, "_aread", aread), \
+            mock.patch.object(tools, "wait_exponential", lambda **kwargs: wait_none()):
+        result = asyncio.run(async_tools.aexecute_cypher("MATCH (n) RETURN count(n) AS n"))
+    
+    assert result["status"] == "success"
+    assert result["data"] == [{"n": 1}]
+    assert aread.await_count == 2
+
+def test_async_query_does_not_retry_query_errors(async_tools):
+    aread = mock.AsyncMock(side_effect=ValueError("bad query"))
+    with mock.patch.object(async_tools, "_aread", aread):
+        result = asyncio.run(async_tools.aexecute_cypher("MATCH (n) RETURN n"))
+    
+    assert result["status"] == "error"
+    assert aread.await_count == 1
+
+@pytest.fixture
+def sync_tools():
+    neo4j_tools = Neo4jTools(_config())
+    session = mock.Mock()
+    session.execute_read.return_value = [{"n": 1}]
+    session.execute_write.return_value = []
+    with mock.patch.object(neo4j_tools, "_read_session", return_value=nullcontext(session)), \
+            mock.patch.object(neo4j_tools, "_checkout", return_value=nullcontext(session)):
+        yield neo4j_tools, session
+    neo4j_tools.driver.close()
+
+@pytest.mark.parametrize("query", [
+    "MATCH (n:Service) DETACH DELETE n",
+    "match (n) remove n.owner",
+    "DROP INDEX service_name",
+    "CREATE INDEX service_name FOR (n:Service) ON (n.name)",
+    "create   constraint FOR (n:Service) REQUIRE n.id IS UNIQUE"
+])
+def test_write_guard_blocks_destructive_queries(sync_tools, query):
+    neo4j_tools, session = sync_tools
+    
+    result = neo4j_tools.execute_cypher(query, read_only=False)
+    
+    assert result["status"] == "error"
+    session.execute_write.assert_not_called()
+
+@pytest.mark.parametrize("query", [
+    "MATCH (n) WHERE n.deleted_at IS NULL RETURN n",
+    "MATCH (n) RETURN n.dropped_packets, n.removed",
+    "CREATE (n:Service {name: $name})"
+])
+def test_write_guard_allows_lookalike_identifiers(sync_tools, query):
+    neo4j_tools, _ = sync_tools
+    
+    assert not neo4j_tools._is_dangerous_query(query)
+
+def test_repeated_read_is_served_from_cache(sync_tools):
+    neo4j_tools, session = sync_tools
+    
+    first = neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    second = neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert second["data"] == first["data"]
+    assert session.execute_read.call_count == 1
+
+def test_write_retires_cached_reads(sync_tools):
+    neo4j_tools, session = sync_tools
+    
+    neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    neo4j_tools.execute_cypher("CREATE (n:Service {name: $name})", {"name": "api"}, read_only=False)
+    after_write = neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    
+    assert "cached" not in after_write
+    assert session.execute_read.call_count == 2
+    assert neo4j_tools.cache_stats()["generation"] == 1
+
+def test_cache_clear_retires_cached_reads(sync_tools):
+    neo4j_tools, session = sync_tools
+    
+    neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    neo4j_tools.cache_clear()
+    neo4j_tools.execute_cypher("MATCH (n) RETURN count(n) AS n")
+    
+    assert session.execute_read.call_count == 2
+
+def test_batch_search_runs_one_label_scoped_query_per_group(sync_tools):
+    neo4j_tools, session = sync_tools
+    
+    def execute_read(run_query, query, parameters):
+        return [{"index": q["index"], "nodes": [{"id": str(q["index"])}]} for q in parameters["batch"]]
+    
+    session.execute_read.side_effect = execute_read
+    
+    result = neo4j_tools.batch_search_nodes([
+        {"label": "Service", "properties": {"name": "api"}, "limit": 5},
+        {"label": "Host", "properties": {"name": "web-1"}},
+        {"label": "Service", "properties": {"name": "db"}, "limit": 20}
+    ])
+    
+    assert result["status"] == "success"
+    assert [r["nodes"][0]["id"] for r in result["results"]] == ["0", "1", "2"]
+    assert [r["properties"] for r in result["results"]] == [{"name": "api"}, {"name": "web-1"}, {"name": "db"}]
+    
+    queries = {call.args[1]: call.args[2] for call in session.execute_read.call_args_list}
+    assert len(queries) == 2
+    service_query = next(query for query in queries if "(n:`Service`)" in query)
+    assert "n.`name` = q.props.`name`" in service_query
+    assert queries[service_query]["limit"] == 20
+
+def test_node_search_matches_each_property_statically(sync_tools):
+    neo4j_tools, session = sync_tools
+    
+    neo4j_tools.search_nodes("Service", {"name": "api", "env": "prod"}, limit=5)
+    
+    query, parameters = session.execute_read.call_args.args[1:]
+    assert "MATCH (n:`Service`) WHERE n.`env` = $props.`env` AND n.`name` = $props.`name`" in query
+    assert parameters == {"props": {"name": "api", "env": "prod"}, "limit": 5}
+
+@pytest.mark.parametrize("start_props, end_props", [({}, {"name": "db"}), ({"name": "api"}, None)])
+def test_shortest_path_rejects_unconstrained_endpoints(sync_tools, async_tools, start_props, end_props):
+    neo4j_tools, session = sync_tools
+    
+    result = neo4j_tools.find_shortest_path(start_props, end_props, start_label="Service")
+    async_result = asyncio.run(async_tools.afind_shortest_path(start_props, end_props))
+    
+    assert result["status"] == async_result["status"] == "error"
+    session.execute_read.assert_not_called()
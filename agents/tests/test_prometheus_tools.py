@@ -0,0 +1,52 @@
+"""
+Tests for the PrometheusTools query cache, with the HTTP layer stubbed out.
+"""
+
+from unittest import mock
+
+import pytest
+
+from prometheus.tools import PrometheusConfig, PrometheusTools
+
+RANGE_RESPONSE = {"status": "success", "data": {"resultType": "matrix", "result": []}}
+
+@pytest.fixture
+def prometheus_tools():
+    with PrometheusTools(PrometheusConfig(base_url="http://prometheus.invalid")) as tools:
+        with mock.patch.object(tools, "_get_json", return_value=RANGE_RESPONSE) as get_json:
+            yield tools, get_json
+
+def _query_at(tools, now, time_range="1h"):
+    with mock.patch("prometheus.tools.time.time", return_value=now):
+        return tools.query_prometheus("up", time_range)
+
+def test_range_queries_within_one_step_share_a_cache_entry(prometheus_tools):
+    tools, get_json = prometheus_tools
+    
+    first = _query_at(tools, 1_000_000_000.0)
+    second = _query_at(tools, 1_000_000_004.0)
+    
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert get_json.call_count == 1
+    params = get_json.call_args.args[1]
+    assert params["end"] == 999_999_990.0
+    assert params["end"] - params["start"] == 3600
+
+def test_range_query_in_next_step_is_refetched(prometheus_tools):
+    tools, get_json = prometheus_tools
+    
+    _query_at(tools, 1_000_000_004.0)
+    _query_at(tools, 1_000_000_005.0)
+    
+    assert get_json.call_count == 2
+    assert [call.args[1]["end"] for call in get_json.call_args_list] == [999_999_990.0, 1_000_000_005.0]
+
+def test_instant_queries_ignore_the_step(prometheus_tools):
+    tools, get_json = prometheus_tools
+    
+    _query_at(tools, 1_000_000_004.0, time_range=None)
+    second = _query_at(tools, 1_000_000_020.0, time_range=None)
+    
+    assert second["cached"] is True
+    assert get_json.call_count == 1
@@ -0,0 +1,25 @@
+"""
+Tests for the shared security helpers.
+"""
+
+import structlog
+from structlog.testing import CapturingLoggerFactory
+
+from shared.security import audit_log
+
+def test_audit_log_uses_logging_configured_after_decoration():
+    @audit_log("unit_test_action")
+    def action():
+        return "ok"
+    
+    previous = structlog.get_config()
+    factory = CapturingLoggerFactory()
+    structlog.configure(logger_factory=factory, processors=[structlog.processors.KeyValueRenderer()],
+                        cache_logger_on_first_use=False)
+    try:
+        assert action() == "ok"
+    finally:
+        structlog.configure(**previous)
+    
+    assert [call.method_name for call in factory.logger.calls] == ["info", "info"]
+    assert all("action='unit_test_action'" in call.args[0] for call in factory.logger.calls)
@@ -22,6 +22,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'agents'))
 
 from shared.base_agent import BaseAgent, AgentConfig, BaseAgentState
 from shared.llm_factory import LLMFactory
+from shared import event_loop
 from shared.langsmith_tracing import get_tracer, create_langsmith_tags, create_langsmith_metadata
 from config.settings import get_config
 
@@ -80,16 +81,9 @@ class MemoryEnhancedAgent(BaseAgent):
     def create_tools(self) -> List[Any]:
         """Create tools including memory capabilities."""
         try:
-            # Get MCP tools asynchronously
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in an async context, create a new event loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.get_mcp_tools())
-                    mcp_tools = future.result()
-            else:
-                mcp_tools = loop.run_until_complete(self.get_mcp_tools())
+            # Runs on the shared background loop whether or not the caller is inside
+            # an event loop, so the MCP client always stays bound to a single loop
+            mcp_tools = event_loop.run_sync(self.get_mcp_tools())
             
             logger.info("Retrieved memory MCP tools", tool_count=len(mcp_tools))
             